@@ -0,0 +1,67 @@
+// Script KWin: posiciona cada instância gamescope na célula calculada por src/services/layout.py.
+// LAYOUTS[n] contém as células de n janelas; cada célula é uma fração do monitor de índice "monitor".
+// O KdeManager substitui a linha abaixo pelas células do perfil antes de carregar o script.
+const LAYOUTS = [];
+
+function getGamescopeClients() {
+  var allClients = workspace.windowList();
+  var gamescopeClients = [];
+  for (var i = 0; i < allClients.length; i++) {
+    if (allClients[i].resourceClass == "gamescope") {
+      gamescopeClients.push(allClients[i]);
+    }
+  }
+  return gamescopeClients;
+}
+
+function gamescopeAboveBelow() {
+  var gamescopeClients = getGamescopeClients();
+  for (var i = 0; i < gamescopeClients.length; i++) {
+    if (
+      workspace.activeWindow.resourceClass == "gamescope"
+    ) {
+      gamescopeClients[i].keepAbove = true;
+    } else {
+      gamescopeClients[i].keepAbove = false;
+    }
+  }
+}
+
+function gamescopeLayout() {
+  var gamescopeClients = getGamescopeClients();
+  var screens = workspace.screens;
+  if (gamescopeClients.length == 0 || LAYOUTS.length < 2) {
+    return;
+  }
+
+  // Janelas além das previstas no perfil não são movidas
+  var cells = LAYOUTS[Math.min(gamescopeClients.length, LAYOUTS.length - 1)];
+
+  for (var i = 0; i < gamescopeClients.length && i < cells.length; i++) {
+    var cell = cells[i];
+    // Instâncias além dos monitores conectados não são posicionadas
+    if (cell.monitor >= screens.length) {
+      continue;
+    }
+    var geometry = screens[cell.monitor].geometry;
+
+    // Arredonda as bordas, e não os tamanhos, para que as células cubram o monitor exatamente
+    var left = Math.round(cell.x * geometry.width);
+    var top = Math.round(cell.y * geometry.height);
+    var right = Math.round((cell.x + cell.width) * geometry.width);
+    var bottom = Math.round((cell.y + cell.height) * geometry.height);
+
+    gamescopeClients[i].noBorder = true;
+    gamescopeClients[i].frameGeometry = {
+      x: geometry.x + left,
+      y: geometry.y + top,
+      width: right - left,
+      height: bottom - top,
+    };
+  }
+  gamescopeAboveBelow();
+}
+
+workspace.windowAdded.connect(gamescopeLayout);
+workspace.windowRemoved.connect(gamescopeLayout);
+workspace.windowActivated.connect(gamescopeAboveBelow);
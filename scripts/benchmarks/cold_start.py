@@ -0,0 +1,66 @@
+"""
+Benchmark of the cold-start time of the headless CLI against the GUI path.
+
+Each run starts a fresh interpreter: one imports the CLI and exits through
+`twinverse_cli.py --help`, the other imports the GUI module the way
+`twinverse.py` does before it creates the window. The script reports the
+median wall time of both and checks that the CLI never loads GTK or Adwaita.
+
+Usage:
+    python scripts/benchmarks/cold_start.py [--runs 10] [--output results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+PATHS = {
+    "cli": [sys.executable, "twinverse_cli.py", "--help"],
+    "gui": [sys.executable, "-c", "from src import run_gui"],
+}
+GTK_CHECK = "import sys, src.cli; print(any(m in sys.modules for m in ('gi.repository.Gtk', 'gi.repository.Adw')))"
+
+
+def measure(command: list, runs: int) -> dict:
+    """Run a command in fresh interpreters and summarize its wall time."""
+    samples, returncode = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+        returncode = completed.returncode
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "returncode": returncode}
+
+
+def main():
+    """Run the benchmark and print or save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {name: measure(command, args.runs) for name, command in PATHS.items()}
+    gtk_check = subprocess.run([sys.executable, "-c", GTK_CHECK], cwd=REPO_ROOT, capture_output=True, text=True)
+    results["cli_imports_gtk"] = gtk_check.stdout.strip() == "True"
+
+    for name in PATHS:
+        r = results[name]
+        status = "" if r["returncode"] == 0 else f"  (exit code {r['returncode']})"
+        print(f"{name:<4} median={r['median_ms']:.1f}ms  min={r['min_ms']:.1f}ms{status}", file=sys.stderr)
+    print(f"CLI imports GTK: {results['cli_imports_gtk']}", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
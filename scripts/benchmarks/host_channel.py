@@ -0,0 +1,92 @@
+"""
+Benchmark of the persistent host command channel against one spawn per command.
+
+Runs the same short command repeatedly, once by starting a new process for
+every call and once through a single `HostChannel` helper, and reports the
+per-call latency of both. Inside a Flatpak the per-call path uses
+`flatpak-spawn --host`; outside of one, `--launcher` can be used to pick the
+prefix (an empty prefix compares plain `subprocess.run` with the helper).
+
+Usage:
+    python scripts/benchmarks/host_channel.py [--calls 200] [--command true] [--launcher flatpak-spawn --host]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.core.host_channel import HostChannel  # noqa: E402
+from src.core.utils import Utils  # noqa: E402
+
+
+def summarize(name: str, samples: list) -> dict:
+    """Summarize per-call latencies in milliseconds."""
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        "mode": name,
+        "calls": len(samples_ms),
+        "median_ms": statistics.median(samples_ms),
+        "p95_ms": samples_ms[int(len(samples_ms) * 0.95) - 1],
+        "total_ms": sum(samples_ms),
+    }
+
+
+def main():
+    """Run the benchmark and print or save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--command", nargs="+", default=["true"])
+    parser.add_argument("--launcher", nargs="*")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    launcher = args.launcher
+    if launcher is None:
+        launcher = ["flatpak-spawn", "--host"] if Utils.is_flatpak() else []
+
+    spawn_samples = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        subprocess.run(launcher + args.command, capture_output=True, check=False)
+        spawn_samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    channel = HostChannel(launcher)
+    channel.run(["true"])
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    channel_samples = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        channel.run(args.command)
+        channel_samples.append(time.perf_counter() - start)
+    channel.close()
+
+    results = {
+        "launcher": launcher,
+        "command": args.command,
+        "channel_startup_ms": startup_ms,
+        "results": [summarize("spawn_per_call", spawn_samples), summarize("host_channel", channel_samples)],
+    }
+    for r in results["results"]:
+        print(
+            f"{r['mode']:<15} median={r['median_ms']:.2f}ms  p95={r['p95_ms']:.2f}ms  total={r['total_ms']:.0f}ms",
+            file=sys.stderr,
+        )
+    print(f"{'':<15} channel startup={startup_ms:.1f}ms", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
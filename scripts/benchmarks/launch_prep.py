@@ -0,0 +1,215 @@
+"""
+Benchmark of launch preparation against Steam library size and instance count.
+
+For each synthetic library size and number of instances, this script times
+preparing the instance homes (`InstanceService._prepare_home`, cold and then
+warm), building every instance's command (`CommandBuilder.build_command`)
+and sizing every instance (`DeviceManager.get_instance_dimensions`). It
+records the wall time, the argv size and the read and write syscalls of each
+phase, the latter taken from `/proc/self/io`.
+
+The results are written as JSON together with the commit they were measured
+on. With `--compare`, each metric is also compared against an earlier results
+file and changes beyond `--threshold` are reported as regressions.
+
+Usage:
+    python scripts/benchmarks/launch_prep.py [--sizes 10 500 5000] [--instances 1 2 4 8]
+        [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import logging
+import math
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_steam import synthetic_home  # noqa: E402
+
+from src.core import Config, Logger  # noqa: E402
+from src.models import Profile  # noqa: E402
+from src.services import CommandBuilder, InstanceService  # noqa: E402
+
+MONITOR = {"id": 0, "x": 0, "y": 0, "width": 2560, "height": 1440}
+# Metrics compared by --compare; lower is better for all of them.
+COMPARED_METRICS = ["wall_ms", "syscalls", "argv_bytes"]
+
+
+def read_syscalls() -> int:
+    """Return the read and write syscalls made by this process so far."""
+    with open("/proc/self/io", "r", encoding="utf-8") as f:
+        fields = dict(line.split(": ") for line in f.read().splitlines())
+    return int(fields["syscr"]) + int(fields["syscw"])
+
+
+def timed(func, runs: int) -> dict:
+    """Run a function several times and return its median wall time, syscalls and last result."""
+    times, syscalls, result = [], [], None
+    for _ in range(runs):
+        syscalls_before = read_syscalls()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        syscalls.append(read_syscalls() - syscalls_before)
+    return {"wall_ms": statistics.median(times) * 1000, "syscalls": int(statistics.median(syscalls)), "result": result}
+
+
+def make_profile(num_instances: int) -> Profile:
+    """Return a splitscreen Gamescope profile for the given number of instances."""
+    return Profile(
+        NUM_PLAYERS=num_instances,
+        MODE="splitscreen",
+        SPLITSCREEN={"ORIENTATION": "horizontal"},
+        PLAYERS=[{} for _ in range(num_instances)],
+        selected_players=list(range(num_instances)),
+        USE_GAMESCOPE=True,
+        SANDBOX_BIND_MODE="shared_tree",
+    )
+
+
+def measure(num_games: int, num_instances: int, runs: int, logger: Logger) -> list:
+    """Measure every phase for one library size and instance count."""
+    results = []
+    with synthetic_home(num_games) as home:
+        Config.LOCAL_DIR = home / ".local/share/twinverse"
+        Config.LOG_DIR = home / ".cache/twinverse/logs"
+        service = InstanceService(logger)
+        profile = make_profile(num_instances)
+        instance_nums = list(range(num_instances))
+        home_paths = [Config.get_steam_home_path(num) for num in instance_nums]
+        monitors = [dict(MONITOR, id=i, x=i * MONITOR["width"]) for i in range(math.ceil(num_instances / 4))]
+
+        def prepare_homes():
+            for home_path in home_paths:
+                service._prepare_home(home_path)
+
+        # The first run syncs every manifest into empty homes; later runs find them up to date.
+        cold = timed(prepare_homes, 1)
+        warm = timed(prepare_homes, runs)
+
+        host_scan = CommandBuilder.scan_host_steam(list_folders=False)
+        device_infos = [service._validate_input_devices(profile, num, num) for num in instance_nums]
+
+        def build_commands():
+            return [
+                CommandBuilder(
+                    logger,
+                    profile,
+                    device_infos[num],
+                    service.device_manager,
+                    num,
+                    home_paths[num],
+                    None,
+                    host_scan=host_scan,
+                    monitors=monitors,
+                ).build_command()
+                for num in instance_nums
+            ]
+
+        commands = timed(build_commands, runs)
+        argvs = commands.pop("result")
+
+        dimensions = timed(
+            lambda: [service.device_manager.get_instance_dimensions(profile, num, monitors) for num in instance_nums],
+            runs,
+        )
+        dimensions.pop("result")
+
+        base = {"games": num_games, "instances": num_instances}
+        cold.pop("result")
+        warm.pop("result")
+        results.append(dict(base, phase="prepare_home_cold", **cold))
+        results.append(dict(base, phase="prepare_home_warm", **warm))
+        results.append(
+            dict(
+                base,
+                phase="build_command",
+                argv_entries=max(len(argv) for argv in argvs),
+                argv_bytes=max(sum(len(arg) + 1 for arg in argv) for argv in argvs),
+                **commands,
+            )
+        )
+        results.append(dict(base, phase="get_instance_dimensions", **dimensions))
+    return results
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """Return a description of every metric that got worse than the baseline by more than the threshold."""
+    regressions = []
+    baseline_by_key = {(r["games"], r["instances"], r["phase"]): r for r in baseline}
+    for r in results:
+        previous = baseline_by_key.get((r["games"], r["instances"], r["phase"]))
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), r.get(metric)
+            if old and new is not None and (new - old) / old > threshold:
+                regressions.append(
+                    f"{r['phase']} ({r['games']} games, {r['instances']} instances): "
+                    f"{metric} {old:.2f} -> {new:.2f} (+{(new - old) / old:.0%})"
+                )
+    return regressions
+
+
+def get_commit() -> str:
+    """Return the commit the benchmark runs on, if known."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=False)
+    except OSError:
+        return "unknown"
+    return completed.stdout.strip() or "unknown"
+
+
+def main():
+    """Run the benchmark and print or save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 500, 5000])
+    parser.add_argument("--instances", type=int, nargs="+", default=list(range(1, 9)))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    log_dir = Path(".bench-logs")
+    logger = Logger("Twinverse-Benchmark", log_dir)
+    logger.logger.setLevel(logging.WARNING)
+
+    results = []
+    for size in args.sizes:
+        for num_instances in args.instances:
+            results += measure(size, num_instances, args.runs, logger)
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    for r in results:
+        argv = f"  argv={r['argv_entries']} entries ({r['argv_bytes']} bytes)" if "argv_bytes" in r else ""
+        print(
+            f"{r['games']:>6} games  {r['instances']} inst  {r['phase']:<24} "
+            f"{r['wall_ms']:>9.2f}ms  {r['syscalls']:>7} syscalls{argv}",
+            file=sys.stderr,
+        )
+
+    report = {"commit": get_commit(), "python": platform.python_version(), "results": results}
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text(encoding="utf-8"))["results"], args.threshold)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark of the bwrap sandbox command against Steam library size.
+
+For each library size and sandbox bind mode, this script measures the number
+and total size of the bwrap arguments, the time needed to build them, and, when
+`bwrap` is installed, the time to exec the sandbox around `true`.
+
+Usage:
+    python scripts/benchmarks/sandbox_argv.py [--sizes 10 500 5000] [--output results.json]
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_steam import synthetic_home  # noqa: E402
+
+from src.core import Logger  # noqa: E402
+from src.models import Profile  # noqa: E402
+from src.services import CommandBuilder, DeviceManager  # noqa: E402
+
+MODES = ["per_folder", "shared_tree"]
+
+
+def measure(num_games: int, mode: str, runs: int, logger: Logger) -> dict:
+    """Measure argv size, build time and exec time for one library size and mode."""
+    with synthetic_home(num_games) as home:
+        home_path = home / "instance_home"
+        home_path.mkdir()
+        profile = Profile(USE_GAMESCOPE=False, SANDBOX_BIND_MODE=mode)
+
+        build_times = []
+        for _ in range(runs):
+            builder = CommandBuilder(logger, profile, {}, DeviceManager(), 0, home_path, None)
+            start = time.perf_counter()
+            argv = builder._build_bwrap_command(0)
+            build_times.append(time.perf_counter() - start)
+
+        result = {
+            "games": num_games,
+            "mode": mode,
+            "argv_entries": len(argv),
+            "argv_bytes": sum(len(arg) + 1 for arg in argv),
+            "build_ms": statistics.median(build_times) * 1000,
+            "exec_ms": None,
+            "exec_returncode": None,
+        }
+
+        if shutil.which("bwrap"):
+            exec_times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                completed = subprocess.run(argv + ["true"], capture_output=True, check=False)
+                exec_times.append(time.perf_counter() - start)
+            result["exec_ms"] = statistics.median(exec_times) * 1000
+            result["exec_returncode"] = completed.returncode
+        return result
+
+
+def main():
+    """Run the benchmark and print or save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 2000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    log_dir = Path(".bench-logs")
+    logger = Logger("Twinverse-Benchmark", log_dir)
+    logger.logger.setLevel(logging.WARNING)
+
+    results = [measure(size, mode, args.runs, logger) for size in args.sizes for mode in MODES]
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    for r in results:
+        exec_ms = f"{r['exec_ms']:.1f}ms" if r["exec_ms"] is not None else "n/a"
+        print(
+            f"{r['games']:>6} games  {r['mode']:<12} argv={r['argv_entries']:>6} entries "
+            f"({r['argv_bytes']:>8} bytes)  build={r['build_ms']:.2f}ms  exec={exec_ms}",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
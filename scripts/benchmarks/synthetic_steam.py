@@ -0,0 +1,67 @@
+"""
+Synthetic Steam library generator for the Twinverse benchmarks.
+
+This module creates fake host Steam trees of a given size in a temporary
+directory, so launch preparation can be measured against library size
+without a real Steam installation.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def create_steam_tree(root: Path, num_games: int, num_compat_tools: int = 5) -> Path:
+    """
+    Create a synthetic host Steam installation under a fake home directory.
+
+    Args:
+        root (Path): The fake home directory.
+        num_games (int): Number of games (folders and app manifests) to create.
+        num_compat_tools (int): Number of compatibility tools to create.
+
+    Returns:
+        Path: The created `.local/share/Steam` directory.
+    """
+    steam_path = root / ".local/share/Steam"
+    common = steam_path / "steamapps/common"
+    compat = steam_path / "compatibilitytools.d"
+    common.mkdir(parents=True, exist_ok=True)
+    compat.mkdir(parents=True, exist_ok=True)
+
+    for appid in range(100000, 100000 + num_games):
+        (common / f"Game {appid}").mkdir(exist_ok=True)
+        manifest = steam_path / "steamapps" / f"appmanifest_{appid}.acf"
+        manifest.write_text(
+            f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"Game {appid}"\n'
+            f'\t"installdir"\t\t"Game {appid}"\n\t"buildid"\t\t"1"\n}}\n',
+            encoding="utf-8",
+        )
+
+    for i in range(num_compat_tools):
+        (compat / f"GE-Proton9-{i}").mkdir(exist_ok=True)
+    (compat / "LegacyRuntime").mkdir(exist_ok=True)
+    return steam_path
+
+
+@contextmanager
+def synthetic_home(num_games: int, num_compat_tools: int = 5):
+    """
+    Point `HOME` at a temporary directory holding a synthetic Steam library.
+
+    Yields:
+        Path: The temporary home directory.
+    """
+    previous_home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory(prefix="twinverse-bench-") as tmp:
+        home = Path(tmp)
+        create_steam_tree(home, num_games, num_compat_tools)
+        os.environ["HOME"] = str(home)
+        try:
+            yield home
+        finally:
+            if previous_home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = previous_home
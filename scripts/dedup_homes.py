@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script to deduplicate identical files across Twinverse instance homes.
+
+Files that are identical in several home_N directories are made to share
+their storage through reflinks, where the filesystem supports them. Run it
+while the instances are stopped; homes whose Steam client is running are
+skipped. A report of the reclaimed space is written to dedup_report.json.
+
+Usage:
+    python scripts/dedup_homes.py [1 2 3 ...]
+
+Instances are numbered from 1, as the home_N directories are. By default
+every existing home is processed.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import Config, Logger  # noqa: E402
+from src.services.home_dedup import HomeDeduplicator  # noqa: E402
+
+
+def main():
+    """Deduplicate the selected instance homes."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("instances", type=int, nargs="*", help="instances to deduplicate (default: all)")
+    args = parser.parse_args()
+
+    if args.instances:
+        home_paths = [Config.get_steam_home_path(instance - 1) for instance in args.instances]
+    else:
+        home_paths = sorted(Config.LOCAL_DIR.glob("home_[0-9]*"))
+    home_paths = [home_path for home_path in home_paths if home_path.is_dir()]
+    if len(home_paths) < 2:
+        print("Nothing to deduplicate: fewer than two instance homes exist.", file=sys.stderr)
+        return
+
+    HomeDeduplicator(Logger("Twinverse-Dedup", Config.LOG_DIR)).run(home_paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script to provision Twinverse instance homes from a template home.
+
+Capture a template once from an instance whose Steam client finished
+bootstrapping (and is logged out), then clone it into new instance homes.
+
+Usage:
+    python scripts/provision_homes.py --create-template 1
+    python scripts/provision_homes.py 5 6 7 8 [--force]
+
+Instances are numbered from 1, as the home_N directories are.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import Config, Logger  # noqa: E402
+from src.services.home_provisioner import HomeProvisioner  # noqa: E402
+
+
+def main():
+    """Create the home template or provision instance homes from it."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("instances", type=int, nargs="*", help="instances to provision (1-8)")
+    parser.add_argument("--create-template", type=int, metavar="N", help="capture home_N as the template")
+    parser.add_argument("--force", action="store_true", help="replace the Steam client of provisioned homes")
+    args = parser.parse_args()
+
+    if args.create_template is None and not args.instances:
+        parser.error("nothing to do: pass --create-template N and/or instances to provision")
+
+    provisioner = HomeProvisioner(Logger("Twinverse-Provision", Config.LOG_DIR))
+    try:
+        if args.create_template is not None:
+            provisioner.create_template(args.create_template - 1)
+        for instance in args.instances:
+            provisioner.provision(instance - 1, force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,44 @@ Twinverse application source package.
 
 This package provides core functionalities, GUI components, data models,
 and various services for managing Steam instances.
+
+The exports are imported on first access (PEP 562), so that headless entry
+points never import GTK and the GUI does not load services before it needs
+them.
 """
 
-from .core import (
-    Config,
-    DependencyError,
-    Logger,
-    ProfileNotFoundError,
-    TwinverseError,
-    VirtualDeviceError,
-)
-from .gui.app import TwinverseApplication, TwinverseWindow, run_gui
-from .models import Profile, SteamInstance
-from .services import DeviceManager, InstanceService, KdeManager
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import (
+        Config,
+        DependencyError,
+        Logger,
+        ProfileNotFoundError,
+        TwinverseError,
+        VirtualDeviceError,
+    )
+    from .gui.app import TwinverseApplication, TwinverseWindow, run_gui
+    from .models import Profile, SteamInstance
+    from .services import DeviceManager, InstanceService, KdeManager
+
+_EXPORTS = {
+    "Config": ".core",
+    "DependencyError": ".core",
+    "Logger": ".core",
+    "TwinverseError": ".core",
+    "ProfileNotFoundError": ".core",
+    "VirtualDeviceError": ".core",
+    "TwinverseApplication": ".gui.app",
+    "TwinverseWindow": ".gui.app",
+    "run_gui": ".gui.app",
+    "Profile": ".models",
+    "SteamInstance": ".models",
+    "DeviceManager": ".services",
+    "InstanceService": ".services",
+    "KdeManager": ".services",
+}
 
 __all__ = [
     "Config",
@@ -33,3 +58,17 @@ __all__ = [
     "InstanceService",
     "KdeManager",
 ]
+
+
+def __getattr__(name):
+    """Import an export on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exports along with the module attributes."""
+    return sorted(set(globals()) | set(__all__))
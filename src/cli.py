@@ -0,0 +1,230 @@
+"""
+Command-line interface module for the Twinverse application.
+
+This module provides a headless entry point that launches, stops, inspects
+and plans sessions by driving `InstanceService` directly from a profile
+file. It never imports the GUI stack (GTK and Adwaita), so it starts fast
+enough for seat-launch automation.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core import Config, Logger, TwinverseError, Utils
+from src.models import Profile
+from src.services.instance import InstanceService
+from src.services.kde_manager import KdeManager
+
+STOP_TIMEOUT = 30.0
+
+
+def get_session_path() -> Path:
+    """Return the file describing the session started by `launch`."""
+    return Config.LOCAL_DIR / "cli_session.json"
+
+
+def read_session() -> Optional[Dict]:
+    """Return the running CLI session, or None if there is none or its launcher has exited."""
+    try:
+        session = json.loads(get_session_path().read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not _is_alive(session["launcher_pid"]):
+        return None
+    return session
+
+
+def _is_alive(pid: int) -> bool:
+    """Check whether a local process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_session(profile_path: Path, instance_service: InstanceService, started: float) -> None:
+    """Record the launcher and the process group of every instance launched so far."""
+    session = {
+        "launcher_pid": os.getpid(),
+        "profile": str(profile_path),
+        "started": started,
+        "instances": {str(num): pgid for num, pgid in instance_service.pgids.items()},
+    }
+    path = get_session_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(session, indent=4), encoding="utf-8")
+
+
+def _resolve_players(profile: Profile, players: Optional[List[int]]) -> List[int]:
+    """Return the 0-based instances to use: the given 1-based players, else the profile's selection."""
+    if players:
+        return [player - 1 for player in players]
+    if profile.selected_players:
+        return list(profile.selected_players)
+    return list(range(len(profile.player_configs)))
+
+
+def cmd_launch(args: argparse.Namespace, profile: Profile, logger: Logger) -> int:
+    """Launch a session and supervise it until it is stopped or every instance exits."""
+    if read_session():
+        print("A session is already running; stop it first.", file=sys.stderr)
+        return 1
+    instance_nums = _resolve_players(profile, args.players)
+    profile.selected_players = instance_nums
+
+    kde_manager = None if args.no_kde else KdeManager(logger)
+    instance_service = InstanceService(logger, kde_manager=kde_manager)
+    stop_event = threading.Event()
+
+    def on_exit(instance_num: int, returncode: Optional[int], runtime: float) -> None:
+        if not instance_service.processes:
+            logger.info("All instances have exited. Cleaning up session.")
+            stop_event.set()
+
+    instance_service.add_exit_listener(on_exit)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    if kde_manager:
+        if profile.enable_kwin_script:
+            kde_manager.start_kwin_script(profile)
+        kde_manager.save_panel_states()
+        kde_manager.set_panels_dodge_windows()
+
+    started = time.time()
+    try:
+        # Written up front so that `stop` and `status` see the session while it is still launching.
+        _write_session(args.profile, instance_service, started)
+        instance_service.launch_instances(profile, instance_nums, cancel_event=stop_event)
+        _write_session(args.profile, instance_service, started)
+        print(f"Launched instances {[num + 1 for num in instance_service.pgids]}", file=sys.stderr)
+        if instance_service.processes:
+            while not stop_event.wait(1.0):
+                pass
+    finally:
+        instance_service.terminate_all()
+        get_session_path().unlink(missing_ok=True)
+    return 0
+
+
+def cmd_stop(args: argparse.Namespace, profile: Optional[Profile], logger: Logger) -> int:
+    """Ask the launcher of the running session to terminate it, and wait until it has."""
+    session = read_session()
+    if not session:
+        print("No session is running.", file=sys.stderr)
+        return 1
+    launcher_pid = session["launcher_pid"]
+    os.kill(launcher_pid, signal.SIGTERM)
+    deadline = time.monotonic() + args.timeout
+    while _is_alive(launcher_pid):
+        if time.monotonic() > deadline:
+            print(f"Session launcher {launcher_pid} did not stop within {args.timeout}s.", file=sys.stderr)
+            return 1
+        time.sleep(0.1)
+    print("Session stopped.", file=sys.stderr)
+    return 0
+
+
+def cmd_status(args: argparse.Namespace, profile: Optional[Profile], logger: Logger) -> int:
+    """Print the instances of the running session and whether they are still alive."""
+    session = read_session()
+    status: Dict = {"running": session is not None, "instances": {}}
+    if session:
+        status["launcher_pid"] = session["launcher_pid"]
+        status["profile"] = session["profile"]
+        for num, pgid in session["instances"].items():
+            processes = Utils.list_process_group(pgid)
+            status["instances"][int(num) + 1] = {"pgid": pgid, "processes": len(processes), "alive": bool(processes)}
+
+    if args.json:
+        print(json.dumps(status, indent=4))
+    elif not session:
+        print("No session is running.")
+    else:
+        print(f"Session launched by PID {session['launcher_pid']} from {session['profile']}")
+        for player, info in status["instances"].items():
+            state = f"running ({info['processes']} processes)" if info["alive"] else "exited"
+            print(f"  Instance {player}: {state}, PGID {info['pgid']}")
+    return 0
+
+
+def cmd_plan(args: argparse.Namespace, profile: Profile, logger: Logger) -> int:
+    """Resolve the launch plan without launching anything."""
+    instance_service = InstanceService(logger)
+    plan = instance_service.dry_run(profile, _resolve_players(profile, args.players), args.output)
+    if not args.output:
+        print(plan.to_json())
+    return 0
+
+
+def cmd_clone_prefixes(args: argparse.Namespace, profile: Profile, logger: Logger) -> int:
+    """Clone the golden Proton prefix of the given games into the instance homes."""
+    if read_session():
+        print("A session is running; stop it before cloning prefixes into its homes.", file=sys.stderr)
+        return 1
+    instance_service = InstanceService(logger)
+    stats = instance_service.clone_proton_prefixes(_resolve_players(profile, args.players), args.app_ids)
+    print(
+        f"{stats['cloned']} prefixes cloned, {stats['version_mismatch']} skipped (Proton version mismatch)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the command-line interface."""
+    parser = argparse.ArgumentParser(prog="twinverse-cli", description="Run Twinverse sessions without the GUI.")
+    parser.add_argument(
+        "--profile", type=Path, default=Config.get_profile_path(), help="Profile JSON file (default: %(default)s)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    launch = subparsers.add_parser("launch", help="Launch a session and supervise it until stopped.")
+    launch.add_argument("--players", type=int, nargs="+", help="Players to launch (1-based); default: the profile's")
+    launch.add_argument("--no-kde", action="store_true", help="Do not start the KWin script or change panels")
+    launch.set_defaults(func=cmd_launch)
+
+    stop = subparsers.add_parser("stop", help="Stop the running session.")
+    stop.add_argument("--timeout", type=float, default=STOP_TIMEOUT)
+    stop.set_defaults(func=cmd_stop)
+
+    status = subparsers.add_parser("status", help="Show the running session.")
+    status.add_argument("--json", action="store_true", help="Print the status as JSON")
+    status.set_defaults(func=cmd_status)
+
+    plan = subparsers.add_parser("plan", help="Print the launch plan without launching anything.")
+    plan.add_argument("--players", type=int, nargs="+", help="Players to plan (1-based); default: the profile's")
+    plan.add_argument("--output", type=Path, help="Write the plan to this JSON file")
+    plan.set_defaults(func=cmd_plan)
+
+    clone_prefixes = subparsers.add_parser(
+        "clone-prefixes", help="Clone the host's Proton prefix of some games into the instance homes."
+    )
+    clone_prefixes.add_argument("app_ids", nargs="+", metavar="APPID", help="Steam app IDs of the games")
+    clone_prefixes.add_argument(
+        "--players", type=int, nargs="+", help="Players to fill (1-based); default: the profile's"
+    )
+    clone_prefixes.set_defaults(func=cmd_clone_prefixes)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command-line interface."""
+    args = build_parser().parse_args(argv)
+    logger = Logger("Twinverse-CLI", Config.LOG_DIR)
+    try:
+        profile = Profile.load(args.profile) if args.command in ("launch", "plan", "clone-prefixes") else None
+        return args.func(args, profile, logger)
+    except (TwinverseError, ValueError) as e:
+        logger.error(f"{args.command} failed: {e}")
+        return 1
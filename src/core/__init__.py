@@ -1,21 +1,62 @@
-"""Core components of the Twinverse application."""
-
-from .config import Config
-from .exceptions import (
-    DependencyError,
-    ProfileNotFoundError,
-    TwinverseError,
-    VirtualDeviceError,
-)
-from .logger import Logger
-from .utils import Utils
+"""
+Core components of the Twinverse application.
+
+The components are imported on first access (PEP 562), so that importing one
+of them does not load the others.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .capabilities import HostCapabilities
+    from .config import Config
+    from .exceptions import (
+        DependencyError,
+        ProfileNotFoundError,
+        TwinverseError,
+        VirtualDeviceError,
+    )
+    from .logger import Logger
+    from .tracing import Tracer, traced
+    from .utils import Utils
+
+_EXPORTS = {
+    "Config": ".config",
+    "HostCapabilities": ".capabilities",
+    "DependencyError": ".exceptions",
+    "TwinverseError": ".exceptions",
+    "ProfileNotFoundError": ".exceptions",
+    "VirtualDeviceError": ".exceptions",
+    "Logger": ".logger",
+    "Tracer": ".tracing",
+    "traced": ".tracing",
+    "Utils": ".utils",
+}
 
 __all__ = [
     "Config",
+    "HostCapabilities",
     "DependencyError",
     "TwinverseError",
     "ProfileNotFoundError",
     "VirtualDeviceError",
     "Logger",
+    "Tracer",
+    "traced",
     "Utils",
 ]
+
+
+def __getattr__(name):
+    """Import an exported component on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exported components along with the module attributes."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,224 @@
+"""
+Host capabilities module for the Twinverse application.
+
+This module provides a single probe of what the host offers: the sandbox the
+application runs in, the resolved paths of the external tools it drives, the
+Gamescope version and flags, and the kernel features used by the services.
+The result is computed once per session and persisted between sessions.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import Config
+from .utils import Utils
+
+CACHE_VERSION = 1
+
+# Prints "<name>\t<path>\t<mtime>" for every tool found on the host, in one spawn.
+_HOST_TOOLS_SCRIPT = (
+    'for c in "$@"; do p=$(command -v "$c") && printf "%s\\t%s\\t%s\\n" "$c" "$p" "$(stat -L -c %Y "$p")"; done'
+)
+
+
+class HostCapabilities:
+    """
+    A cached probe of the host's sandbox type, tools and kernel features.
+
+    Use `HostCapabilities.get()` to obtain the shared probe. Tool paths and
+    their mtimes are checked once per session; the slower derived results
+    (Gamescope version and flags) are reused from the cache file under
+    `Config.LOCAL_DIR` as long as the binaries they were derived from have
+    not changed.
+    """
+
+    TOOLS = ["gamescope", "bwrap", "steam", "qdbus6", "qdbus", "pactl", "taskset", "systemd-run", "systemctl", "ionice"]
+
+    _shared: Optional["HostCapabilities"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, data: Dict):
+        """Initialize the probe from its serialized data."""
+        self.data = data
+
+    @classmethod
+    def get(cls) -> "HostCapabilities":
+        """Return the shared probe, computing it on first use."""
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls._probe()
+            return cls._shared
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget the probe so that the next `get()` looks at the host again."""
+        with cls._lock:
+            cls._shared = None
+
+    @staticmethod
+    def get_cache_path() -> Path:
+        """Return the path of the persisted probe."""
+        return Config.LOCAL_DIR / "host_capabilities.json"
+
+    @property
+    def sandbox(self) -> str:
+        """The sandbox the application runs in: "flatpak", "snap" or "native"."""
+        return self.data["sandbox"]
+
+    @property
+    def kernel(self) -> Dict[str, bool]:
+        """Availability of the kernel features used by the services."""
+        return self.data["kernel"]
+
+    def tool_path(self, name: str) -> Optional[str]:
+        """Return the resolved absolute path of a host tool, or None if it is missing."""
+        tool = self.data["tools"].get(name)
+        return tool["path"] if tool else None
+
+    def has_tool(self, name: str) -> bool:
+        """Check whether a tool is available on the host."""
+        return self.tool_path(name) is not None
+
+    @property
+    def qdbus_command(self) -> Optional[str]:
+        """The qdbus command to use for D-Bus calls (qdbus6 or qdbus)."""
+        for cmd in ["qdbus6", "qdbus"]:
+            if self.has_tool(cmd):
+                return cmd
+        return None
+
+    @property
+    def gamescope_version(self) -> Optional[str]:
+        """The installed Gamescope version, if it could be determined."""
+        return self.data["gamescope"].get("version")
+
+    def gamescope_supports(self, flag: str) -> bool:
+        """
+        Check whether the installed Gamescope accepts a command-line flag.
+
+        When the flags could not be determined, every flag is assumed to be
+        supported so that behaviour matches running without the probe.
+        """
+        flags = self.data["gamescope"].get("flags")
+        return not flags or flag in flags
+
+    @classmethod
+    def _probe(cls) -> "HostCapabilities":
+        """Probe the host, reusing the persisted results for unchanged binaries."""
+        cached = cls._load_cache()
+        tools = cls._probe_tools()
+
+        gamescope: Dict = {}
+        if cached and cached["tools"].get("gamescope") == tools.get("gamescope"):
+            gamescope = cached["gamescope"]
+        elif "gamescope" in tools:
+            gamescope = cls._probe_gamescope(tools["gamescope"]["path"])
+
+        data = {
+            "version": CACHE_VERSION,
+            "sandbox": cls._detect_sandbox(),
+            "tools": tools,
+            "gamescope": gamescope,
+            "kernel": cls._probe_kernel(),
+        }
+        if data != cached:
+            cls._save_cache(data)
+        return cls(data)
+
+    @staticmethod
+    def _detect_sandbox() -> str:
+        """Detect the sandbox the application runs in."""
+        if Utils.is_flatpak():
+            return "flatpak"
+        if os.environ.get("SNAP"):
+            return "snap"
+        return "native"
+
+    @classmethod
+    def _probe_tools(cls) -> Dict[str, Dict]:
+        """Resolve the path and mtime of every tool, with at most one host spawn."""
+        tools: Dict[str, Dict] = {}
+        if Utils.is_flatpak():
+            result = Utils.flatpak_spawn_host(
+                ["sh", "-c", _HOST_TOOLS_SCRIPT, "sh"] + cls.TOOLS, capture_output=True, text=True, check=False
+            )
+            for line in (result.stdout or "").splitlines():
+                parts = line.split("\t")
+                if len(parts) == 3 and parts[2].isdigit():
+                    tools[parts[0]] = {"path": parts[1], "mtime": int(parts[2])}
+            return tools
+
+        for name in cls.TOOLS:
+            path = shutil.which(name)
+            if not path:
+                continue
+            try:
+                mtime = int(os.stat(path).st_mtime)
+            except OSError:
+                continue
+            tools[name] = {"path": os.path.abspath(path), "mtime": mtime}
+        return tools
+
+    @staticmethod
+    def _probe_gamescope(path: str) -> Dict:
+        """Read the Gamescope version and the flags listed in its help output."""
+        info: Dict = {"version": None, "flags": []}
+        try:
+            version = Utils.flatpak_spawn_host([path, "--version"], capture_output=True, text=True, timeout=5)
+            match = re.search(r"gamescope version (\S+)", version.stdout + version.stderr)
+            if match:
+                info["version"] = match.group(1)
+
+            help_result = Utils.flatpak_spawn_host([path, "--help"], capture_output=True, text=True, timeout=5)
+            flags: List[str] = sorted(
+                set(re.findall(r"(?<![\w-])(--?[A-Za-z][\w-]*)", help_result.stderr + help_result.stdout))
+            )
+            info["flags"] = flags
+        except (OSError, subprocess.SubprocessError):
+            pass
+        return info
+
+    @staticmethod
+    def _probe_kernel() -> Dict[str, bool]:
+        """Check the kernel features the services rely on."""
+        pidfd = False
+        if hasattr(os, "pidfd_open"):
+            try:
+                os.close(os.pidfd_open(os.getpid()))
+                pidfd = True
+            except OSError:
+                pass
+        return {
+            "pidfd": pidfd,
+            "cgroup2": Path("/sys/fs/cgroup/cgroup.controllers").exists(),
+            "psi": Path("/proc/pressure/cpu").exists(),
+            "inotify": Path("/proc/sys/fs/inotify").exists(),
+        }
+
+    @classmethod
+    def _load_cache(cls) -> Optional[Dict]:
+        """Load the persisted probe, if it exists and matches the current format."""
+        try:
+            with open(cls.get_cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return None
+        return data if data.get("version") == CACHE_VERSION else None
+
+    @classmethod
+    def _save_cache(cls, data: Dict) -> None:
+        """Persist the probe atomically."""
+        cache_path = cls.get_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
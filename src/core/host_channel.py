@@ -0,0 +1,282 @@
+"""
+Host command channel module for the Twinverse application.
+
+Inside a Flatpak every host command normally costs a new `flatpak-spawn --host`
+process and its D-Bus round-trip. This module provides a long-lived helper,
+started once per session on the host, that runs commands it receives as
+length-prefixed JSON frames over its stdin and answers on its stdout.
+"""
+
+import atexit
+import base64
+import json
+import os
+import select
+import struct
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Runs on the host with the host's python3. Kept dependency-free on purpose.
+HELPER_SOURCE = r"""
+import base64, json, struct, subprocess, sys
+
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+
+def read_exact(size):
+    data = b""
+    while len(data) < size:
+        chunk = stdin.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def encode(data):
+    return base64.b64encode(data or b"").decode()
+
+while True:
+    header = read_exact(4)
+    if header is None:
+        break
+    request = json.loads(read_exact(struct.unpack(">I", header)[0]))
+    stdin_data = request.get("input")
+    try:
+        result = subprocess.run(
+            request["argv"],
+            input=base64.b64decode(stdin_data) if stdin_data is not None else None,
+            stdin=subprocess.DEVNULL if stdin_data is None else None,
+            capture_output=True,
+            cwd=request.get("cwd"),
+            timeout=request.get("timeout"),
+        )
+        response = {"returncode": result.returncode, "stdout": encode(result.stdout), "stderr": encode(result.stderr)}
+    except subprocess.TimeoutExpired as e:
+        response = {"timeout": True, "returncode": None, "stdout": encode(e.stdout), "stderr": encode(e.stderr)}
+    except OSError as e:
+        response = {"returncode": 127, "stdout": "", "stderr": encode(str(e).encode())}
+    payload = json.dumps(response).encode()
+    stdout.write(struct.pack(">I", len(payload)) + payload)
+    stdout.flush()
+"""
+
+# Keyword arguments of subprocess.run that the channel can honour.
+SUPPORTED_KWARGS = {"capture_output", "text", "check", "input", "stdout", "stderr", "cwd", "timeout"}
+
+# Seconds a command may run when the caller sets no timeout, so that one hung
+# command cannot hold the channel forever.
+DEFAULT_TIMEOUT = 60.0
+# Extra seconds the helper has to answer after the command's timeout, before
+# it is considered hung and restarted.
+RESPONSE_GRACE = 5.0
+
+
+class HostChannelError(subprocess.SubprocessError):
+    """
+    Raised when a command could not be run through the helper.
+
+    Attributes:
+        sent (bool): Whether the request had already been sent to the helper,
+            in which case the command may have run.
+    """
+
+    def __init__(self, message: str, sent: bool):
+        """Initialize the error, recording whether the request had been sent."""
+        super().__init__(message, sent)
+        self.message = message
+        self.sent = sent
+
+    def __str__(self) -> str:
+        """Return the error message."""
+        return self.message
+
+
+class HostChannel:
+    """
+    A persistent helper process that runs commands on the host.
+
+    Use `HostChannel.get()` to obtain the session's channel. It returns None
+    when the helper cannot be started (for example, when the host has no
+    `python3`), in which case callers should spawn commands directly.
+
+    The helper runs one command at a time. A call made while it is busy fails
+    right away, before anything is sent, so that the caller can spawn the
+    command directly instead of waiting. Every command runs with a timeout;
+    if the helper does not answer in time, it is killed and started again.
+    """
+
+    _shared: Optional["HostChannel"] = None
+    _unavailable = False
+    _shared_lock = threading.Lock()
+
+    def __init__(self, launcher: Optional[List[str]] = None):
+        """
+        Start the helper process.
+
+        Args:
+            launcher (Optional[List[str]]): The prefix used to run the helper,
+                `flatpak-spawn --host` by default.
+        """
+        if launcher is None:
+            launcher = ["flatpak-spawn", "--host"]
+        self.launcher = launcher
+        self._lock = threading.Lock()
+        self.process: Optional[subprocess.Popen] = None
+        self._start()
+
+    def _start(self) -> None:
+        """Start a new helper process."""
+        self.process = subprocess.Popen(
+            self.launcher + ["python3", "-c", HELPER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _restart(self) -> None:
+        """Kill the helper, which may be stuck in the middle of a request, and start a new one."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+        try:
+            self._start()
+        except OSError:
+            self.process = None
+
+    @classmethod
+    def get(cls) -> Optional["HostChannel"]:
+        """Return the shared channel, starting it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None and not cls._unavailable:
+                try:
+                    channel = cls()
+                    if channel.run(["true"])[0] != 0:
+                        raise HostChannelError("Helper self-test failed", sent=True)
+                    cls._shared = channel
+                    atexit.register(channel.close)
+                except (OSError, subprocess.SubprocessError):
+                    cls._unavailable = True
+            return cls._shared
+
+    @classmethod
+    def supports(cls, kwargs: dict) -> bool:
+        """Check whether a call with these subprocess.run arguments can go through the channel."""
+        if not SUPPORTED_KWARGS.issuperset(kwargs):
+            return False
+        return all(kwargs.get(stream) in (None, subprocess.PIPE, subprocess.DEVNULL) for stream in ("stdout", "stderr"))
+
+    def run(
+        self,
+        argv: List[str],
+        input: Optional[bytes] = None,
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes, bytes]:
+        """
+        Run a command on the host and wait for it to finish.
+
+        Args:
+            argv (List[str]): The command to run.
+            input (Optional[bytes]): Data for the command's stdin.
+            cwd (Optional[str]): The directory to run the command in.
+            timeout (Optional[float]): Seconds after which the command is
+                killed; `DEFAULT_TIMEOUT` if not given.
+
+        Returns:
+            Tuple[int, bytes, bytes]: The return code, stdout and stderr.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command or the helper did not
+                finish in time.
+            HostChannelError: If the helper is busy or failed; see its `sent`
+                attribute.
+        """
+        timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+        request = {"argv": [str(arg) for arg in argv], "cwd": str(cwd) if cwd else None, "timeout": timeout}
+        if input is not None:
+            request["input"] = base64.b64encode(input).decode()
+        payload = json.dumps(request).encode()
+
+        if not self._lock.acquire(blocking=False):
+            raise HostChannelError("Helper is busy", sent=False)
+        try:
+            process = self.process
+            if process is None or process.poll() is not None:
+                raise HostChannelError("Helper is not running", sent=False)
+            assert process.stdin is not None and process.stdout is not None
+            try:
+                process.stdin.write(struct.pack(">I", len(payload)) + payload)
+                process.stdin.flush()
+            except OSError as e:
+                self._restart()
+                raise HostChannelError(f"Helper failed: {e}", sent=False) from e
+
+            deadline = time.monotonic() + timeout + RESPONSE_GRACE
+            try:
+                header = self._read_exact(process.stdout.fileno(), 4, deadline)
+                response = json.loads(
+                    self._read_exact(process.stdout.fileno(), struct.unpack(">I", header)[0], deadline)
+                )
+            except TimeoutError:
+                self._restart()
+                raise subprocess.TimeoutExpired(argv, timeout) from None
+            except (OSError, ValueError, HostChannelError) as e:
+                self._restart()
+                raise HostChannelError(f"Helper failed: {e}", sent=True) from e
+        finally:
+            self._lock.release()
+
+        stdout, stderr = base64.b64decode(response["stdout"]), base64.b64decode(response["stderr"])
+        if response.get("timeout"):
+            raise subprocess.TimeoutExpired(argv, timeout, output=stdout, stderr=stderr)
+        return response["returncode"], stdout, stderr
+
+    @staticmethod
+    def _read_exact(fd: int, size: int, deadline: float) -> bytes:
+        """Read `size` bytes from a pipe, raising TimeoutError once the deadline passes."""
+        data = b""
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                raise HostChannelError("Helper closed the channel", sent=True)
+            data += chunk
+        return data
+
+    def run_completed(self, command: List[str], **kwargs) -> subprocess.CompletedProcess:
+        """Run a command with `subprocess.run` semantics for the supported arguments."""
+        text = kwargs.get("text", False)
+        input_data = kwargs.get("input")
+        if text and input_data is not None:
+            input_data = input_data.encode()
+
+        returncode, stdout, stderr = self.run(
+            command, input=input_data, cwd=kwargs.get("cwd"), timeout=kwargs.get("timeout")
+        )
+
+        capture = kwargs.get("capture_output", False)
+        out = stdout if capture or kwargs.get("stdout") == subprocess.PIPE else None
+        err = stderr if capture or kwargs.get("stderr") == subprocess.PIPE else None
+        if text:
+            out = out.decode(errors="replace") if out is not None else None
+            err = err.decode(errors="replace") if err is not None else None
+
+        if kwargs.get("check") and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, output=out, stderr=err)
+        return subprocess.CompletedProcess(command, returncode, out, err)
+
+    def close(self) -> None:
+        """Stop the helper process."""
+        with self._lock:
+            process = self.process
+            if process is not None and process.poll() is None and process.stdin:
+                process.stdin.close()
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        if HostChannel._shared is self:
+            HostChannel._shared = None
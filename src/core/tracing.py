@@ -0,0 +1,156 @@
+"""
+Tracing module for the Twinverse application.
+
+This module records timed spans of the launch and shutdown phases and writes
+them as a Chrome trace-event JSON file per session under `Config.LOG_DIR`,
+which can be opened in Perfetto or chrome://tracing.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import Config
+
+# Events beyond this are dropped, so a long session cannot grow without bound.
+MAX_EVENTS = 100_000
+
+# How many session trace files are kept in the log directory.
+MAX_TRACE_FILES = 5
+
+
+class Tracer:
+    """
+    Collects trace events for the current session.
+
+    Use `Tracer.get()` to obtain the shared tracer. Spans and instant events
+    are always collected, which costs a clock read and a list append; the
+    session's file is written by `write()` and closed by `end_session()`,
+    after which a new file is started for the next session. Only the last
+    `MAX_TRACE_FILES` trace files are kept.
+    """
+
+    _shared: Optional["Tracer"] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        """Initialize an empty tracer."""
+        self.path: Optional[Path] = None
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._events_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @classmethod
+    def get(cls) -> "Tracer":
+        """Return the shared tracer."""
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _now_us() -> float:
+        """Return a monotonic timestamp in microseconds."""
+        return time.perf_counter_ns() / 1000
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        """Record an event for the calling thread."""
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event.update(pid=self._pid, tid=tid)
+        with self._events_lock:
+            if len(self._events) < MAX_EVENTS:
+                self._events.append(event)
+            self._thread_names.setdefault(tid, thread.name)
+
+    @contextmanager
+    def span(self, name: str, category: str = "twinverse", **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block as a complete ("X") event.
+
+        Yields:
+            Dict[str, Any]: The event's arguments, which the block may extend.
+        """
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            self._add(
+                {"name": name, "cat": category, "ph": "X", "ts": start, "dur": self._now_us() - start, "args": args}
+            )
+
+    def instant(self, name: str, category: str = "twinverse", **args: Any) -> None:
+        """Record a point in time, such as an instance reaching a readiness stage."""
+        self._add({"name": name, "cat": category, "ph": "i", "s": "p", "ts": self._now_us(), "args": args})
+
+    def write(self) -> Path:
+        """
+        Write every event of the current session to its trace file.
+
+        Returns:
+            Path: The trace file, `Config.LOG_DIR/trace_<timestamp>.json`.
+        """
+        with self._events_lock:
+            path, trace = self._snapshot()
+        return self._write_file(path, trace)
+
+    def end_session(self) -> Optional[Path]:
+        """Write the current session, if it has any events, and start a new one."""
+        with self._events_lock:
+            snapshot = self._snapshot() if self._events else None
+            self.path = None
+            self._events.clear()
+            self._thread_names.clear()
+        return self._write_file(*snapshot) if snapshot else None
+
+    def _snapshot(self) -> Tuple[Path, Dict[str, Any]]:
+        """Return the session's trace file and contents; the caller holds `_events_lock`."""
+        if self.path is None:
+            self.path = Config.LOG_DIR / f"trace_{time.strftime('%Y%m%d-%H%M%S')}.json"
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._thread_names.items()
+        ]
+        return self.path, {"traceEvents": metadata + self._events, "displayTimeUnit": "ms"}
+
+    def _write_file(self, path: Path, trace: Dict[str, Any]) -> Path:
+        """Atomically write a trace file, removing the oldest traces when it is a new one."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            self._remove_old_traces(path)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(trace), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _remove_old_traces(new_path: Path) -> None:
+        """Delete the oldest trace files, so the new one brings them to `MAX_TRACE_FILES`."""
+        old_traces = sorted(p for p in new_path.parent.glob("trace_*.json") if p != new_path)
+        for path in old_traces[: max(len(old_traces) - (MAX_TRACE_FILES - 1), 0)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def traced(category: str) -> Callable[[Callable], Callable]:
+    """Decorate a function so that every call is recorded as a span named after it."""
+
+    def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Tracer.get().span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
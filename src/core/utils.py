@@ -5,11 +5,17 @@ This module provides utility functions and classes that are commonly used
 throughout the Twinverse application.
 """
 
+import fcntl
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
-from typing import List, Literal, Union, overload
+from typing import List, Literal, Optional, Sequence, Tuple, Union, overload
+
+# ioctl request number for FICLONE (share all data blocks of one file with another).
+FICLONE = 0x40049409
 
 
 class Utils:
@@ -30,10 +36,14 @@ class Utils:
             # Running as a script, assuming this file is in src/core
             return Path(__file__).resolve().parent.parent.parent
 
+    _is_flatpak: Optional[bool] = None
+
     @staticmethod
     def is_flatpak() -> bool:
         """Check if the application is running inside a Flatpak."""
-        return os.path.exists("/.flatpak-info")
+        if Utils._is_flatpak is None:
+            Utils._is_flatpak = os.path.exists("/.flatpak-info")
+        return Utils._is_flatpak
 
     @overload
     @staticmethod
@@ -52,6 +62,13 @@ class Utils:
         """
         Execute a command, using 'flatpak-spawn --host' if inside a Flatpak.
 
+        Inside a Flatpak, synchronous commands are sent to the persistent host
+        helper (see `HostChannel`) when their arguments allow it, which avoids
+        starting a new `flatpak-spawn` process for every call. They are only
+        spawned directly instead when the helper is busy or unavailable; a
+        helper failure after the command was sent is raised as a
+        `HostChannelError`.
+
         Args:
             command (List[str]): The command to execute.
             async_ (bool): If True, execute asynchronously and return a Popen object.
@@ -62,9 +79,142 @@ class Utils:
             Union[subprocess.CompletedProcess, subprocess.Popen]: The result of the command execution.
         """
         if Utils.is_flatpak():
+            if not async_:
+                from .host_channel import HostChannel, HostChannelError
+
+                # Synchronous commands go through the session's persistent host helper when possible.
+                channel = HostChannel.get() if HostChannel.supports(kwargs) else None
+                if channel:
+                    try:
+                        return channel.run_completed(command, **kwargs)
+                    except HostChannelError as e:
+                        # Once the request reached the helper the command may have run; never run it twice.
+                        if e.sent:
+                            raise
             command = ["flatpak-spawn", "--host"] + command
 
         if async_:
             return subprocess.Popen(command, **kwargs)
         else:
             return subprocess.run(command, **kwargs)
+
+    @staticmethod
+    def list_process_group(pgid: int) -> List[Tuple[int, str]]:
+        """
+        List the processes belonging to a process group.
+
+        Natively this reads `/proc` directly. Inside a Flatpak the host
+        processes are not visible, so `pgrep` is run on the host instead.
+
+        Args:
+            pgid (int): The process group ID to inspect.
+
+        Returns:
+            List[Tuple[int, str]]: A list of (pid, command name) tuples.
+        """
+        if Utils.is_flatpak():
+            result = Utils.flatpak_spawn_host(
+                ["pgrep", "-l", "-g", str(pgid)], capture_output=True, text=True, check=False
+            )
+            processes = []
+            for line in (result.stdout or "").splitlines():
+                pid_str, _, name = line.strip().partition(" ")
+                if pid_str.isdigit():
+                    processes.append((int(pid_str), name))
+            return processes
+
+        processes = []
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return processes
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as f:
+                    stat = f.read().decode(errors="replace")
+            except OSError:
+                continue
+            # The command name is wrapped in parentheses and may itself contain spaces.
+            name_start = stat.find("(")
+            name_end = stat.rfind(")")
+            fields = stat[name_end + 2 :].split()
+            if len(fields) > 2 and fields[2] == str(pgid):
+                processes.append((int(entry), stat[name_start + 1 : name_end]))
+        return processes
+
+    @staticmethod
+    def clone_file(src: Path, dst: Path) -> bool:
+        """
+        Copy a file, sharing its data blocks through a reflink when possible.
+
+        On filesystems without reflink support (or across filesystems) this
+        falls back to a regular copy. File metadata is preserved either way.
+
+        Args:
+            src (Path): The file to copy.
+            dst (Path): The destination path. It is overwritten if it exists.
+
+        Returns:
+            bool: True if the file was reflinked, False if it was copied.
+        """
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            shutil.copy2(src, dst)
+            return False
+        shutil.copystat(src, dst)
+        return True
+
+    @staticmethod
+    def clone_tree(src: Path, dst: Path, skip: Sequence[Path] = ()) -> Tuple[int, int]:
+        """
+        Recursively copy a directory, reflinking its files when possible.
+
+        Symlinks are recreated as they are. The copy is assembled in a
+        uniquely named directory next to `dst` and renamed into place at the
+        end, so an interrupted copy never leaves a partial tree at `dst`.
+
+        Args:
+            src (Path): The directory to copy.
+            dst (Path): The destination. It must not exist.
+            skip (Sequence[Path]): Directories, relative to `src`, that are
+                created empty instead of copied.
+
+        Returns:
+            Tuple[int, int]: The bytes that were reflinked and the bytes that
+            were copied.
+        """
+        reflinked = copied = 0
+        reflink = True
+        tmp_dst = Path(tempfile.mkdtemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent))
+        try:
+            for dirpath, dirnames, filenames in os.walk(src):
+                rel = Path(dirpath).relative_to(src)
+                (tmp_dst / rel).mkdir(parents=True, exist_ok=True)
+                if rel in skip:
+                    dirnames.clear()
+                    continue
+                for name in dirnames + filenames:
+                    src_path, dst_path = Path(dirpath) / name, tmp_dst / rel / name
+                    if src_path.is_symlink():
+                        os.symlink(os.readlink(src_path), dst_path)
+                    elif name in filenames:
+                        size = src_path.stat().st_size
+                        if reflink:
+                            # Once a reflink fails, the filesystem does not support it; stop trying.
+                            reflink = Utils.clone_file(src_path, dst_path)
+                        else:
+                            shutil.copy2(src_path, dst_path)
+                        if reflink:
+                            reflinked += size
+                        else:
+                            copied += size
+            shutil.copystat(src, tmp_dst)
+            os.rename(tmp_dst, dst)
+        except BaseException:
+            shutil.rmtree(tmp_dst, ignore_errors=True)
+            raise
+        return reflinked, copied
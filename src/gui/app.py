@@ -8,7 +8,6 @@ Twinverse application.
 import os
 import sys
 import threading
-import time
 
 import gi
 from gi.repository import Adw, Gio, GLib, Gtk
@@ -35,12 +34,14 @@ class TwinverseWindow(Adw.ApplicationWindow):
         self.profile = Profile.load()
         self.kde_manager = KdeManager(self.logger)
         self.instance_service = InstanceService(logger=self.logger, kde_manager=self.kde_manager)
+        self.instance_service.add_exit_listener(self._on_instance_exited)
         self._launch_thread = None
         self._cancel_launch_event = threading.Event()
         self._is_running = False
         self.utils = Utils()
         self._build_ui()
         self._update_launch_button_state()
+        self.instance_service.prepare_session(self.profile, self.layout_settings_page.get_selected_players())
         self.connect("close-request", self.on_close_request)
 
     def _show_error_dialog(self, message):
@@ -110,6 +111,7 @@ class TwinverseWindow(Adw.ApplicationWindow):
         self.logger.info("Profile auto-saved.")
         self.layout_settings_page._run_all_verifications()
         self._update_launch_button_state()
+        self.instance_service.prepare_session(self.profile, self.layout_settings_page.get_selected_players())
 
     def _update_launch_button_state(self, *args):
         selected_players = self.layout_settings_page.get_selected_players()
@@ -125,13 +127,9 @@ class TwinverseWindow(Adw.ApplicationWindow):
         self.logger.info(f"Launch worker started for players: {selected_players}")
 
         try:
-            for instance_num in selected_players:
-                if self._cancel_launch_event.is_set():
-                    self.logger.info("Launch sequence cancelled by user.")
-                    break
-                self.logger.info(f"Worker launching instance {instance_num}...")
-                self.instance_service.launch_instance(self.profile, instance_num)
-                time.sleep(5)
+            self.instance_service.launch_instances(
+                self.profile, selected_players, cancel_event=self._cancel_launch_event
+            )
 
             if not self._cancel_launch_event.is_set():
                 GLib.idle_add(self._on_launch_finished)
@@ -142,6 +140,18 @@ class TwinverseWindow(Adw.ApplicationWindow):
             GLib.idle_add(self._show_error_dialog, f"Could not launch: {e}")
             GLib.idle_add(self._restore_ui_after_failed_launch)
 
+    def _on_instance_exited(self, instance_num, returncode, runtime):
+        # Called from the supervisor thread; hand over to the main loop.
+        GLib.idle_add(self._handle_instance_exit, instance_num, returncode, runtime)
+
+    def _handle_instance_exit(self, instance_num, returncode, runtime):
+        if self.instance_service.termination_in_progress or not self._is_running:
+            return
+        self.layout_settings_page.set_running_state(False, instance_num)
+        if not self.instance_service.processes:
+            self.logger.info("All instances have exited. Cleaning up session.")
+            self.on_stop_clicked()
+
     def _restore_ui_after_failed_launch(self):
         self.kde_manager.restore_panel_states()
         self.launch_label.set_label("Play")
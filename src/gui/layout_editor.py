@@ -7,13 +7,15 @@ device configurations.
 """
 
 import os
+import threading
 
 import gi
-from gi.repository import Adw, GObject, Gtk
+from gi.repository import Adw, GLib, GObject, Gtk
 
 from src.core import Config
 from src.models import PlayerInstanceConfig, Profile, SplitscreenConfig
-from src.services import DeviceManager, InstanceService, SteamVerifier
+from src.services import DeviceManager, DeviceRegistry, InstanceService, SteamVerifier
+from src.services.layout import get_monitor_capacity
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
@@ -36,17 +38,119 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         self.player_rows = []
         self.logger = logger
         self.instance_service = InstanceService(logger)
+        self.instance_service.add_exit_listener(
+            lambda instance_num, returncode, runtime: GLib.idle_add(self.set_running_state, False, instance_num)
+        )
         self.steam_verifier = SteamVerifier(logger)
         self.verification_statuses = {}
         self.device_manager = DeviceManager()
-        self.input_devices = self.device_manager.get_input_devices()
-        self.audio_devices = self.device_manager.get_audio_devices()
-        self.display_outputs = self.device_manager.get_screen_info()
+        # Discovery spawns host tools, so the page is first built from the cached
+        # lists and filled in by _discover_devices_worker once it has finished.
+        cached = self.device_manager.load_cached_devices() or {}
+        self.input_devices = self._with_profile_joysticks(
+            cached.get("input", {"keyboard": [], "mouse": [], "joystick": []})
+        )
+        self.audio_devices = self._with_profile_audio(cached.get("audio", []))
+        self.display_outputs = cached.get("screens")
         self.refresh_rates = ["60", "75", "90", "120", "144", "165", "180", "240"]
 
         self._build_ui()
         self.load_profile_data()
-        self._run_all_verifications()
+        self.device_registry = DeviceRegistry.get()
+        self.device_registry.subscribe(
+            lambda action, device_type, device: GLib.idle_add(
+                self._on_input_device_changed, action, device_type, device
+            )
+        )
+        self.device_registry.start()
+        threading.Thread(target=self._discover_devices_worker, daemon=True).start()
+
+    def _with_profile_joysticks(self, input_devices):
+        """Return the input device lists with the profile's gamepads added if they are missing."""
+        joysticks = list(input_devices.get("joystick", []))
+        known = {os.path.realpath(d["id"]) for d in joysticks}
+        for config in self.profile.player_configs:
+            device_id = config.physical_device_id
+            if device_id and os.path.realpath(device_id) not in known:
+                joysticks.append({"id": device_id, "name": self.device_manager._get_device_name_from_id(device_id)})
+                known.add(os.path.realpath(device_id))
+        return dict(input_devices, joystick=joysticks)
+
+    def _with_profile_audio(self, audio_devices):
+        """Return the audio devices with the profile's sinks added if they are missing."""
+        audio_devices = list(audio_devices)
+        known = {d["id"] for d in audio_devices}
+        for config in self.profile.player_configs:
+            if config.audio_device_id and config.audio_device_id not in known:
+                audio_devices.append({"id": config.audio_device_id, "name": config.audio_device_id})
+                known.add(config.audio_device_id)
+        return audio_devices
+
+    def _discover_devices_worker(self):
+        """
+        Discover devices and verify the instances off the main thread, then apply the results.
+
+        The results are always applied, so the instance limit and the Play
+        button are set up even if a discovery fails: a list that could not be
+        discovered keeps its cached (or empty) value, and an instance that
+        could not be verified counts as not verified.
+        """
+        cached = self.device_manager.load_cached_devices() or {}
+        devices = {
+            "input": cached.get("input", {"keyboard": [], "mouse": [], "joystick": []}),
+            "audio": cached.get("audio", []),
+            "screens": cached.get("screens") or [],
+        }
+        discoveries = {
+            "input": self.device_manager.get_input_devices,
+            "audio": self.device_manager.get_audio_devices,
+            "screens": self.device_manager.get_screen_info,
+        }
+        for kind, discover in discoveries.items():
+            try:
+                devices[kind] = discover()
+            except Exception as e:
+                self.logger.error(f"Could not discover {kind} devices, keeping the cached ones: {e}")
+        try:
+            self.device_manager.save_cached_devices(devices)
+        except Exception as e:
+            self.logger.warning(f"Could not save the device cache: {e}")
+
+        statuses = {}
+        for num in range(max(self.profile.num_players, len(self.profile.player_configs))):
+            try:
+                statuses[num] = self.steam_verifier.verify(Config.get_steam_home_path(num))
+            except Exception as e:
+                self.logger.error(f"Could not verify the Steam installation of instance {num}: {e}")
+                statuses[num] = False
+        GLib.idle_add(self._on_devices_discovered, devices, statuses)
+
+    def _on_devices_discovered(self, devices, statuses):
+        """Replace the placeholder device lists with the discovered ones, keeping every selection."""
+        self._set_joystick_devices(devices["input"]["joystick"])
+        self.input_devices = dict(devices["input"], joystick=self.input_devices["joystick"])
+
+        was_loading = self._is_loading
+        self._is_loading = True
+        audio_ids = [
+            self._get_combo_row_device_id(row_dict["audio"], self.audio_devices) for row_dict in self.player_rows
+        ]
+        self.audio_devices = devices["audio"]
+        audio_names = ["None"] + [d["name"] for d in self.audio_devices]
+        for row_dict, audio_id in zip(self.player_rows, audio_ids):
+            row_dict["audio"].set_model(Gtk.StringList.new(audio_names))
+            self._set_combo_row_selection(row_dict["audio"], self.audio_devices, audio_id)
+        self._is_loading = was_loading
+
+        self.display_outputs = devices["screens"]
+        self._update_num_players_limit()
+
+        for instance_num, is_verified in statuses.items():
+            if instance_num < len(self.player_rows):
+                self.verification_statuses[instance_num] = is_verified
+                self._update_verification_status_ui(instance_num, is_verified)
+        self.emit("verification-completed")
+        return GLib.SOURCE_REMOVE
 
     def _build_ui(self):
         self.set_title("Layout Settings")
@@ -198,7 +302,11 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         self.profile.mode = self.screen_mode_row.get_selected_item().get_string().lower()
         if self.profile.mode == "splitscreen":
             orientation = self.orientation_row.get_selected_item().get_string().lower()
-            self.profile.splitscreen = SplitscreenConfig(ORIENTATION=orientation)
+            if self.profile.splitscreen:
+                # Keep the grid settings that are only set in the profile file.
+                self.profile.splitscreen = self.profile.splitscreen.model_copy(update={"orientation": orientation})
+            else:
+                self.profile.splitscreen = SplitscreenConfig(ORIENTATION=orientation)
         else:
             self.profile.splitscreen = None
 
@@ -267,23 +375,33 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         selected_mode = combo_row.get_selected_item().get_string().lower()
         is_splitscreen = selected_mode == "splitscreen"
         self.orientation_row.set_visible(is_splitscreen)
+        self._update_num_players_limit()
 
+        if not self._is_loading:
+            self.emit("settings-changed")
+
+    def _update_num_players_limit(self):
+        """Limit the number of instances to what the connected monitors can show in the selected mode."""
+        if self.display_outputs is None:
+            # Not discovered yet; _on_devices_discovered applies the limit.
+            return
+
+        selected_mode = self.screen_mode_row.get_selected_item().get_string().lower()
         adjustment = self.num_players_row.get_adjustment()
-        num_monitors = len(self.display_outputs)
+        # With no monitor found, still allow one instance rather than none.
+        num_monitors = max(len(self.display_outputs), 1)
 
         if selected_mode == "fullscreen":
             adjustment.set_upper(num_monitors)
             if adjustment.get_value() > num_monitors:
                 adjustment.set_value(num_monitors)
         else:  # splitscreen
-            new_limit = 4 * num_monitors if num_monitors > 0 else 4
+            capacity = get_monitor_capacity(self.profile.splitscreen)
+            new_limit = capacity * num_monitors
             adjustment.set_upper(new_limit)
             if adjustment.get_value() > new_limit:
                 adjustment.set_value(new_limit)
 
-        if not self._is_loading:
-            self.emit("settings-changed")
-
     def _on_gamescope_toggled(self, switch, *args):
         is_active = switch.get_active()
         self.gamescope_settings_group.set_visible(is_active)
@@ -381,21 +499,35 @@ class LayoutSettingsPage(Adw.PreferencesPage):
                 env[key] = str(val)
         return env
 
-    def _on_refresh_joysticks_clicked(self, button, joystick_row):
-        """Refresh the joystick list for a specific ComboRow."""
-        self.logger.info("Refreshing joystick list...")
-        selected_id = self._get_combo_row_device_id(joystick_row, self.input_devices.get("joystick", []))
-
-        self.input_devices = self.device_manager.get_input_devices()
-        joysticks = self.input_devices.get("joystick", [])
-        self.logger.info(f"Found {len(joysticks)} joysticks.")
-
-        new_model = Gtk.StringList.new(["None"] + [d["name"] for d in joysticks])
-        joystick_row.set_model(new_model)
-
-        self._set_combo_row_selection(joystick_row, joysticks, selected_id)
-
-        self._on_setting_changed()
+    def _on_input_device_changed(self, action, device_type, device):
+        """Show a gamepad that was plugged in or unplugged in every row."""
+        if device_type == "joystick":
+            self.logger.info(f"Gamepad {action}: {device['name']}")
+            self._set_joystick_devices(self.device_registry.get_input_devices()["joystick"])
+        return GLib.SOURCE_REMOVE
+
+    def _set_joystick_devices(self, joysticks):
+        """Show the given gamepads in every row, keeping each row's selection even if its gamepad is gone."""
+        selected_ids = [
+            self._get_combo_row_device_id(row_dict["joystick"], self.input_devices["joystick"])
+            for row_dict in self.player_rows
+        ]
+        joysticks = list(joysticks)
+        known = {os.path.realpath(d["id"]) for d in joysticks}
+        for device_id in selected_ids:
+            if device_id and os.path.realpath(device_id) not in known:
+                name = self.device_manager._get_device_name_from_id(device_id)
+                joysticks.append({"id": device_id, "name": f"{name} (disconnected)"})
+                known.add(os.path.realpath(device_id))
+        self.input_devices = dict(self.input_devices, joystick=joysticks)
+
+        was_loading = self._is_loading
+        self._is_loading = True
+        joystick_names = ["None"] + [d["name"] for d in joysticks]
+        for row_dict, device_id in zip(self.player_rows, selected_ids):
+            row_dict["joystick"].set_model(Gtk.StringList.new(joystick_names))
+            self._set_combo_row_selection(row_dict["joystick"], joysticks, device_id)
+        self._is_loading = was_loading
 
     def rebuild_player_rows(self):
         """Rebuild the player configuration rows in the UI."""
@@ -429,11 +561,6 @@ class LayoutSettingsPage(Adw.PreferencesPage):
                 return row
 
             joystick_row = create_device_row("Gamepad", "joystick", expander)
-            refresh_button = Gtk.Button.new_from_icon_name("view-refresh-symbolic")
-            refresh_button.set_tooltip_text("Atualizar lista de dispositivos")
-            refresh_button.get_style_context().add_class("flat")
-            refresh_button.connect("clicked", self._on_refresh_joysticks_clicked, joystick_row)
-            joystick_row.add_suffix(refresh_button)
             # mouse_row = create_device_row("Mouse", "mouse", expander)
             # keyboard_row = create_device_row("Keyboard", "keyboard", expander)
 
@@ -543,9 +670,11 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         """Check if any instance is currently running."""
         return any(r["is_running"] for r in self.player_rows)
 
-    def set_running_state(self, is_running):
-        """Set the running state for all player rows."""
-        for row_data in self.player_rows:
+    def set_running_state(self, is_running, instance_num=None):
+        """Set the running state for all player rows, or only for the given instance."""
+        for i, row_data in enumerate(self.player_rows):
+            if instance_num is not None and i != instance_num:
+                continue
             row_data["is_running"] = is_running
             button = row_data["launch_button"]
             if is_running:
@@ -1,6 +1,24 @@
 """Data models for Twinverse."""
 
 from .instance import SteamInstance
-from .profile import PlayerInstanceConfig, Profile, SplitscreenConfig
+from .launch_plan import (
+    VIRTUAL_JOYSTICK_PLACEHOLDER,
+    HostSteamScan,
+    InstanceLaunchPlan,
+    LaunchPlan,
+)
+from .profile import READY_STAGES, PlayerInstanceConfig, Profile, SplitscreenConfig
+from .resource_sample import InstanceResourceSample
 
-__all__ = ["SteamInstance", "PlayerInstanceConfig", "SplitscreenConfig", "Profile"]
+__all__ = [
+    "SteamInstance",
+    "PlayerInstanceConfig",
+    "SplitscreenConfig",
+    "Profile",
+    "READY_STAGES",
+    "HostSteamScan",
+    "InstanceLaunchPlan",
+    "LaunchPlan",
+    "VIRTUAL_JOYSTICK_PLACEHOLDER",
+    "InstanceResourceSample",
+]
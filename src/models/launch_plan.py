@@ -0,0 +1,83 @@
+"""
+Module defining the launch plan model for the Twinverse application.
+
+This module contains the data models describing a fully resolved launch
+session: the shared host scan, the monitor topology and the command line and
+environment of every instance to spawn.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Stands for the virtual joystick in planned commands; it is created, and its path known, only at launch.
+VIRTUAL_JOYSTICK_PLACEHOLDER = "@VIRTUAL_JOYSTICK@"
+
+
+class HostSteamScan(BaseModel):
+    """
+    Directories and devices found on the host that are shared with every sandbox.
+
+    `common_dirs` and `compat_tools` are only listed for the per-folder
+    sandbox bind mode; the shared-tree mode only needs to know whether the
+    directories exist.
+    """
+
+    has_common: bool = False
+    has_compat: bool = False
+    has_shadercache: bool = False
+    common_dirs: List[str] = Field(default_factory=list)
+    compat_tools: List[str] = Field(default_factory=list)
+    compat_ignored: List[str] = Field(default_factory=list)
+    has_uinput: bool = False
+    has_mice: bool = False
+
+
+class InstanceLaunchPlan(BaseModel):
+    """
+    The resolved command line, environment and placement for a single instance.
+
+    `cgroup_properties` holds the systemd resource properties of the
+    instance's cgroup scope, or None when it is not launched in a scope.
+    """
+
+    instance_num: int
+    home_path: str
+    command: List[str]
+    env: Dict[str, str] = Field(default_factory=dict)
+    device_info: Dict[str, Any] = Field(default_factory=dict)
+    cpu_set: Optional[str] = None
+    cgroup_properties: Optional[Dict[str, str]] = None
+
+
+class LaunchPlan(BaseModel):
+    """
+    A launch session resolved in one pass for all selected instances.
+
+    Attributes:
+        use_gamescope (bool): Whether the instances run inside Gamescope.
+        monitors (List[Dict[str, int]]): The monitor topology used for sizing.
+        host_scan (HostSteamScan): The shared host Steam scan.
+        virtual_joystick_path (Optional[str]): `VIRTUAL_JOYSTICK_PLACEHOLDER`
+            if a player uses the virtual joystick, else None.
+        instances (List[InstanceLaunchPlan]): The per-instance plans, in launch order.
+        timings (Dict[str, float]): Seconds spent in each resolution phase.
+    """
+
+    use_gamescope: bool = True
+    monitors: List[Dict[str, int]] = Field(default_factory=list)
+    host_scan: HostSteamScan = Field(default_factory=HostSteamScan)
+    virtual_joystick_path: Optional[str] = None
+    instances: List[InstanceLaunchPlan] = Field(default_factory=list)
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+    def get_instance(self, instance_num: int) -> Optional[InstanceLaunchPlan]:
+        """Return the plan for a given instance, if it is part of the session."""
+        for instance_plan in self.instances:
+            if instance_plan.instance_num == instance_num:
+                return instance_plan
+        return None
+
+    def to_json(self) -> str:
+        """Serialize the plan for inspection or benchmarking."""
+        return self.model_dump_json(indent=4)
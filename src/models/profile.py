@@ -6,12 +6,17 @@ how to launch a set of Steam instances with specific configurations.
 """
 
 import json
+import re
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from pydantic.functional_validators import field_validator
 
-from src.core import Config, ProfileNotFoundError  # noqa: F401
+from src.core import Config, ProfileNotFoundError
+
+# The stages an instance can be waited for before the next one is launched.
+READY_STAGES = ["gamescope_window", "steam_ui", "timeout"]
 
 
 class PlayerInstanceConfig(BaseModel):
@@ -25,6 +30,31 @@ class PlayerInstanceConfig(BaseModel):
     monitor_id: Optional[str] = Field(default=None, alias="MONITOR_ID")
     env: Optional[Dict[str, str]] = Field(default=None, alias="ENV")
     refresh_rate: int = Field(default=60, alias="REFRESH_RATE")
+    cpu_set: Optional[str] = Field(default=None, alias="CPU_SET")
+    cpu_weight: Optional[int] = Field(default=None, alias="CPU_WEIGHT")
+    memory_high: Optional[str] = Field(default=None, alias="MEMORY_HIGH")
+    io_weight: Optional[int] = Field(default=None, alias="IO_WEIGHT")
+
+    @field_validator("cpu_set")
+    def validate_cpu_set(cls, v):
+        """Validate that the CPU set is a kernel CPU list such as "0-3,8-11"."""
+        if v is not None and not re.fullmatch(r"\d+(-\d+)?(,\d+(-\d+)?)*", v):
+            raise ValueError("CPU set must be a CPU list such as '0-3,8-11'.")
+        return v
+
+    @field_validator("cpu_weight", "io_weight")
+    def validate_weight(cls, v):
+        """Validate that a cgroup weight is within the kernel's 1-10000 range."""
+        if v is not None and not 1 <= v <= 10000:
+            raise ValueError("Weights must be between 1 and 10000.")
+        return v
+
+    @field_validator("memory_high")
+    def validate_memory_high(cls, v):
+        """Validate that the memory limit is a size such as "4G", a percentage or "infinity"."""
+        if v is not None and not re.fullmatch(r"\d+[KMGT]?|\d+%|infinity", v):
+            raise ValueError("Memory high must be a size such as '4G', a percentage or 'infinity'.")
+        return v
 
 
 class SplitscreenConfig(BaseModel):
@@ -32,6 +62,9 @@ class SplitscreenConfig(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True)
     orientation: str = Field(alias="ORIENTATION")
+    players_per_monitor: int = Field(default=4, alias="PLAYERS_PER_MONITOR")
+    grid: Optional[str] = Field(default=None, alias="GRID")
+    split_weights: Optional[List[float]] = Field(default=None, alias="SPLIT_WEIGHTS")
 
     @field_validator("orientation")
     def validate_orientation(cls, v):
@@ -40,6 +73,27 @@ class SplitscreenConfig(BaseModel):
             raise ValueError("Orientation must be 'horizontal' or 'vertical'.")
         return v
 
+    @field_validator("players_per_monitor")
+    def validate_players_per_monitor(cls, v):
+        """Validate that at least one player fits on a monitor."""
+        if v < 1:
+            raise ValueError("Players per monitor must be at least 1.")
+        return v
+
+    @field_validator("grid")
+    def validate_grid(cls, v):
+        """Validate that the grid is "COLUMNSxROWS", such as "3x2"."""
+        if v is not None and not re.fullmatch(r"[1-9]\d*x[1-9]\d*", v):
+            raise ValueError("Grid must be 'COLUMNSxROWS', such as '3x2'.")
+        return v
+
+    @field_validator("split_weights")
+    def validate_split_weights(cls, v):
+        """Validate that the relative sizes of the rows or columns are positive."""
+        if v is not None and any(weight <= 0 for weight in v):
+            raise ValueError("Split weights must be greater than 0.")
+        return v
+
 
 class Profile(BaseModel):
     """A profile for launching a set of Steam instances with a specific configuration."""
@@ -59,11 +113,83 @@ class Profile(BaseModel):
         alias="PLAYERS",
     )
     selected_players: Optional[List[int]] = Field(default=None, alias="selected_players")
+    launch_ready_stage: str = Field(default="gamescope_window", alias="LAUNCH_READY_STAGE")
+    launch_ready_timeout: float = Field(default=15.0, alias="LAUNCH_READY_TIMEOUT")
+    # "shared_tree" is experimental: it binds the whole host library writable, so games installed from an
+    # instance go to the host, and the games installed only in an instance leave empty folders in the host library.
+    sandbox_bind_mode: str = Field(default="per_folder", alias="SANDBOX_BIND_MODE")
+    # Seconds between resource samples; 0 disables sampling and its per-session CSV.
+    resource_sample_interval: float = Field(default=0.0, alias="RESOURCE_SAMPLE_INTERVAL")
+    cpu_pinning: str = Field(default="off", alias="CPU_PINNING")
+    use_cgroup_scopes: bool = Field(default=True, alias="USE_CGROUP_SCOPES")
+    shader_cache_mode: str = Field(default="isolated", alias="SHADER_CACHE_MODE")
+    pressure_policy: str = Field(default="off", alias="PRESSURE_POLICY")
+    pressure_threshold: float = Field(default=20.0, alias="PRESSURE_THRESHOLD")
+
+    @field_validator("launch_ready_stage")
+    def validate_launch_ready_stage(cls, v):
+        """Validate that the readiness stage is a known one."""
+        if v not in READY_STAGES:
+            raise ValueError("Launch ready stage must be 'gamescope_window', 'steam_ui' or 'timeout'.")
+        return v
+
+    @field_validator("sandbox_bind_mode")
+    def validate_sandbox_bind_mode(cls, v):
+        """Validate that the sandbox bind mode is either shared_tree or per_folder."""
+        if v not in ["shared_tree", "per_folder"]:
+            raise ValueError("Sandbox bind mode must be 'shared_tree' or 'per_folder'.")
+        return v
+
+    @field_validator("shader_cache_mode")
+    def validate_shader_cache_mode(cls, v):
+        """Validate that the shader cache mode is either isolated or readonly."""
+        # The writable "shared" mode was removed; profiles that still use it get the read-only cache.
+        if v == "shared":
+            return "readonly"
+        if v not in ["isolated", "readonly"]:
+            raise ValueError("Shader cache mode must be 'isolated' or 'readonly'.")
+        return v
+
+    @field_validator("cpu_pinning")
+    def validate_cpu_pinning(cls, v):
+        """Validate that the CPU pinning mode is either off or auto."""
+        if v not in ["off", "auto"]:
+            raise ValueError("CPU pinning must be 'off' or 'auto'.")
+        return v
+
+    @field_validator("pressure_policy")
+    def validate_pressure_policy(cls, v):
+        """Validate that the pressure policy is off, renice or pause."""
+        if v not in ["off", "renice", "pause"]:
+            raise ValueError("Pressure policy must be 'off', 'renice' or 'pause'.")
+        return v
+
+    @field_validator("pressure_threshold")
+    def validate_pressure_threshold(cls, v):
+        """Validate that the pressure threshold is a percentage above zero."""
+        if not 0 < v <= 100:
+            raise ValueError("Pressure threshold must be greater than 0 and at most 100.")
+        return v
+
+    @field_validator("resource_sample_interval")
+    def validate_resource_sample_interval(cls, v):
+        """Validate that the resource sample interval is zero (disabled) or at least 0.1 seconds."""
+        if v != 0 and v < 0.1:
+            raise ValueError("Resource sample interval must be 0 (disabled) or at least 0.1 seconds.")
+        return v
 
     @classmethod
-    def load(cls) -> "Profile":
-        """Load the profile from the default JSON file."""
-        profile_path = Config.get_profile_path()
+    def load(cls, path: Optional[Path] = None) -> "Profile":
+        """
+        Load the profile from a JSON file, the default profile file if none is given.
+
+        Raises:
+            ProfileNotFoundError: If a given profile file does not exist.
+            ValueError: If the file cannot be read or fails validation.
+        """
+        if path is not None and not path.exists():
+            raise ProfileNotFoundError(f"Profile file {path} not found")
+        profile_path = path or Config.get_profile_path()
         if not profile_path.exists():
             # If no profile exists, create a default one and save it
             default_profile = cls()
@@ -103,6 +229,18 @@ class Profile(BaseModel):
             return len(self.selected_players)
         return len(self.player_configs) if self.player_configs else 0
 
+    def needs_virtual_joystick(self) -> bool:
+        """Check whether any player lacks a physical joystick, and so gets the shared virtual one."""
+        for i in range(self.effective_num_players()):
+            player_config = (
+                self.player_configs[i]
+                if self.player_configs and i < len(self.player_configs)
+                else PlayerInstanceConfig()
+            )
+            if not player_config.physical_device_id:
+                return True
+        return False
+
     def get_env_for_instance(self, instance_idx: int) -> Dict[str, str]:
         """Return the merged environment variables for a given instance index (0-based).
 
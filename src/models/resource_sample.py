@@ -0,0 +1,40 @@
+"""
+Module defining the resource sample model for the Twinverse application.
+
+This module contains the data model for the resources used by one instance's
+process group at a point in time.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class InstanceResourceSample(BaseModel):
+    """
+    Aggregated resource usage of every process in an instance's process group.
+
+    Attributes:
+        instance_num (int): The instance the sample belongs to.
+        pgid (int): The process group that was sampled.
+        timestamp (float): When the sample was taken (seconds since the epoch).
+        processes (int): The number of processes in the group.
+        threads (int): The total number of threads in the group.
+        cpu_percent (float): CPU usage since the previous sample, where 100
+            means one fully used core.
+        rss_bytes (int): The total resident set size.
+        pss_bytes (Optional[int]): The total proportional set size, if sampled.
+        read_bytes (Optional[int]): Bytes read from storage, if readable.
+        write_bytes (Optional[int]): Bytes written to storage, if readable.
+    """
+
+    instance_num: int
+    pgid: int
+    timestamp: float
+    processes: int = 0
+    threads: int = 0
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    pss_bytes: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
@@ -1,17 +1,52 @@
-"""Services for Twinverse application logic."""
+"""
+Services for Twinverse application logic.
 
-from .cmd_builder import CommandBuilder
-from .device_manager import DeviceManager
-from .instance import InstanceService
-from .kde_manager import KdeManager
-from .steam_verifier import SteamVerifier
-from .virtual_device import VirtualDeviceService
+The services are imported on first access (PEP 562), so that importing one of
+them does not load the others and their third-party dependencies.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cmd_builder import CommandBuilder
+    from .device_manager import DeviceManager
+    from .device_registry import DeviceRegistry
+    from .instance import InstanceService
+    from .kde_manager import KdeManager
+    from .steam_verifier import SteamVerifier
+    from .virtual_device import VirtualDeviceService
+
+_EXPORTS = {
+    "CommandBuilder": ".cmd_builder",
+    "DeviceManager": ".device_manager",
+    "DeviceRegistry": ".device_registry",
+    "InstanceService": ".instance",
+    "KdeManager": ".kde_manager",
+    "SteamVerifier": ".steam_verifier",
+    "VirtualDeviceService": ".virtual_device",
+}
 
 __all__ = [
     "CommandBuilder",
     "DeviceManager",
+    "DeviceRegistry",
     "InstanceService",
     "KdeManager",
     "SteamVerifier",
     "VirtualDeviceService",
 ]
+
+
+def __getattr__(name):
+    """Import an exported service on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exported services along with the module attributes."""
+    return sorted(set(globals()) | set(__all__))
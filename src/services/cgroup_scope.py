@@ -0,0 +1,95 @@
+"""
+cgroup scope module for the Twinverse application.
+
+This module places launched instances in their own cgroup v2 scope through
+`systemd-run --user --scope`, so each instance can be given its own CPU,
+memory and I/O share and be killed as a whole, including processes that
+left its process group.
+"""
+
+import signal
+import subprocess
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.core import HostCapabilities, Logger, Utils
+from src.models import PlayerInstanceConfig
+
+UNIT_PREFIX = "twinverse-instance"
+
+
+class CgroupScopes:
+    """
+    Launches instances in transient systemd scopes and signals them.
+
+    `systemd-run --scope` execs the command in place, so the launched process
+    keeps the PID and process group the rest of the service relies on. When
+    there is no cgroup v2 hierarchy or no reachable user manager, `available()`
+    returns False and instances are launched as plain process groups.
+    """
+
+    def __init__(self, logger: Logger):
+        """Initialize the scope manager."""
+        self.logger = logger
+        self._available: Optional[bool] = None
+
+    def available(self) -> bool:
+        """Check once whether transient user scopes can be created."""
+        if self._available is None:
+            capabilities = HostCapabilities.get()
+            self._available = False
+            if capabilities.kernel.get("cgroup2") and capabilities.has_tool("systemd-run"):
+                try:
+                    result = Utils.flatpak_spawn_host(
+                        ["systemd-run", "--user", "--scope", "--quiet", "--collect", "true"],
+                        capture_output=True,
+                        text=True,
+                        check=False,
+                    )
+                    self._available = result.returncode == 0
+                except (OSError, subprocess.SubprocessError):
+                    pass
+            if not self._available:
+                self.logger.warning("cgroup v2 user scopes unavailable, instances run as plain process groups.")
+        return self._available
+
+    @staticmethod
+    def get_properties(player_config: PlayerInstanceConfig) -> Dict[str, str]:
+        """Return the systemd resource properties configured for a player."""
+        properties: Dict[str, str] = {}
+        if player_config.cpu_weight is not None:
+            properties["CPUWeight"] = str(player_config.cpu_weight)
+        if player_config.memory_high is not None:
+            properties["MemoryHigh"] = player_config.memory_high
+        if player_config.io_weight is not None:
+            properties["IOWeight"] = str(player_config.io_weight)
+        return properties
+
+    def wrap_command(self, instance_num: int, command: List[str], properties: Dict[str, str]) -> Tuple[List[str], str]:
+        """
+        Prefix a command so that it runs in a new scope.
+
+        Returns:
+            Tuple[List[str], str]: The wrapped command and the scope unit name.
+        """
+        # The timestamp keeps the name unique if a previous scope of the instance is still being collected.
+        unit = f"{UNIT_PREFIX}-{instance_num}-{int(time.time() * 1000)}.scope"
+        wrapper = ["systemd-run", "--user", "--scope", "--quiet", "--collect", f"--unit={unit}"]
+        for key, value in properties.items():
+            wrapper.append(f"--property={key}={value}")
+        return wrapper + command, unit
+
+    def kill(self, units: List[str], sig: signal.Signals) -> None:
+        """Send a signal to every process in the given scopes at once."""
+        if not units:
+            return
+        self.logger.info(f"Sending {sig.name} to scopes {units}")
+        try:
+            Utils.flatpak_spawn_host(
+                ["systemctl", "--user", "kill", f"--signal={sig.name}"] + units,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning(f"Failed to send {sig.name} to scopes: {e}")
@@ -5,13 +5,17 @@ This module provides functionality to build complex command strings for launchin
 Steam instances with various configurations, including gamescope and bwrap sandboxing.
 """
 
+import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from src.core import Logger
-from src.models import Profile
+from src.core import HostCapabilities, Logger, traced
+from src.models import HostSteamScan, Profile
 from src.services.device_manager import DeviceManager
 
+# Compatibility tools each instance keeps for itself instead of sharing the host's.
+COMPAT_TOOLS_IGNORE = ["LegacyRuntime"]
+
 
 class CommandBuilder:
     """Builds command strings for launching Steam instances with various configurations."""
@@ -25,8 +29,16 @@ class CommandBuilder:
         instance_num: int,
         home_path: Path,
         virtual_joystick_path: Optional[str],
+        host_scan: Optional[HostSteamScan] = None,
+        monitors: Optional[List[Dict]] = None,
     ):
-        """Initialize the CommandBuilder with necessary parameters."""
+        """
+        Initialize the CommandBuilder with necessary parameters.
+
+        `host_scan` and `monitors` let a caller building commands for several
+        instances share one host scan and one monitor enumeration. They are
+        resolved on demand when omitted.
+        """
         self.logger = logger
         self.profile = profile
         self.device_info = device_info
@@ -34,7 +46,53 @@ class CommandBuilder:
         self.instance_num = instance_num
         self.home_path = home_path
         self.virtual_joystick_path = virtual_joystick_path
+        self.host_scan = host_scan
+        self.monitors = monitors
+
+    @staticmethod
+    def scan_host_steam(list_folders: bool = True) -> HostSteamScan:
+        """
+        Scan the host Steam installation for the directories and devices shared with the sandbox.
+
+        Args:
+            list_folders (bool): Whether to list every folder of `steamapps/common`
+                and `compatibilitytools.d`. Only the per-folder bind mode needs
+                them; without the listing the scan cost does not grow with the
+                size of the library.
+        """
+        host_steam_path = Path.home() / ".local/share/Steam"
+        host_common = host_steam_path / "steamapps/common"
+        host_compat = host_steam_path / "compatibilitytools.d"
+        scan = HostSteamScan(
+            has_common=host_common.exists(),
+            has_compat=host_compat.exists(),
+            has_shadercache=(host_steam_path / "steamapps/shadercache").exists(),
+            has_uinput=Path("/dev/uinput").exists(),
+            has_mice=Path("/dev/input/mice").exists(),
+        )
+        scan.compat_ignored = [name for name in COMPAT_TOOLS_IGNORE if (host_compat / name).is_dir()]
+
+        if list_folders and scan.has_common:
+            scan.common_dirs = sorted(entry.name for entry in os.scandir(host_common) if entry.is_dir())
+        if list_folders and scan.has_compat:
+            scan.compat_tools = sorted(
+                entry.name
+                for entry in os.scandir(host_compat)
+                if entry.is_dir() and entry.name not in COMPAT_TOOLS_IGNORE
+            )
+        return scan
+
+    @staticmethod
+    def _list_instance_only_games(instance_common: Path, host_common: Path) -> List[str]:
+        """List the game folders of an instance's `steamapps/common` that the host library does not have."""
+        try:
+            with os.scandir(instance_common) as it:
+                names = [entry.name for entry in it if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+        return sorted(name for name in names if not (host_common / name).exists())
 
+    @traced("command")
     def build_command(self) -> List[str]:
         """
         Build the final command array in the correct order.
@@ -66,7 +124,7 @@ class CommandBuilder:
 
     def _build_gamescope_command(self, should_add_grab_flags: bool) -> List[str]:
         """Build the Gamescope command."""
-        width, height = self.device_manager.get_instance_dimensions(self.profile, self.instance_num)
+        width, height = self.device_manager.get_instance_dimensions(self.profile, self.instance_num, self.monitors)
         if not width or not height:
             self.logger.error(f"Instance {self.instance_num}: Invalid dimensions. Aborting launch.")
             return []
@@ -97,17 +155,25 @@ class CommandBuilder:
             refresh_rate_str,
             "-r",
             refresh_rate_str,
-            "--mangoapp",
         ]
 
+        capabilities = HostCapabilities.get()
+        if capabilities.gamescope_supports("--mangoapp"):
+            cmd.append("--mangoapp")
+
         if not self.profile.is_splitscreen_mode:
-            cmd.extend(["-f", "--adaptive-sync"])
+            cmd.append("-f")
+            if capabilities.gamescope_supports("--adaptive-sync"):
+                cmd.append("--adaptive-sync")
         else:
             cmd.append("-b")  # Borderless
 
         if should_add_grab_flags:
             self.logger.info(f"Instance {self.instance_num}: Using dedicated mouse. Grabbing input.")
-            cmd.append("--force-grab-cursor")
+            if capabilities.gamescope_supports("--force-grab-cursor"):
+                cmd.append("--force-grab-cursor")
+            else:
+                self.logger.warning(f"Instance {self.instance_num}: Gamescope does not support --force-grab-cursor.")
 
         return cmd
 
@@ -171,9 +237,13 @@ class CommandBuilder:
                 self.logger.info(f"Instance {self.instance_num}: Exposing device '{device_path}' to sandbox.")
                 cmd.extend(["--dev-bind", device_path, device_path])
 
-        if Path("/dev/uinput").exists():
+        per_folder = self.profile.sandbox_bind_mode == "per_folder"
+        if self.host_scan is None:
+            self.host_scan = self.scan_host_steam(list_folders=per_folder)
+
+        if self.host_scan.has_uinput:
             cmd.extend(["--dev-bind", "/dev/uinput", "/dev/uinput"])
-        if Path("/dev/input/mice").exists():
+        if self.host_scan.has_mice:
             cmd.extend(["--dev-bind", "/dev/input/mice", "/dev/input/mice"])
         # --- End Device Isolation ---
 
@@ -191,24 +261,54 @@ class CommandBuilder:
         host_steam_path = orig_local / "share/Steam"
         sandbox_steam_path = orig_local / "share/Steam"  # Same path, but it's now a mount point
 
-        # Share games
         sandbox_common = Path(sandbox_steam_path) / "steamapps/common"
         host_common = Path(host_steam_path) / "steamapps/common"
-        if host_common.exists():
-            for folder in host_common.iterdir():
-                if folder.is_dir():
-                    cmd.extend(["--bind", str(folder), str(sandbox_common / folder.name)])
-
-        # Share compatibilitytools
         host_compat = Path(host_steam_path) / "compatibilitytools.d"
         sandbox_compat = Path(sandbox_steam_path) / "compatibilitytools.d"
-        if host_compat.exists():
-            ignore = {"LegacyRuntime"}
-            for folder in host_compat.iterdir():
-                if folder.is_dir() and folder.name not in ignore:
-                    cmd.extend(["--bind", str(folder), str(sandbox_compat / folder.name)])
+
+        if per_folder:
+            # Share games
+            for name in self.host_scan.common_dirs:
+                cmd.extend(["--bind", str(host_common / name), str(sandbox_common / name)])
+
+            # Share compatibilitytools
+            for name in self.host_scan.compat_tools:
+                cmd.extend(["--bind", str(host_compat / name), str(sandbox_compat / name)])
+        else:
+            # Share the whole games and compatibilitytools trees with a single
+            # bind each, so the argv does not grow with the library size.
+            self.logger.warning(
+                f"Instance {self.instance_num}: Sandbox bind mode 'shared_tree' is experimental; games installed "
+                "only in this instance leave empty folders in the host library."
+            )
+            if self.host_scan.has_common:
+                cmd.extend(["--bind", str(host_common), str(sandbox_common)])
+                # Put the games installed only in the instance's home back over the host's tree. Their mount
+                # points are created as empty folders in the host library.
+                instance_common = self.home_path / ".local/share/Steam/steamapps/common"
+                for name in self._list_instance_only_games(instance_common, host_common):
+                    cmd.extend(["--bind", str(instance_common / name), str(sandbox_common / name)])
+            if self.host_scan.has_compat:
+                cmd.extend(["--bind", str(host_compat), str(sandbox_compat)])
+                # Put the instance's own copy of ignored tools back over the host's.
+                instance_compat = self.home_path / ".local/share/Steam/compatibilitytools.d"
+                for name in self.host_scan.compat_ignored:
+                    if (instance_compat / name).is_dir():
+                        cmd.extend(["--bind", str(instance_compat / name), str(sandbox_compat / name)])
+                    else:
+                        cmd.extend(["--tmpfs", str(sandbox_compat / name)])
+
+        # Share the host shader cache read-only, so instances reuse the pipelines the host already compiled or
+        # downloaded. It is never writable: nothing makes concurrent Fossilize or pipeline cache writes safe.
+        if self.profile.shader_cache_mode == "readonly" and self.host_scan.has_shadercache:
+            shadercache = "steamapps/shadercache"
+            cmd.extend(["--ro-bind", str(host_steam_path / shadercache), str(sandbox_steam_path / shadercache)])
         # --- End Home Directory Isolation ---
 
+        if self.profile.shader_cache_mode != "isolated":
+            # Have Mesa print its shader cache hits and misses on exit, for the shader cache report.
+            cmd.extend(["--setenv", "MESA_SHADER_CACHE_SHOW_STATS", "1"])
+
         # Ensure custom ENV variables reach Steam inside the sandbox
         try:
             extra_env = (
@@ -0,0 +1,149 @@
+"""
+CPU topology module for the Twinverse application.
+
+This module reads the CPU topology from sysfs and splits the CPUs into one
+group per instance so that instances do not share cores or, where possible,
+L3 caches (CCDs on multi-die processors).
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SYS_CPU_PATH = Path("/sys/devices/system/cpu")
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """
+    Parse a kernel CPU list such as "0-3,8,10-11".
+
+    Raises:
+        ValueError: If the text is not a valid CPU list.
+    """
+    cpus = set()
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start, end = int(first), int(last or first)
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid CPU range '{part}'")
+        cpus.update(range(start, end + 1))
+    if not cpus:
+        raise ValueError("Empty CPU list")
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    """Format CPUs as a compact kernel CPU list, the inverse of `parse_cpu_list`."""
+    ranges: List[str] = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == int(ranges[-1].rpartition("-")[2]) + 1:
+            ranges[-1] = f"{ranges[-1].partition('-')[0]}-{cpu}"
+        else:
+            ranges.append(str(cpu))
+    return ",".join(ranges)
+
+
+class CpuTopology:
+    """
+    The online CPUs grouped by cache domain and physical core.
+
+    Attributes:
+        domains (List[List[List[int]]]): The L3 cache domains, each a list of
+            physical cores, each core a list of its hardware threads.
+    """
+
+    def __init__(self, domains: List[List[List[int]]]):
+        """Initialize the topology from its cache domains."""
+        self.domains = domains
+
+    @classmethod
+    def read(cls, sys_path: Path = SYS_CPU_PATH) -> "CpuTopology":
+        """
+        Read the topology of the online CPUs from sysfs.
+
+        CPUs are grouped by the highest cache level they report (normally the
+        L3), falling back to the physical package, and then split into cores
+        by their SMT siblings.
+        """
+        try:
+            online = parse_cpu_list((sys_path / "online").read_text())
+        except (OSError, ValueError):
+            online = [0]
+
+        domains: Dict[str, List[int]] = {}
+        siblings: Dict[int, str] = {}
+        for cpu in online:
+            cpu_path = sys_path / f"cpu{cpu}"
+            domains.setdefault(cls._read_domain(cpu_path), []).append(cpu)
+            siblings[cpu] = cls._read_text(cpu_path / "topology/thread_siblings_list") or str(cpu)
+
+        topology_domains: List[List[List[int]]] = []
+        for domain_cpus in sorted(domains.values()):
+            cores: Dict[str, List[int]] = {}
+            for cpu in domain_cpus:
+                cores.setdefault(siblings[cpu], []).append(cpu)
+            topology_domains.append(sorted(cores.values()))
+        return cls(topology_domains)
+
+    @staticmethod
+    def _read_text(path: Path) -> Optional[str]:
+        """Read a sysfs attribute, returning None if it does not exist."""
+        try:
+            return path.read_text().strip()
+        except OSError:
+            return None
+
+    @classmethod
+    def _read_domain(cls, cpu_path: Path) -> str:
+        """Return a key identifying the cache domain of a CPU."""
+        best_level, best_key = -1, None
+        for index_path in sorted((cpu_path / "cache").glob("index*")):
+            level = cls._read_text(index_path / "level")
+            shared = cls._read_text(index_path / "shared_cpu_list")
+            if level and level.isdigit() and shared and int(level) > best_level:
+                best_level, best_key = int(level), f"cache:{shared}"
+        if best_key:
+            return best_key
+        return f"package:{cls._read_text(cpu_path / 'topology/physical_package_id') or 0}"
+
+    @property
+    def cpus(self) -> List[int]:
+        """All online CPUs."""
+        return sorted(cpu for domain in self.domains for core in domain for cpu in core)
+
+    def split(self, num_groups: int) -> List[List[int]]:
+        """
+        Split the CPUs into groups that respect cache and core boundaries.
+
+        With at least as many cache domains as groups, every group gets whole
+        domains. Otherwise the groups are spread evenly over the domains and
+        each domain's cores are divided between the groups placed on it. SMT
+        siblings always stay in the same group; when there are more groups
+        than cores, groups share cores.
+
+        Args:
+            num_groups (int): The number of groups, usually the number of instances.
+
+        Returns:
+            List[List[int]]: The CPUs of each group.
+        """
+        if num_groups <= 0:
+            return []
+        num_domains = len(self.domains)
+
+        if num_groups <= num_domains:
+            groups = []
+            for i in range(num_groups):
+                domains = self.domains[i * num_domains // num_groups : (i + 1) * num_domains // num_groups]
+                groups.append(sorted(cpu for domain in domains for core in domain for cpu in core))
+            return groups
+
+        groups = []
+        for d, domain in enumerate(self.domains):
+            groups_here = num_groups // num_domains + (1 if d < num_groups % num_domains else 0)
+            for g in range(groups_here):
+                start = g * len(domain) // groups_here
+                end = max((g + 1) * len(domain) // groups_here, start + 1)
+                groups.append(sorted(cpu for core in domain[start:end] for cpu in core))
+        return groups
@@ -5,16 +5,19 @@ This module provides functionality to discover and manage system hardware device
 such as input devices, audio devices, and display outputs.
 """
 
+import json
 import logging
-import re
+import os
 import subprocess
-from typing import Dict, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from screeninfo import get_monitors
-
-from src.core import Utils
+from src.core import Config, HostCapabilities, Utils, traced
 from src.models import Profile
 
+from .device_registry import DeviceRegistry, get_device_name
+from .layout import compute_rects, get_slot
+
 
 class DeviceManager:
     """
@@ -22,8 +25,8 @@ class DeviceManager:
 
     This class provides methods to detect and list available input devices
     (keyboards, mice, joysticks), audio output devices (sinks), and display
-    outputs (monitors) by interfacing with system command-line tools like
-    `ls`, `pactl`, and `xrandr`.
+    outputs (monitors). Input devices come from the shared `DeviceRegistry`;
+    audio devices are listed with `pactl`.
     """
 
     def __init__(self):
@@ -52,31 +55,17 @@ class DeviceManager:
             return ""
 
     def _get_device_name_from_id(self, device_id_full: str) -> str:
-        """
-        Generate a human-readable name from a device's ID path.
-
-        It cleans up the raw device ID string by removing path prefixes and
-        technical suffixes, making it more suitable for display in a UI.
-
-        Args:
-            device_id_full (str): The full device path from `/dev/input/by-id/`.
-
-        Returns:
-            str: A cleaned, human-readable device name.
-        """
-        name_part = device_id_full.replace("/dev/input/by-id/", "")
-        name_part = re.sub(r"-event-(kbd|mouse|joystick)", "", name_part)
-        name_part = re.sub(r"-if\d+", "", name_part)
-        name_part = name_part.replace("usb-", "").replace("_", " ")
-        name_part = " ".join([word.capitalize() for word in name_part.split(" ")]).strip()
-        return name_part
+        """Generate a human-readable name from a device's ID path (see `get_device_name`)."""
+        return get_device_name(device_id_full)
 
+    @traced("devices")
     def get_input_devices(self) -> Dict[str, List[Dict[str, str]]]:
         """
         Detect and categorize available input devices.
 
-        Parse the output of `ls -l /dev/input/by-id/` to find keyboards,
-        mice, and joysticks.
+        The devices come from the process-wide `DeviceRegistry`, which reads
+        the links under `/dev/input/by-id/` to find keyboards, mice, and
+        joysticks.
 
         Returns:
             Dict[str, List[Dict[str, str]]]: A dictionary where keys are
@@ -84,39 +73,9 @@ class DeviceManager:
             device dictionaries, with each dictionary containing the
             device's 'id' (path) and 'name' (human-readable).
         """
-        detected_devices: Dict[str, List[Dict[str, str]]] = {
-            "keyboard": [],
-            "mouse": [],
-            "joystick": [],
-        }
-        by_id_output = self._run_command("ls -l /dev/input/by-id/")
-
-        # A more specific regex to find symlinks to event devices.
-        device_pattern = re.compile(r"\s([^\s]+)\s+->\s+\.\./event\d+")
-
-        for line in by_id_output.splitlines():
-            try:
-                match = device_pattern.search(line)
-                if match:
-                    device_name_id_raw = match.group(1)
-                    full_path = f"/dev/input/by-id/{device_name_id_raw}"
-                    human_name = self._get_device_name_from_id(full_path)
-                    device = {"id": full_path, "name": human_name}
-
-                    if "event-joystick" in device_name_id_raw:
-                        detected_devices["joystick"].append(device)
-                    elif "event-mouse" in device_name_id_raw:
-                        detected_devices["mouse"].append(device)
-                    elif "event-kbd" in device_name_id_raw:
-                        detected_devices["keyboard"].append(device)
-            except (IndexError, AttributeError) as e:
-                logging.warning(f"Could not parse input device line: '{line}'. Error: {e}")
-                continue
-
-        for dev_type in detected_devices:
-            detected_devices[dev_type] = sorted(detected_devices[dev_type], key=lambda x: x["name"])
-        return detected_devices
+        return DeviceRegistry.get().get_input_devices()
 
+    @traced("devices")
     def get_audio_devices(self) -> List[Dict[str, str]]:
         """
         Detect available audio output devices (sinks) using `pactl`.
@@ -129,6 +88,10 @@ class DeviceManager:
             (PulseAudio name) and 'name' (readable description).
         """
         audio_sinks = []
+        if not HostCapabilities.get().has_tool("pactl"):
+            logging.warning("'pactl' not found, cannot list audio devices.")
+            return audio_sinks
+
         command = "LANG=C pactl list sinks"
 
         if Utils.is_flatpak():
@@ -163,8 +126,11 @@ class DeviceManager:
 
         return sorted(audio_sinks, key=lambda x: x["name"])
 
+    @traced("devices")
     def get_screen_info(self) -> List[Dict[str, Union[int, bool]]]:
         """Get information about connected screens/monitors."""
+        from screeninfo import get_monitors
+
         monitors = []
         for i, monitor in enumerate(get_monitors()):
             monitors.append(
@@ -178,72 +144,76 @@ class DeviceManager:
             )
         return monitors
 
-    def get_instance_dimensions(self, profile: Profile, instance_num: int) -> Tuple[Optional[int], Optional[int]]:
+    def discover_devices(self) -> Dict[str, Any]:
         """
-        Calculate instance dimensions, accounting for splitscreen.
+        Run every discovery at once, for callers that refresh all device lists together.
 
-        For groups of up to 4 instances, the logic is repeated for each group.
+        Returns:
+            Dict[str, Any]: The "input", "audio" and "screens" device lists, as
+            returned by `get_input_devices`, `get_audio_devices` and
+            `get_screen_info`.
         """
-        monitors = self.get_screen_info()
+        return {
+            "input": self.get_input_devices(),
+            "audio": self.get_audio_devices(),
+            "screens": self.get_screen_info(),
+        }
 
-        monitors_sorted = sorted(monitors, key=lambda x: x["id"])
+    @staticmethod
+    def get_cache_path() -> Path:
+        """Return the path of the last discovered device lists."""
+        return Config.LOCAL_DIR / "device_cache.json"
 
-        monitor_to_use = None
+    def load_cached_devices(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the device lists saved by the last discovery.
 
-        if not profile.is_splitscreen_mode or not profile.splitscreen:
-            # Fullscreen mode
-            if instance_num < len(monitors_sorted):
-                monitor_to_use = monitors_sorted[instance_num]
-            else:
-                return None, None
-        else:
-            # Splitscreen mode
-            orientation = profile.splitscreen.orientation
-            num_players = profile.effective_num_players()
-
-            if num_players < 1:
-                if monitors_sorted:
-                    monitor_to_use = monitors_sorted[0]
-                else:
-                    return None, None
-            else:
-                group_index = instance_num // 4
-
-                if group_index < len(monitors_sorted):
-                    monitor_to_use = monitors_sorted[group_index]
-                else:
-                    return None, None
-
-                # Applies splitscreen logic within the group.
-                instance_in_group = instance_num % 4
-                num_players_in_group = min(4, num_players - group_index * 4)
-
-                if monitor_to_use:
-                    width = monitor_to_use["width"]
-                    height = monitor_to_use["height"]
-
-                    if num_players_in_group == 1:
-                        return width, height
-                    elif num_players_in_group == 2:
-                        if orientation == "vertical":
-                            return width // 2, height
-                        else:
-                            return width, height // 2
-                    elif num_players_in_group == 3:
-                        if orientation == "vertical":
-                            if instance_in_group == 0:
-                                return width // 2, height
-                            else:
-                                return width // 2, height // 2
-                        else:
-                            if instance_in_group == 0:
-                                return width, height // 2
-                            else:
-                                return width // 2, height // 2
-                    elif num_players_in_group == 4:
-                        return width // 2, height // 2
-
-        if monitor_to_use:
-            return monitor_to_use["width"], monitor_to_use["height"]
-
-        return None, None
+        The lists may be out of date; they are meant for showing something
+        while a fresh discovery runs.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached lists, in the format of
+            `discover_devices`, or None if there is no readable cache.
+        """
+        try:
+            with open(self.get_cache_path(), "r", encoding="utf-8") as f:
+                devices = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (IOError, json.JSONDecodeError) as e:
+            logging.warning(f"Could not read device cache: {e}")
+            return None
+        if not isinstance(devices, dict) or not {"input", "audio", "screens"} <= devices.keys():
+            return None
+        return devices
+
+    def save_cached_devices(self, devices: Dict[str, Any]) -> None:
+        """Atomically save the lists returned by `discover_devices` for the next start."""
+        path = self.get_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(devices), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not save device cache: {e}")
+
+    @traced("devices")
+    def get_instance_dimensions(
+        self, profile: Profile, instance_num: int, monitors: Optional[List[Dict]] = None
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Calculate instance dimensions, accounting for splitscreen.
+
+        The dimensions come from the layout of every instance computed by
+        `compute_rects`, which is cached per profile and monitor topology.
+        `monitors` may be passed to reuse an earlier `get_screen_info()` result.
+        """
+        if monitors is None:
+            monitors = self.get_screen_info()
+
+        rects = compute_rects(profile, monitors)
+        slot = get_slot(profile, instance_num)
+        if slot >= len(rects) or rects[slot] is None:
+            return None, None
+        return rects[slot].width, rects[slot].height
@@ -0,0 +1,275 @@
+"""
+Device registry module for the Twinverse application.
+
+This module keeps a single, process-wide list of the input devices linked
+under `/dev/input/by-id`. The list is read with `os.scandir` and `readlink`,
+then kept current through inotify (or periodic rescans where inotify is not
+available), and every device that appears or disappears is pushed to the
+subscribers.
+"""
+
+import ctypes
+import logging
+import os
+import re
+import select
+import threading
+from typing import Callable, Dict, List, Optional
+
+BY_ID_PATH = "/dev/input/by-id"
+DEVICE_TYPES = ("keyboard", "mouse", "joystick")
+
+# inotify(7) constants.
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Seconds between rescans when inotify is not available, and between checks of the stop flag.
+POLL_INTERVAL = 2.0
+
+# (action, device type, device), where action is "added" or "removed".
+DeviceListener = Callable[[str, str, Dict[str, str]], None]
+
+
+def get_device_name(device_path: str) -> str:
+    """
+    Generate a human-readable name from a device's ID path.
+
+    It cleans up the raw device ID string by removing path prefixes and
+    technical suffixes, making it more suitable for display in a UI.
+
+    Args:
+        device_path (str): The link name or full path of a device under `/dev/input/by-id/`.
+
+    Returns:
+        str: A cleaned, human-readable device name.
+    """
+    name_part = device_path.replace(f"{BY_ID_PATH}/", "")
+    name_part = re.sub(r"-event-(kbd|mouse|joystick)", "", name_part)
+    name_part = re.sub(r"-if\d+", "", name_part)
+    name_part = name_part.replace("usb-", "").replace("_", " ")
+    name_part = " ".join([word.capitalize() for word in name_part.split(" ")]).strip()
+    return name_part
+
+
+def _device_type(link_name: str) -> Optional[str]:
+    """Return the type of a by-id link, or None if it is not an event device Twinverse assigns."""
+    if "event-joystick" in link_name:
+        return "joystick"
+    if "event-mouse" in link_name:
+        return "mouse"
+    if "event-kbd" in link_name:
+        return "keyboard"
+    return None
+
+
+def scan_input_devices(by_id_path: str = BY_ID_PATH) -> Dict[str, Dict[str, str]]:
+    """
+    Read the input devices linked under `by_id_path`.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Every keyboard, mouse and joystick link,
+        keyed by its path, with its "id" (the link), "name" (human-readable),
+        "type" and "event" (the event node it points to).
+    """
+    devices: Dict[str, Dict[str, str]] = {}
+    try:
+        with os.scandir(by_id_path) as it:
+            entries = list(it)
+    except OSError:
+        return devices
+    for entry in entries:
+        device_type = _device_type(entry.name)
+        if device_type is None:
+            continue
+        try:
+            target = os.readlink(entry.path)
+        except OSError:
+            continue
+        if not re.fullmatch(r"(\.\./)?event\d+", target):
+            continue
+        devices[entry.path] = {
+            "id": entry.path,
+            "name": get_device_name(entry.name),
+            "type": device_type,
+            "event": os.path.normpath(os.path.join(by_id_path, target)),
+        }
+    return devices
+
+
+class _Inotify:
+    """A minimal inotify(7) instance, through the C library."""
+
+    def __init__(self):
+        """Create the inotify instance, raising OSError if the kernel or C library does not provide it."""
+        try:
+            self._libc = ctypes.CDLL(None, use_errno=True)
+            self._libc.inotify_init1
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {e}") from e
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str, mask: int) -> bool:
+        """Watch a path; return False if it cannot be watched (for example, because it does not exist)."""
+        return self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask) >= 0
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for events and drain them; return True if there were any."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        """Close the instance and every watch on it."""
+        os.close(self.fd)
+
+
+class DeviceRegistry:
+    """
+    The process-wide list of input devices.
+
+    Use `DeviceRegistry.get()` to obtain the shared registry. Until `start()`
+    is called, every query rescans `/dev/input/by-id`, which only takes a
+    directory read. Once started, a background thread follows the directory
+    through inotify, falling back to periodic rescans, and calls the
+    subscribers for each device that is added or removed. Subscribers are
+    called on that thread.
+    """
+
+    _shared: Optional["DeviceRegistry"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, by_id_path: str = BY_ID_PATH, poll_interval: float = POLL_INTERVAL):
+        """Initialize the registry with the devices currently linked under `by_id_path`."""
+        self.by_id_path = by_id_path
+        self.poll_interval = poll_interval
+        self._devices = scan_input_devices(by_id_path)
+        self._devices_lock = threading.Lock()
+        self._listeners: List[DeviceListener] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> "DeviceRegistry":
+        """Return the shared registry."""
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def watching(self) -> bool:
+        """Whether the registry is following device changes in the background."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, listener: DeviceListener) -> None:
+        """Call `listener(action, device_type, device)` whenever a device is "added" or "removed"."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: DeviceListener) -> None:
+        """Stop calling a listener registered with `subscribe`."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def start(self) -> None:
+        """Follow device changes in the background."""
+        if self.watching:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="DeviceRegistry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following device changes."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def refresh(self) -> None:
+        """Rescan the devices and notify the subscribers of every change."""
+        devices = scan_input_devices(self.by_id_path)
+        with self._devices_lock:
+            removed = [d for path, d in self._devices.items() if devices.get(path) != d]
+            added = [d for path, d in devices.items() if self._devices.get(path) != d]
+            self._devices = devices
+        for action, changed in (("removed", removed), ("added", added)):
+            for device in changed:
+                logging.info(f"Input device {action}: {device['name']} ({device['id']})")
+                self._notify(action, device)
+
+    def _notify(self, action: str, device: Dict[str, str]) -> None:
+        """Call every subscriber, logging instead of raising if one fails."""
+        for listener in list(self._listeners):
+            try:
+                listener(action, device["type"], dict(device))
+            except Exception as e:
+                logging.warning(f"Input device listener failed: {e}")
+
+    def get_input_devices(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Return the current input devices by type.
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: A dictionary where keys are
+            "keyboard", "mouse", and "joystick". Each key holds a list of
+            device dictionaries, sorted by name, with each dictionary
+            containing the device's 'id' (path) and 'name' (human-readable).
+        """
+        if not self.watching:
+            self.refresh()
+        with self._devices_lock:
+            devices = list(self._devices.values())
+        by_type: Dict[str, List[Dict[str, str]]] = {device_type: [] for device_type in DEVICE_TYPES}
+        for device in sorted(devices, key=lambda d: d["name"]):
+            by_type[device["type"]].append({"id": device["id"], "name": device["name"]})
+        return by_type
+
+    def find(self, device_path: str) -> Optional[Dict[str, str]]:
+        """Return the registered device linked at `device_path`, or None if it is not connected."""
+        if not self.watching:
+            self.refresh()
+        with self._devices_lock:
+            device = self._devices.get(os.path.normpath(device_path))
+        return dict(device) if device else None
+
+    def _run(self) -> None:
+        """Rescan on every inotify event, or periodically if inotify is not available, until stopped."""
+        try:
+            inotify: Optional[_Inotify] = _Inotify()
+        except OSError as e:
+            logging.warning(f"{e}; rescanning input devices every {self.poll_interval}s instead.")
+            inotify = None
+
+        try:
+            while not self._stop_event.is_set():
+                if inotify is None:
+                    self._stop_event.wait(self.poll_interval)
+                    self.refresh()
+                    continue
+                # by-id is removed with the last device and created with the first one.
+                parent = os.path.dirname(self.by_id_path)
+                inotify.add_watch(parent, IN_CREATE | IN_DELETE | IN_ONLYDIR)
+                inotify.add_watch(self.by_id_path, IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF)
+                # Catch up on anything that changed before the watches were in place.
+                self.refresh()
+                while not self._stop_event.is_set() and not inotify.wait(self.poll_interval):
+                    pass
+        except Exception as e:
+            logging.error(f"Input device watcher stopped: {e}")
+        finally:
+            if inotify:
+                inotify.close()
@@ -0,0 +1,191 @@
+"""
+Home deduplication module for the Twinverse application.
+
+This module finds files that are identical across the instance homes (the
+Steam client, its runtimes and CEF resources) and makes them share their
+storage through reflinks.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core import Config, Logger, Utils
+
+from .home_provisioner import STEAM_DIR
+
+# Relative to the Steam directory. Steam rewrites these in place, or they are
+# per-user state; they are never deduplicated.
+SKIP_PATTERNS = [
+    "config/*",
+    "userdata/*",
+    "logs/*",
+    "dumps/*",
+    "appcache/*",
+    "depotcache/*",
+    "steamapps/*",
+    "ssfn*",
+    "*.vdf",
+    "*.log",
+    "*.pid",
+    "*.lock",
+    "*.db",
+    "*.sqlite*",
+]
+
+# Files smaller than this are not worth a link.
+MIN_FILE_SIZE = 4096
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class HomeDeduplicator:
+    """
+    Deduplicates identical files across instance homes.
+
+    A JSON index under `Config.LOCAL_DIR` keeps the size, mtime, inode and
+    hash of every candidate file, so repeated runs only hash files that
+    changed, and runs over some of the homes keep the entries of the others.
+    Duplicates are only ever reflinked, so each home keeps files of its own
+    that Steam can rewrite in place; on filesystems without reflink support
+    nothing is deduplicated. Homes whose Steam client is running are left
+    alone.
+    """
+
+    def __init__(self, logger: Logger, index_path: Optional[Path] = None):
+        """Initialize the deduplicator with its index file."""
+        self.logger = logger
+        self.index_path = index_path or Config.LOCAL_DIR / "dedup_index.json"
+        self.report_path = self.index_path.with_name("dedup_report.json")
+
+    def run(self, home_paths: List[Path]) -> Dict:
+        """
+        Deduplicate the given homes and write a report next to the index.
+
+        Args:
+            home_paths (List[Path]): The instance homes to deduplicate.
+
+        Returns:
+            Dict: Counts of "files" scanned, files "hashed" in this run and
+            files "deduplicated", the total "reclaimed_bytes", the bytes
+            reclaimed per home and the homes "skipped" because they were in use.
+        """
+        index = self._load_index()
+        report: Dict = {"files": 0, "hashed": 0, "deduplicated": 0, "reclaimed_bytes": 0, "per_home": {}, "skipped": []}
+
+        groups: Dict[Tuple[int, str], List[Path]] = {}
+        entries: Dict[str, Dict] = {}
+        for home_path in home_paths:
+            if self._is_running(home_path):
+                self.logger.warning(f"Steam is running in {home_path}; skipping it.")
+                report["skipped"].append(str(home_path))
+                continue
+            report["per_home"][str(home_path)] = 0
+            for path, st in self._scan(home_path / STEAM_DIR):
+                report["files"] += 1
+                entry = index.get(str(path))
+                stat_key = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+                if not entry or any(entry[key] != value for key, value in stat_key.items()):
+                    entry = dict(stat_key, hash=self._hash(path))
+                    report["hashed"] += 1
+                entries[str(path)] = entry
+                groups.setdefault((st.st_size, entry["hash"]), []).append(path)
+
+        reflink = True
+        for (size, _), paths in groups.items():
+            if not reflink:
+                break
+            canonical = paths[0]
+            canonical_st = canonical.stat()
+            for path in paths[1:]:
+                entry = entries[str(path)]
+                st = path.stat()
+                if st.st_dev != canonical_st.st_dev or st.st_ino == canonical_st.st_ino or entry.get("shared"):
+                    continue
+
+                tmp_path = path.with_name(f".{path.name}.dedup")
+                # Once a reflink fails, the filesystem does not support it; stop trying.
+                reflink = Utils.clone_file(canonical, tmp_path)
+                if not reflink:
+                    tmp_path.unlink()
+                    self.logger.warning("The homes' filesystem does not support reflinks; nothing to deduplicate.")
+                    break
+                os.replace(tmp_path, path)
+
+                new_st = path.stat()
+                entries[str(path)] = dict(entry, mtime_ns=new_st.st_mtime_ns, ino=new_st.st_ino, shared=True)
+                report["deduplicated"] += 1
+                report["reclaimed_bytes"] += size
+                home = next(h for h in report["per_home"] if str(path).startswith(h + os.sep))
+                report["per_home"][home] += size
+
+        # Entries of the homes scanned now are replaced; those of the other homes are kept.
+        scanned_roots = tuple(f"{home}{os.sep}" for home in report["per_home"])
+        index = {path: entry for path, entry in index.items() if not path.startswith(scanned_roots)}
+        index.update(entries)
+        self._save_json(self.index_path, index)
+        self._save_json(self.report_path, report)
+        self.logger.info(
+            f"Deduplicated {report['deduplicated']} of {report['files']} files ({report['hashed']} hashed), "
+            f"reclaimed {report['reclaimed_bytes'] / 1024**2:.1f} MiB. Report: {self.report_path}"
+        )
+        return report
+
+    @staticmethod
+    def _scan(steam_path: Path):
+        """Yield the regular files of a Steam directory that are candidates for deduplication."""
+        for dirpath, dirnames, filenames in os.walk(steam_path):
+            rel_dir = Path(dirpath).relative_to(steam_path)
+            dirnames[:] = [d for d in dirnames if not HomeDeduplicator._is_skipped(f"{rel_dir / d}/")]
+            for name in filenames:
+                path = Path(dirpath) / name
+                if HomeDeduplicator._is_skipped(str(rel_dir / name)) or name.endswith(".dedup"):
+                    continue
+                st = path.lstat()
+                if path.is_symlink() or st.st_size < MIN_FILE_SIZE:
+                    continue
+                yield path, st
+
+    @staticmethod
+    def _is_skipped(rel: str) -> bool:
+        """Check whether a path relative to the Steam directory is one Steam rewrites."""
+        return any(fnmatch.fnmatch(rel, pattern) for pattern in SKIP_PATTERNS)
+
+    @staticmethod
+    def _is_running(home_path: Path) -> bool:
+        """Check whether the Steam client of a home is running, using its pid file."""
+        try:
+            pid = int((home_path / ".steam/steam.pid").read_text().strip())
+        except (OSError, ValueError):
+            return False
+        return Path(f"/proc/{pid}").exists()
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        """Return the SHA-256 of a file."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the hash index, starting over if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Could not read dedup index {self.index_path}: {e}. Rebuilding it.")
+            return {}
+
+    @staticmethod
+    def _save_json(path: Path, data: Dict) -> None:
+        """Atomically write a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, path)
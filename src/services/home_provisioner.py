@@ -0,0 +1,161 @@
+"""
+Home provisioning module for the Twinverse application.
+
+This module captures a bootstrapped, logged-out Steam home as a template and
+clones it into new instance homes, so a new instance does not have to
+download and bootstrap the Steam client on its own.
+"""
+
+import fnmatch
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.core import Config, Logger, Utils
+
+STEAM_DIR = Path(".local/share/Steam")
+
+# Relative to the home. Login state, per-user data, logs and caches are never
+# part of the template; app manifests are synced by ManifestSync.
+TEMPLATE_EXCLUDE = [
+    ".steam/registry.vdf",
+    f"{STEAM_DIR}/userdata",
+    f"{STEAM_DIR}/config/loginusers.vdf",
+    f"{STEAM_DIR}/config/config.vdf",
+    f"{STEAM_DIR}/config/htmlcache",
+    f"{STEAM_DIR}/ssfn*",
+    f"{STEAM_DIR}/logs",
+    f"{STEAM_DIR}/dumps",
+    f"{STEAM_DIR}/appcache/httpcache",
+    f"{STEAM_DIR}/depotcache",
+    f"{STEAM_DIR}/steamapps",
+]
+
+
+class HomeProvisioner:
+    """
+    Creates instance homes from a template home.
+
+    The template lives under `Config.LOCAL_DIR` and is captured from an
+    instance whose Steam client finished bootstrapping. Provisioning reflinks
+    every file where the filesystem supports it and copies it otherwise.
+    Files are never hardlinked: the Steam client updates its own files in
+    place, which would change them in the template and every other home.
+    """
+
+    def __init__(self, logger: Logger, template_path: Optional[Path] = None):
+        """Initialize the provisioner with the template location."""
+        self.logger = logger
+        self.template_path = template_path or Config.LOCAL_DIR / "home_template"
+
+    def has_template(self) -> bool:
+        """Check whether a bootstrapped template exists."""
+        return (self.template_path / STEAM_DIR / "steam.sh").exists()
+
+    def create_template(self, instance_num: int) -> Dict[str, int]:
+        """
+        Capture the home of a bootstrapped instance as the template.
+
+        Args:
+            instance_num (int): The instance whose home is captured.
+
+        Returns:
+            Dict[str, int]: The bytes "reflinked" and "copied".
+
+        Raises:
+            ValueError: If the instance's Steam client is not bootstrapped.
+        """
+        source = Config.get_steam_home_path(instance_num)
+        if not (source / STEAM_DIR / "steam.sh").exists():
+            raise ValueError(f"Steam is not installed in {source}; launch the instance once before using it.")
+
+        self.logger.info(f"Creating home template from {source}...")
+        shutil.rmtree(self.template_path, ignore_errors=True)
+        stats = self._clone_home(source, self.template_path)
+        self._log_stats("Home template created", stats)
+        return stats
+
+    def provision(self, instance_num: int, force: bool = False) -> Dict[str, int]:
+        """
+        Clone the template into an instance home.
+
+        Args:
+            instance_num (int): The instance to provision.
+            force (bool): Replace the Steam client of a home that already has one.
+
+        Returns:
+            Dict[str, int]: The bytes "reflinked" and "copied".
+
+        Raises:
+            ValueError: If there is no template, or the home already has a
+                Steam client and `force` is not set.
+        """
+        if not self.has_template():
+            raise ValueError("No home template found; create one from a bootstrapped instance first.")
+        home_path = Config.get_steam_home_path(instance_num)
+        if (home_path / STEAM_DIR / "steam.sh").exists() and not force:
+            raise ValueError(f"{home_path} already has a Steam installation.")
+
+        self.logger.info(f"Provisioning {home_path} from the home template...")
+        stats = self._clone_home(self.template_path, home_path)
+        self._log_stats(f"{home_path.name} provisioned", stats)
+        return stats
+
+    def _clone_home(self, source: Path, target: Path) -> Dict[str, int]:
+        """Clone a home tree over the target, skipping excluded paths and replacing what is in the way."""
+        stats = {"reflinked": 0, "copied": 0}
+        reflink = True
+
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel_dir = Path(dirpath).relative_to(source)
+            dirnames[:] = [name for name in dirnames if not self._is_excluded(rel_dir / name)]
+            target_dir = target / rel_dir
+            if target_dir.is_symlink() or (target_dir.exists() and not target_dir.is_dir()):
+                self._remove(target_dir)
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            for name in dirnames + filenames:
+                rel = rel_dir / name
+                src_path, dst_path = source / rel, target / rel
+                if self._is_excluded(rel):
+                    continue
+                if src_path.is_symlink():
+                    self._remove(dst_path)
+                    os.symlink(os.readlink(src_path), dst_path)
+                    continue
+                if name not in filenames:
+                    continue
+
+                # A new file, never one opened in place: an existing one may be shared with other homes.
+                self._remove(dst_path)
+                size = src_path.stat().st_size
+                if reflink:
+                    # Once a reflink fails, the filesystem does not support it; stop trying.
+                    reflink = Utils.clone_file(src_path, dst_path)
+                    if reflink:
+                        stats["reflinked"] += size
+                        continue
+                else:
+                    shutil.copy2(src_path, dst_path)
+                stats["copied"] += size
+        return stats
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """Remove whatever is at a path, directory trees included, without following symlinks."""
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        elif path.is_symlink() or path.exists():
+            path.unlink()
+
+    @staticmethod
+    def _is_excluded(rel: Path) -> bool:
+        """Check whether a path relative to the home is left out of templates."""
+        return any(fnmatch.fnmatch(str(rel), pattern) for pattern in TEMPLATE_EXCLUDE)
+
+    def _log_stats(self, message: str, stats: Dict[str, int]) -> None:
+        """Log how much data was shared and how much was written."""
+        self.logger.info(
+            f"{message}: {stats['reflinked'] / 1024**2:.1f} MiB reflinked, {stats['copied'] / 1024**2:.1f} MiB copied."
+        )
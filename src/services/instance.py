@@ -6,23 +6,78 @@ terminating, and configuring them with isolated environments.
 """
 
 import copy
+import functools
 import os
 import shlex
-import shutil
 import signal
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-
-from src.core import Config, DependencyError, Logger, Utils, VirtualDeviceError
-from src.models import PlayerInstanceConfig, Profile
-
+from typing import Callable, Optional
+
+from src.core import (
+    Config,
+    DependencyError,
+    HostCapabilities,
+    Logger,
+    Tracer,
+    Utils,
+    VirtualDeviceError,
+    traced,
+)
+from src.models import (
+    VIRTUAL_JOYSTICK_PLACEHOLDER,
+    HostSteamScan,
+    InstanceLaunchPlan,
+    LaunchPlan,
+    PlayerInstanceConfig,
+    Profile,
+)
+
+from .cgroup_scope import CgroupScopes
+from .cpu_topology import CpuTopology, format_cpu_list, parse_cpu_list
+from .device_registry import DeviceRegistry
 from .kde_manager import KdeManager
+from .log_capture import InstanceLogCapture
+from .manifest_sync import ManifestSync
+from .prefix_template import PrefixTemplater
+from .pressure_throttle import PressureThrottle
+from .readiness import ReadinessProbe, get_readiness_probe
+from .resource_sampler import ResourceSampler
+from .session_prep import PreparedSession, get_session_keys
+from .shader_cache import get_cache_size, parse_shader_cache_stats
+from .supervisor import InstanceSupervisor
+
+READINESS_POLL_INTERVAL = 0.25
+TERMINATION_GRACE_PERIOD = 10.0
+TERMINATION_POLL_INTERVAL = 0.05
+
+
+def _launching(method: Callable) -> Callable:
+    """Decorate a launch method so that no session is prepared while it runs, and none is being prepared."""
+
+    @functools.wraps(method)
+    def wrapper(self: "InstanceService", *args, **kwargs):
+        with self._session_lock:
+            self.launch_in_progress = True
+        try:
+            self._wait_for_prepared_session()
+            return method(self, *args, **kwargs)
+        finally:
+            self.launch_in_progress = False
+
+    return wrapper
 
 
 class InstanceService:
     """Service responsible for managing Steam instances."""
 
+    # The homes of the instances running in this process, whichever service launched them.
+    _running_homes: set[str] = set()
+    _running_homes_lock = threading.Lock()
+
     def __init__(self, logger: Logger, kde_manager: Optional[KdeManager] = None):
         """Initialize the instance service."""
         from .device_manager import DeviceManager
@@ -32,12 +87,78 @@ class InstanceService:
         self.virtual_device = VirtualDeviceService(logger)
         self.kde_manager = kde_manager
         self.device_manager = DeviceManager()
+        self.manifest_sync = ManifestSync(logger)
+        self.prefix_templater = PrefixTemplater(logger)
+        self._prepare_lock = threading.Lock()
         self._virtual_joystick_path: Optional[str] = None
-        self._virtual_joystick_checked: bool = False
         self.pids: dict[int, int] = {}
         self.pgids: dict[int, int] = {}
         self.processes: dict[int, subprocess.Popen] = {}
         self.termination_in_progress = False
+        self.launch_in_progress = False
+        self._exit_listeners: list[Callable[[int, Optional[int], float], None]] = []
+        self.supervisor = InstanceSupervisor(logger, self._on_instance_exited)
+        self.log_capture = InstanceLogCapture(logger)
+        self.resource_sampler = ResourceSampler(logger, lambda: dict(self.pgids))
+        self.pressure_throttle = PressureThrottle(logger, lambda: dict(self.pgids))
+        self.cgroup_scopes = CgroupScopes(logger)
+        self.cgroup_units: dict[int, str] = {}
+        # Instances launched with Mesa's shader cache statistics enabled.
+        self._shader_stats_instances: set[int] = set()
+        self._session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-prep")
+        self._session_future: Optional[Future] = None
+        self._session_lock = threading.Lock()
+        self._prepared_session: Optional[PreparedSession] = None
+
+    def add_exit_listener(self, listener: Callable[[int, Optional[int], float], None]) -> None:
+        """
+        Register a callback for instance exit events.
+
+        The listener is called from the supervisor thread with the instance
+        number, its exit code and its runtime in seconds whenever a launched
+        instance exits, whether on its own or because it was terminated.
+        """
+        self._exit_listeners.append(listener)
+
+    def get_instance_log_tail(self, instance_num: int, lines: Optional[int] = None) -> list[str]:
+        """Return the most recent output lines of an instance, oldest first."""
+        return self.log_capture.get_tail(instance_num, lines)
+
+    def report_shader_cache(self, instance_nums: list[int]) -> dict[int, dict]:
+        """
+        Report the shader cache hit rate and own cache size of several instances.
+
+        The hit rate comes from the Mesa statistics the instance's processes
+        print on exit, so it is only known for processes that have exited.
+        Instances launched without the statistics, because their profile
+        isolates the shader cache, are left out of the report.
+        """
+        report: dict[int, dict] = {}
+        for instance_num in instance_nums:
+            if instance_num not in self._shader_stats_instances:
+                continue
+            stats: dict = parse_shader_cache_stats(self.log_capture.get_tail(instance_num))
+            stats["own_cache_bytes"] = get_cache_size(Config.get_steam_home_path(instance_num))
+            report[instance_num] = stats
+            hit_rate = f"{stats['hit_rate']:.1%}" if stats["hit_rate"] is not None else "unknown"
+            self.logger.info(
+                f"Instance {instance_num} shader cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"(hit rate {hit_rate}), {stats['own_cache_bytes'] / 1024**2:.1f} MiB cached in its home."
+            )
+        return report
+
+    def _on_instance_exited(self, instance_num: int, process: subprocess.Popen, runtime: float) -> None:
+        """Forget an exited instance and notify the exit listeners."""
+        self.logger.info(f"Instance {instance_num} exited with code {process.returncode} after {runtime:.1f}s.")
+        if self.processes.get(instance_num) is process:
+            self._set_home_running(Config.get_steam_home_path(instance_num), False)
+            self.processes.pop(instance_num, None)
+            self.pids.pop(instance_num, None)
+            self.pgids.pop(instance_num, None)
+            self.cgroup_units.pop(instance_num, None)
+
+        for listener in list(self._exit_listeners):
+            listener(instance_num, process.returncode, runtime)
 
     def validate_dependencies(self, use_gamescope: bool = True) -> None:
         """Validate if all necessary commands are available on the system."""
@@ -46,72 +167,338 @@ class InstanceService:
         if use_gamescope:
             required_commands.insert(0, "gamescope")
 
-        for cmd_name in required_commands:
-            # If in Flatpak, check on the host. Otherwise, check locally.
+        capabilities = HostCapabilities.get()
+        missing = [cmd_name for cmd_name in required_commands if not capabilities.has_tool(cmd_name)]
+        if missing:
+            # The probe is cached; look at the host again in case a tool was installed since.
+            HostCapabilities.invalidate()
+            capabilities = HostCapabilities.get()
+            missing = [cmd_name for cmd_name in required_commands if not capabilities.has_tool(cmd_name)]
+
+        if missing:
+            # If in Flatpak, the commands were checked on the host.
             if Utils.is_flatpak():
-                try:
-                    # We check the return code. A non-zero indicates the command is not found.
-                    Utils.flatpak_spawn_host(["which", cmd_name], check=True, capture_output=True)
-                except subprocess.CalledProcessError:
-                    raise DependencyError(f"Required command '{cmd_name}' not found on the host system")
-            else:
-                if not shutil.which(cmd_name):
-                    raise DependencyError(f"Required command '{cmd_name}' not found")
+                raise DependencyError(f"Required command '{missing[0]}' not found on the host system")
+            raise DependencyError(f"Required command '{missing[0]}' not found")
 
         self.logger.info("Dependencies validated successfully")
 
-    def _prepare_instance_launch(self, profile: Profile, instance_num: int) -> tuple[list[str], dict]:
-        """Prepare and build the command for launching a single Steam instance."""
-        home_path = Config.get_steam_home_path(instance_num)
-        home_path.mkdir(parents=True, exist_ok=True)
-        self.logger.info(f"Instance {instance_num}: Using isolated home path '{home_path}'")
+    @traced("instance")
+    def build_launch_plan(
+        self,
+        profile: Profile,
+        instance_nums: list[int],
+        monitors: Optional[list[dict[str, int]]] = None,
+        host_scan: Optional[HostSteamScan] = None,
+    ) -> LaunchPlan:
+        """
+        Resolve a launch session for several instances in a single pass.
+
+        Dependencies, the monitor topology and the host Steam directories are
+        looked up once and shared by the commands of every instance. Building a
+        plan has no side effects, so it can be used as a dry run.
+
+        Args:
+            profile (Profile): The profile to launch the instances with.
+            instance_nums (list[int]): The instances to plan, in launch order.
+            monitors (Optional[list[dict[str, int]]]): A monitor topology that
+                is known to be current; it is looked up when omitted.
+            host_scan (Optional[HostSteamScan]): A host scan that is known to be
+                current; the host is scanned when omitted.
+
+        Returns:
+            LaunchPlan: The resolved plan.
+        """
+        from .cmd_builder import CommandBuilder
+
+        # The virtual joystick is only created at launch; its path is filled in when the instance is spawned.
+        virtual_joystick = VIRTUAL_JOYSTICK_PLACEHOLDER if profile.needs_virtual_joystick() else None
+        plan = LaunchPlan(use_gamescope=profile.use_gamescope, virtual_joystick_path=virtual_joystick)
 
-        self._prepare_home(home_path)
+        start = time.perf_counter()
+        self.validate_dependencies(use_gamescope=profile.use_gamescope)
+        plan.timings["dependencies"] = time.perf_counter() - start
 
-        device_info = self._validate_input_devices(profile, instance_num, instance_num)
-        instance_env = self._prepare_environment(profile, device_info, instance_num)
+        start = time.perf_counter()
+        if monitors is not None:
+            plan.monitors = monitors
+        else:
+            plan.monitors = self.device_manager.get_screen_info() if profile.use_gamescope else []
+        plan.timings["monitors"] = time.perf_counter() - start
 
-        from .cmd_builder import CommandBuilder
+        start = time.perf_counter()
+        if host_scan is not None:
+            plan.host_scan = host_scan
+        else:
+            plan.host_scan = CommandBuilder.scan_host_steam(list_folders=profile.sandbox_bind_mode == "per_folder")
+        plan.timings["host_scan"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cpu_groups: list[list[int]] = []
+        if profile.cpu_pinning == "auto":
+            # Split for every player of the profile, so an instance keeps its CPUs when launched on its own.
+            num_groups = max([profile.effective_num_players()] + [num + 1 for num in instance_nums])
+            cpu_groups = CpuTopology.read().split(num_groups)
+        plan.timings["cpu_topology"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for instance_num in instance_nums:
+            home_path = Config.get_steam_home_path(instance_num)
+            device_info = self._validate_input_devices(profile, instance_num, instance_num)
+            instance_env = self._prepare_environment(profile, device_info, instance_num)
+            cmd_builder = CommandBuilder(
+                self.logger,
+                profile,
+                device_info,
+                self.device_manager,
+                instance_num,
+                home_path,
+                virtual_joystick,
+                host_scan=plan.host_scan,
+                monitors=plan.monitors,
+            )
+            plan.instances.append(
+                InstanceLaunchPlan(
+                    instance_num=instance_num,
+                    home_path=str(home_path),
+                    command=cmd_builder.build_command(),
+                    env=instance_env,
+                    device_info=device_info,
+                    cpu_set=self._resolve_cpu_set(profile, instance_num, cpu_groups),
+                    cgroup_properties=self._resolve_cgroup_properties(profile, instance_num),
+                )
+            )
+        plan.timings["instances"] = time.perf_counter() - start
 
-        cmd_builder = CommandBuilder(
-            self.logger,
-            profile,
-            device_info,
-            self.device_manager,
-            instance_num,
-            home_path,
-            self._virtual_joystick_path,
+        return plan
+
+    def prepare_session(self, profile: Profile, instance_nums: list[int]) -> None:
+        """
+        Prepare a launch session in the background, ahead of the launch.
+
+        Creates the virtual joystick if a player needs one, resolves the
+        launch plan (dependencies, monitors, host scan, input devices and
+        command lines) and prepares the instance homes on a worker thread. `launch_instances` then reuses the prepared session, rebuilding
+        only the parts whose inputs changed in the meantime. Nothing is
+        prepared while this service's instances are running or being
+        launched, and the homes of instances launched by any other service of
+        the process are left alone, since they are in use.
+
+        Args:
+            profile (Profile): The profile the session will be launched with.
+            instance_nums (list[int]): The instances that will be launched.
+        """
+        with self._session_lock:
+            if not instance_nums or self.processes or self.launch_in_progress:
+                return
+            self._session_future = self._session_executor.submit(
+                self._prepare_session_in_background, copy.deepcopy(profile), list(instance_nums)
+            )
+
+    def _prepare_session_in_background(self, profile: Profile, instance_nums: list[int]) -> None:
+        """Resolve a session and prepare its homes, logging instead of raising on failure."""
+        try:
+            session = self._resolve_session(profile, instance_nums)
+            home_paths = [instance_plan.home_path for instance_plan in session.plan.instances]
+            if not session.homes_ready(home_paths):
+                homes_key = session.keys["host_steam"]
+                prepared = self._prepare_homes([Path(p) for p in home_paths])
+                session.homes, session.homes_key = {str(p) for p in prepared}, homes_key
+        except Exception as e:
+            self.logger.warning(f"Could not prepare the launch session ahead of time: {e}")
+
+    def _resolve_session(self, profile: Profile, instance_nums: list[int]) -> PreparedSession:
+        """
+        Return a session for the given inputs, reusing the prepared one where it is still current.
+
+        The monitor topology and host scan of the prepared session are kept
+        when their inputs did not change; everything else is rebuilt. Homes
+        prepared ahead of time stay prepared as long as the host library did
+        not change.
+        """
+        keys = get_session_keys(profile, instance_nums, self._virtual_joystick_path)
+        session = self._prepared_session
+        if session is None:
+            self.logger.info("No prepared launch session, resolving it now.")
+            new_session = PreparedSession(profile, self.build_launch_plan(profile, instance_nums), keys)
+            self._prepared_session = new_session
+            return new_session
+
+        stale = session.stale_parts(keys)
+        if not stale:
+            self.logger.info("Prepared launch session is up to date.")
+            return session
+
+        monitors = None
+        if "monitors" not in stale and session.profile.use_gamescope == profile.use_gamescope:
+            monitors = session.plan.monitors
+        host_scan = None
+        if (
+            not {"host_steam", "devices"} & set(stale)
+            and session.profile.sandbox_bind_mode == profile.sandbox_bind_mode
+        ):
+            host_scan = session.plan.host_scan
+        self.logger.info(
+            f"Prepared launch session is stale ({', '.join(stale)}); rebuilding the launch plan"
+            f"{', reusing monitors' if monitors is not None else ''}{', reusing host scan' if host_scan else ''}."
         )
-        return cmd_builder.build_command(), instance_env
 
-    def _launch_single_instance(self, profile: Profile, instance_num: int) -> None:
-        """Launch a single steam instance."""
-        self.logger.info(f"Preparing instance {instance_num}...")
+        new_session = PreparedSession(
+            profile, self.build_launch_plan(profile, instance_nums, monitors, host_scan), keys
+        )
+        new_session.homes, new_session.homes_key = session.homes, session.homes_key
+        self._prepared_session = new_session
+        return new_session
+
+    def _wait_for_prepared_session(self) -> None:
+        """Wait until the session being prepared in the background, if any, is ready."""
+        future = self._session_future
+        if future is not None:
+            future.result()
+            self._session_future = None
+
+    @traced("instance")
+    def _take_prepared_session(self, profile: Profile, instance_nums: list[int]) -> PreparedSession:
+        """Wait for any background preparation, then return a current session for the launch."""
+        self._wait_for_prepared_session()
+        self._ensure_virtual_joystick(profile)
+        start = time.perf_counter()
+        session = self._resolve_session(profile, instance_nums)
+        self.logger.info(f"Launch session checked in {(time.perf_counter() - start) * 1000:.1f}ms.")
+        return session
+
+    def _resolve_cpu_set(self, profile: Profile, instance_num: int, cpu_groups: list[list[int]]) -> Optional[str]:
+        """Return the CPUs an instance is pinned to: its player's CPU set, else its automatic group."""
+        if profile.player_configs and 0 <= instance_num < len(profile.player_configs):
+            cpu_set = profile.player_configs[instance_num].cpu_set
+            if cpu_set:
+                return cpu_set
+        if cpu_groups:
+            return format_cpu_list(cpu_groups[instance_num % len(cpu_groups)])
+        return None
+
+    def _resolve_cgroup_properties(self, profile: Profile, instance_num: int) -> Optional[dict[str, str]]:
+        """
+        Return the resource properties of an instance's cgroup scope.
+
+        Returns None, so that the instance is launched without a scope, when
+        scopes are disabled or the player sets no CPU, memory or I/O limit.
+        """
+        if not profile.use_cgroup_scopes:
+            return None
+        player_config = (
+            profile.player_configs[instance_num]
+            if profile.player_configs and 0 <= instance_num < len(profile.player_configs)
+            else PlayerInstanceConfig()
+        )
+        return CgroupScopes.get_properties(player_config) or None
+
+    def dry_run(self, profile: Profile, instance_nums: list[int], output_path: Optional[Path] = None) -> LaunchPlan:
+        """
+        Build a launch plan without launching anything and log or save it.
 
-        base_command, instance_env = self._prepare_instance_launch(profile, instance_num)
+        Args:
+            profile (Profile): The profile to plan the session for.
+            instance_nums (list[int]): The instances to plan.
+            output_path (Optional[Path]): Where to write the plan as JSON.
+                When omitted, each instance's command is logged instead.
 
-        log_file = Config.LOG_DIR / f"steam_instance_{instance_num}.log"
+        Returns:
+            LaunchPlan: The resolved plan.
+        """
+        plan = self.build_launch_plan(profile, instance_nums)
+        if output_path:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(plan.to_json(), encoding="utf-8")
+            self.logger.info(f"Launch plan written to {output_path}")
+        else:
+            for instance_plan in plan.instances:
+                self.logger.info(f"Instance {instance_plan.instance_num}: {shlex.join(instance_plan.command)}")
+        timings = ", ".join(f"{phase}: {secs * 1000:.1f}ms" for phase, secs in plan.timings.items())
+        self.logger.info(f"Launch plan resolved ({timings})")
+        return plan
+
+    def _launch_single_instance(self, instance_plan: InstanceLaunchPlan) -> bool:
+        """Spawn a planned Steam instance and record its process information."""
+        instance_num = instance_plan.instance_num
+        log_file = self.log_capture.get_log_path(instance_num)
         self.logger.info(f"Launching instance {instance_num} (Log: {log_file})")
 
+        command, unit = self._resolve_virtual_joystick(instance_plan.command), None
+        if instance_plan.cgroup_properties is not None and self.cgroup_scopes.available():
+            command, unit = self.cgroup_scopes.wrap_command(instance_num, command, instance_plan.cgroup_properties)
+            self.logger.info(f"Instance {instance_num}: Running in scope {unit} {instance_plan.cgroup_properties}")
+
         try:
-            if Utils.is_flatpak():
-                process, pgid = self._launch_in_flatpak(instance_num, base_command, instance_env)
-            else:
-                process, pgid = self._launch_natively(instance_num, base_command, instance_env)
+            with Tracer.get().span("spawn", "instance", instance=instance_num):
+                if Utils.is_flatpak():
+                    process, pgid = self._launch_in_flatpak(
+                        instance_num, command, instance_plan.env, instance_plan.cpu_set
+                    )
+                else:
+                    process, pgid = self._launch_natively(
+                        instance_num, command, instance_plan.env, instance_plan.cpu_set
+                    )
+
+            if process.stdout and not self._capture_output(instance_num, process, pgid):
+                return False
 
             self.pids[instance_num] = process.pid
             self.pgids[instance_num] = pgid
             self.processes[instance_num] = process
+            self._set_home_running(Path(instance_plan.home_path), True)
+            if unit:
+                self.cgroup_units[instance_num] = unit
+            self.supervisor.watch(instance_num, process)
+            return True
 
         except Exception as e:
             self.logger.error(f"Failed to launch instance {instance_num}: {e}")
+            return False
+
+    def _capture_output(self, instance_num: int, process: subprocess.Popen, pgid: int) -> bool:
+        """
+        Start capturing a spawned instance's output, or stop the instance if it cannot be captured.
+
+        Nobody else reads the instance's output pipe, so an instance whose
+        output is not captured would block as soon as the pipe fills up.
+        """
+        assert process.stdout is not None
+        try:
+            self.log_capture.attach(instance_num, process.stdout)
+            return True
+        except Exception as e:
+            self.logger.error(f"Instance {instance_num}: Could not capture its output, stopping it: {e}")
+        process.stdout.close()
+        self._signal_process_groups({instance_num: pgid}, signal.SIGKILL)
+        try:
+            process.wait(timeout=TERMINATION_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        return False
+
+    def _resolve_virtual_joystick(self, command: list[str]) -> list[str]:
+        """Fill in the path of the virtual joystick in a planned command, or drop its bind if there is none."""
+        if VIRTUAL_JOYSTICK_PLACEHOLDER not in command:
+            return command
+        if self._virtual_joystick_path:
+            return [self._virtual_joystick_path if arg == VIRTUAL_JOYSTICK_PLACEHOLDER else arg for arg in command]
+        index = command.index(VIRTUAL_JOYSTICK_PLACEHOLDER)
+        return command[: index - 1] + command[index + 2 :]
 
     def _launch_in_flatpak(
-        self, instance_num: int, base_command: list[str], instance_env: dict
+        self, instance_num: int, base_command: list[str], instance_env: dict, cpu_set: Optional[str] = None
     ) -> tuple[subprocess.Popen, int]:
         """Launch a Steam instance within a Flatpak environment."""
         env_prefix_parts = [f"export {key}={shlex.quote(value)}" for key, value in instance_env.items()]
         env_prefix = "; ".join(env_prefix_parts) + "; " if env_prefix_parts else ""
+        if cpu_set:
+            # The affinity set by taskset is inherited by every process the instance starts.
+            if HostCapabilities.get().has_tool("taskset"):
+                self.logger.info(f"Instance {instance_num}: Pinning to CPUs {cpu_set}")
+                base_command = ["taskset", "-c", cpu_set] + base_command
+            else:
+                self.logger.warning(f"Instance {instance_num}: 'taskset' not found on the host, CPU pinning skipped.")
         escaped_command = shlex.join(base_command)
         shell_command = f"{env_prefix}set -m; echo $$; exec {escaped_command}"
 
@@ -125,11 +512,13 @@ class InstanceService:
             ["bash", "-c", shell_command],
             async_=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
             env=flatpak_spawn_env,
             cwd=Path.home(),
+            bufsize=0,
         )
 
+        # Unbuffered, so that reading the PGID line leaves the rest of the output for the log capture.
         pgid_str = process.stdout.readline().decode().strip() if process.stdout else ""
         if pgid_str.isdigit():
             pgid = int(pgid_str)
@@ -143,7 +532,7 @@ class InstanceService:
         raise RuntimeError(f"Failed to get host PGID for instance {instance_num}")
 
     def _launch_natively(
-        self, instance_num: int, base_command: list[str], instance_env: dict
+        self, instance_num: int, base_command: list[str], instance_env: dict, cpu_set: Optional[str] = None
     ) -> tuple[subprocess.Popen, int]:
         """Launch a Steam instance natively."""
         final_env = os.environ.copy()
@@ -151,19 +540,64 @@ class InstanceService:
         final_env.pop("PYTHONPATH", None)
         final_env.update(instance_env)
 
+        preexec_fn: Callable[[], None] = os.setpgrp
+        if cpu_set:
+            cpus = parse_cpu_list(cpu_set)
+            self.logger.info(f"Instance {instance_num}: Pinning to CPUs {cpu_set}")
+
+            def setpgrp_and_pin() -> None:
+                # Applied before exec, so the whole process group inherits the affinity.
+                os.setpgrp()
+                os.sched_setaffinity(0, cpus)
+
+            preexec_fn = setpgrp_and_pin
+
         self.logger.info(f"Instance {instance_num}: Full command: {shlex.join(base_command)}")
         process = subprocess.Popen(
             base_command,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
             env=final_env,
             cwd=Path.home(),
-            preexec_fn=os.setpgrp,
+            preexec_fn=preexec_fn,
         )
         pgid = process.pid
         self.logger.info(f"Instance {instance_num} started with PID: {process.pid} and PGID: {pgid}")
         return process, pgid
 
+    def _start_resource_sampler(self, profile: Profile) -> None:
+        """Start sampling instance resources at the profile's interval, unless disabled."""
+        if profile.resource_sample_interval > 0:
+            self.resource_sampler.interval = profile.resource_sample_interval
+            self.resource_sampler.start()
+
+    def _track_shader_cache_stats(self, profile: Profile, instance_nums: list[int]) -> None:
+        """Remember which instances print Mesa's shader cache statistics, for `report_shader_cache`."""
+        if profile.shader_cache_mode == "isolated":
+            self._shader_stats_instances.difference_update(instance_nums)
+        else:
+            self._shader_stats_instances.update(instance_nums)
+
+    def _start_pressure_throttle(self, profile: Profile) -> None:
+        """Start throttling background helpers under pressure with the profile's policy, unless it is off."""
+        self.pressure_throttle.policy = profile.pressure_policy
+        self.pressure_throttle.threshold = profile.pressure_threshold
+        self.pressure_throttle.start()
+
+    def _ensure_virtual_joystick(self, profile: Profile) -> None:
+        """Create the shared virtual joystick if any player lacks a physical one and it does not exist yet."""
+        if self._virtual_joystick_path is None and profile.needs_virtual_joystick():
+            self.logger.info("One or more instances lack a physical joystick. Creating a virtual one.")
+            try:
+                self._virtual_joystick_path = self.virtual_device.create_virtual_joystick()
+            except VirtualDeviceError:
+                self.logger.error("Halting launch due to virtual joystick creation failure.")
+                # Re-raise the exception to be caught by the UI layer
+                raise
+
+    @_launching
     def launch_instance(
         self,
         profile: Profile,
@@ -171,39 +605,136 @@ class InstanceService:
         use_gamescope_override: Optional[bool] = None,
     ) -> None:
         """Launch a single Steam instance."""
-        if not self._virtual_joystick_checked:
-            self._virtual_joystick_checked = True
-            needs_virtual_joystick = False
-            num_players = profile.effective_num_players()
-            if num_players > 0:
-                # Check player configs up to the number of players
-                for i in range(num_players):
-                    player_config = (
-                        profile.player_configs[i]
-                        if profile.player_configs and i < len(profile.player_configs)
-                        else PlayerInstanceConfig()
-                    )
-                    if not player_config.physical_device_id:
-                        needs_virtual_joystick = True
-                        break
-
-            if needs_virtual_joystick:
-                self.logger.info("One or more instances lack a physical joystick. Creating a virtual one.")
-                try:
-                    self._virtual_joystick_path = self.virtual_device.create_virtual_joystick()
-                except VirtualDeviceError:
-                    self.logger.error("Halting launch due to virtual joystick creation failure.")
-                    # Re-raise the exception to be caught by the UI layer
-                    raise
+        self._ensure_virtual_joystick(profile)
 
         active_profile = profile
         if use_gamescope_override is not None:
             active_profile = copy.deepcopy(profile)
             active_profile.use_gamescope = use_gamescope_override
 
-        self.validate_dependencies(use_gamescope=active_profile.use_gamescope)
         Config.LOG_DIR.mkdir(parents=True, exist_ok=True)
-        self._launch_single_instance(active_profile, instance_num)
+        plan = self.build_launch_plan(active_profile, [instance_num])
+        self._track_shader_cache_stats(profile, [instance_num])
+        self._start_resource_sampler(profile)
+        self._start_pressure_throttle(profile)
+        self.logger.info(f"Preparing instance {instance_num}...")
+        self._prepare_homes([Path(plan.instances[0].home_path)])
+        self._launch_single_instance(plan.instances[0])
+
+    @traced("instance")
+    @_launching
+    def launch_instances(
+        self,
+        profile: Profile,
+        instance_nums: list[int],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> dict[int, float]:
+        """
+        Launch several Steam instances, one after another.
+
+        The whole session is resolved up front with `build_launch_plan`. The
+        next instance is launched as soon as the previous one reports ready
+        through the profile's readiness probe, or once the readiness timeout
+        expires. The homes of the remaining instances are prepared in one
+        background batch while the first one is starting up. A session
+        prepared with `prepare_session` is reused where it is still current.
+
+        Args:
+            profile (Profile): The profile to launch the instances with.
+            instance_nums (list[int]): The instances to launch, in launch order.
+            cancel_event (Optional[threading.Event]): When set, no further
+                instances are launched.
+
+        Returns:
+            dict[int, float]: Seconds each launched instance took to become ready.
+        """
+        ready_times: dict[int, float] = {}
+        if not instance_nums:
+            return ready_times
+
+        Config.LOG_DIR.mkdir(parents=True, exist_ok=True)
+        session = self._take_prepared_session(profile, instance_nums)
+        plan = session.plan
+        home_paths = [instance_plan.home_path for instance_plan in plan.instances]
+        homes_ready = session.homes_ready(home_paths)
+        # The instances modify their homes from now on; prepare them again on the next launch.
+        session.homes_key = None
+        self._track_shader_cache_stats(profile, instance_nums)
+        self._start_resource_sampler(profile)
+        self._start_pressure_throttle(profile)
+
+        probe = get_readiness_probe(profile.launch_ready_stage, profile.use_gamescope)
+        self.logger.info(
+            f"Launching instances {instance_nums} (readiness: {probe.description}, "
+            f"timeout: {profile.launch_ready_timeout}s)"
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The first home is prepared on its own so the first instance starts
+            # quickly; the remaining homes are prepared as one batch while it starts.
+            # Homes prepared ahead of time by `prepare_session` are not prepared again.
+            if homes_ready:
+                self.logger.info("Instance homes were prepared ahead of time.")
+                home_paths = []
+            preparation = executor.submit(self._prepare_homes, [Path(p) for p in home_paths[:1]])
+            for position, instance_plan in enumerate(plan.instances):
+                instance_num = instance_plan.instance_num
+                if cancel_event and cancel_event.is_set():
+                    self.logger.info("Launch sequence cancelled.")
+                    break
+
+                try:
+                    preparation.result()
+                    prepared = True
+                except Exception as e:
+                    self.logger.error(f"Failed to prepare instance {instance_num}: {e}")
+                    prepared = False
+
+                if position == 0 and len(plan.instances) > 1:
+                    preparation = executor.submit(self._prepare_homes, [Path(p) for p in home_paths[1:]])
+
+                if not prepared or not self._launch_single_instance(instance_plan):
+                    continue
+
+                ready_times[instance_num] = self._wait_until_ready(
+                    instance_num, probe, profile.launch_ready_timeout, cancel_event
+                )
+
+        summary = ", ".join(f"{num}: {secs:.2f}s" for num, secs in ready_times.items())
+        self.logger.info(f"Launch sequence finished. Time to ready per instance: {summary or 'none'}")
+        self.logger.info(f"Launch trace written to {Tracer.get().write()}")
+        return ready_times
+
+    def _wait_until_ready(
+        self,
+        instance_num: int,
+        probe: ReadinessProbe,
+        timeout: float,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> float:
+        """Block until an instance is ready, has exited, or the timeout expires."""
+        start = time.monotonic()
+        deadline = start + timeout
+        pgid = self.pgids.get(instance_num)
+        process = self.processes.get(instance_num)
+        reason = "timeout"
+
+        while time.monotonic() < deadline:
+            if cancel_event and cancel_event.is_set():
+                reason = "cancelled"
+                break
+            if process is not None and process.poll() is not None:
+                reason = f"exited with code {process.returncode}"
+                break
+            if pgid and probe.is_ready(pgid):
+                reason = probe.description
+                break
+            time.sleep(READINESS_POLL_INTERVAL)
+
+        elapsed = time.monotonic() - start
+        self.logger.info(f"Instance {instance_num} ready after {elapsed:.2f}s ({reason}).")
+        Tracer.get().instant(f"ready: {reason}", "readiness", instance=instance_num, seconds=elapsed)
+        return elapsed
 
     def terminate_instance(self, instance_num: int) -> None:
         """Terminates a single Steam instance gracefully."""
@@ -211,96 +742,190 @@ class InstanceService:
             self.logger.warning(f"Attempted to terminate non-existent instance {instance_num}")
             return
 
-        process = self.processes[instance_num]
-        self.logger.info(f"Terminating instance {process.pid}...")
+        self.terminate_instances([instance_num])
 
-        if process.poll() is None:
-            # Get the appropriate process/group ID for termination.
-            # For Flatpak, this is the host PGID we captured.
-            # For native, it's the PGID we created.
-            pgid = self.pgids.get(instance_num)
-            if pgid:
-                if Utils.is_flatpak():
-                    self.logger.info(f"Sending SIGTERM to host process group {pgid} for instance {instance_num}")
-                    Utils.flatpak_spawn_host(["sh", "-c", f"kill -15 -{pgid}"])
-                else:
-                    try:
-                        self.logger.info(f"Sending SIGTERM to process group {pgid} for instance {instance_num}")
-                        os.killpg(pgid, signal.SIGTERM)
-                    except ProcessLookupError:
-                        self.logger.warning(f"Process group {pgid} not found for instance {instance_num}.")
+    @traced("instance")
+    def terminate_instances(self, instance_nums: list[int], grace_period: float = TERMINATION_GRACE_PERIOD) -> None:
+        """
+        Terminate several Steam instances at once.
 
-                try:
-                    process.wait(timeout=10)
-                    self.logger.info(f"Instance {instance_num} terminated gracefully.")
-                except subprocess.TimeoutExpired:
-                    self.logger.warning(f"Instance {instance_num} did not terminate after 10s. Sending SIGKILL.")
-                    if Utils.is_flatpak():
-                        try:
-                            Utils.flatpak_spawn_host(["sh", "-c", f"kill -9 -{pgid}"])
-                        except Exception as e:
-                            self.logger.warning(f"Failed to send SIGKILL to host PGID {pgid}: {e}")
-
-                        Utils.flatpak_spawn_host(["sh", "-c", "pkill -9 -f winedevice"])
-
-                    else:
-                        try:
-                            os.killpg(pgid, signal.SIGKILL)
-                        except ProcessLookupError:
-                            self.logger.warning(
-                                f"Process group {pgid} not found when sending SIGKILL for instance {instance_num}."
-                            )
-
-                        subprocess.run(
-                            ["pkill", "-9", "-f", "winedevice"],
-                            capture_output=True,
-                            text=True,
-                            check=False,
-                        )
+        SIGTERM is sent to every process group up front and all instances share
+        a single grace deadline. Only the instances still alive once it expires
+        are sent SIGKILL, through their whole cgroup scope when they run in one
+        and through their process group otherwise.
+
+        Args:
+            instance_nums (list[int]): The instances to terminate.
+            grace_period (float): Seconds to wait for a graceful exit before
+                escalating to SIGKILL.
+        """
+        targets: dict[int, subprocess.Popen] = {}
+        for instance_num in instance_nums:
+            process = self.processes.get(instance_num)
+            if process is not None:
+                targets[instance_num] = process
+        if not targets:
+            return
 
+        start = time.monotonic()
+        shutdown_times: dict[int, float] = {}
+        alive: dict[int, subprocess.Popen] = {}
+        for instance_num, process in targets.items():
+            self.logger.info(f"Terminating instance {process.pid}...")
+            if process.poll() is None:
+                alive[instance_num] = process
             else:
-                self.logger.warning(f"No PGID found for instance {instance_num}, cannot send termination signal.")
+                shutdown_times[instance_num] = 0.0
+
+        # Get the appropriate process/group ID for termination.
+        # For Flatpak, this is the host PGID we captured.
+        # For native, it's the PGID we created.
+        # The supervisor forgets instances as they exit, so each mapping is read only once.
+        groups = {num: pgid for num in alive if (pgid := self.pgids.get(num))}
+        for instance_num, process in alive.items():
+            if instance_num not in groups:
+                self.logger.warning(f"No PGID found for instance {instance_num}, terminating its process directly.")
+                process.terminate()
+        self._signal_process_groups(groups, signal.SIGTERM)
+
+        deadline = start + grace_period
+        while alive and time.monotonic() < deadline:
+            for instance_num, process in list(alive.items()):
+                if process.poll() is not None:
+                    shutdown_times[instance_num] = time.monotonic() - start
+                    del alive[instance_num]
+            if alive:
+                time.sleep(TERMINATION_POLL_INTERVAL)
+
+        if alive:
+            self.logger.warning(
+                f"Instances {sorted(alive)} did not terminate after {grace_period:.0f}s. Sending SIGKILL."
+            )
+            # A scope also holds the processes that left the instance's process group.
+            scoped = {num: unit for num in alive if (unit := self.cgroup_units.get(num))}
+            self.cgroup_scopes.kill(list(scoped.values()), signal.SIGKILL)
+            for instance_num, process in alive.items():
+                if instance_num not in groups and instance_num not in scoped:
+                    process.kill()
+            self._signal_process_groups(
+                {num: groups[num] for num in alive if num in groups and num not in scoped}, signal.SIGKILL
+            )
+            if len(scoped) < len(alive):
+                if Utils.is_flatpak():
+                    Utils.flatpak_spawn_host(["sh", "-c", "pkill -9 -f winedevice"])
+                else:
+                    subprocess.run(
+                        ["pkill", "-9", "-f", "winedevice"],
+                        capture_output=True,
+                        text=True,
+                        check=False,
+                    )
+            for instance_num, process in alive.items():
+                process.wait()
+                shutdown_times[instance_num] = time.monotonic() - start
+
+        for instance_num in targets:
+            exit_kind = "was killed" if instance_num in alive else "terminated gracefully"
+            self.logger.info(f"Instance {instance_num} {exit_kind} after {shutdown_times[instance_num]:.2f}s.")
+            self.processes.pop(instance_num, None)
+            self.pids.pop(instance_num, None)
+            self.pgids.pop(instance_num, None)
+            self.cgroup_units.pop(instance_num, None)
+
+    def _signal_process_groups(self, groups: dict[int, int], sig: signal.Signals) -> None:
+        """Send a signal to the process groups of several instances at once."""
+        if not groups:
+            return
 
-        if process.poll() is None:
-            process.wait()
+        if Utils.is_flatpak():
+            self.logger.info(f"Sending {sig.name} to host process groups {list(groups.values())}")
+            targets = " ".join(f"-{pgid}" for pgid in groups.values())
+            try:
+                Utils.flatpak_spawn_host(["sh", "-c", f"kill -{int(sig)} -- {targets}"])
+            except Exception as e:
+                self.logger.warning(f"Failed to send {sig.name} to host process groups: {e}")
+            return
 
-        if instance_num in self.processes:
-            del self.processes[instance_num]
-        if instance_num in self.pids:
-            del self.pids[instance_num]
-        if instance_num in self.pgids:
-            del self.pgids[instance_num]
+        for instance_num, pgid in groups.items():
+            try:
+                self.logger.info(f"Sending {sig.name} to process group {pgid} for instance {instance_num}")
+                os.killpg(pgid, sig)
+            except ProcessLookupError:
+                self.logger.warning(f"Process group {pgid} not found for instance {instance_num}.")
 
     def _prepare_home(self, home_path: Path) -> None:
+        """Prepare the isolated Steam directories for a single instance."""
+        self._prepare_homes([home_path])
+
+    @classmethod
+    def _set_home_running(cls, home_path: Path, running: bool) -> None:
+        """Record that an instance started or stopped running in a home."""
+        with cls._running_homes_lock:
+            if running:
+                cls._running_homes.add(str(home_path))
+            else:
+                cls._running_homes.discard(str(home_path))
+
+    @classmethod
+    def is_home_running(cls, home_path: Path) -> bool:
+        """Check whether an instance launched by any service of this process is running in a home."""
+        with cls._running_homes_lock:
+            return str(home_path) in cls._running_homes
+
+    @traced("instance")
+    def _prepare_homes(self, home_paths: list[Path]) -> list[Path]:
         """
-        Prepare the isolated Steam directories for the instance.
+        Prepare the isolated Steam directories for several instances in one batch.
+
+        This involves creating the directory structure and syncing app manifests
+        from the host to ensure games are recognized. Preparations run one at
+        a time, since the background session preparation and a launch may
+        prepare the same homes. Homes with a running instance are in use and
+        are left as they are.
 
-        This involves creating the directory structure and copying app manifests
-        to ensure games are recognized.
+        Returns:
+            list[Path]: The homes that were prepared.
         """
-        self.logger.info(f"Preparing isolated Steam directories for instance at {home_path}...")
+        in_use = [home_path for home_path in home_paths if self.is_home_running(home_path)]
+        if in_use:
+            self.logger.info(f"Not preparing homes with a running instance: {', '.join(map(str, in_use))}")
+            home_paths = [home_path for home_path in home_paths if home_path not in in_use]
+        if not home_paths:
+            return home_paths
+        with self._prepare_lock:
+            for home_path in home_paths:
+                self.logger.info(f"Preparing isolated Steam directories for instance at {home_path}...")
+                sdbx_steam_local = home_path / ".local/share/Steam"
+
+                # Create essential Steam directories within the instance's isolated path
+                (sdbx_steam_local / "steamapps").mkdir(parents=True, exist_ok=True)
+                (sdbx_steam_local / "compatibilitytools.d").mkdir(parents=True, exist_ok=True)
+
+            # Sync .acf (app manifest) files from the host to the instances.
+            # This makes Steam recognize games as "installed" so it can find them
+            # in the shared steamapps/common directory, with up-to-date build IDs.
+            self.manifest_sync.sync(home_paths)
 
-        sdbx_steam_local = home_path / ".local/share/Steam"
+        self.logger.info("Isolated Steam directories are ready.")
+        return home_paths
 
-        # Create essential Steam directories within the instance's isolated path
-        (sdbx_steam_local / "steamapps").mkdir(parents=True, exist_ok=True)
-        (sdbx_steam_local / "compatibilitytools.d").mkdir(parents=True, exist_ok=True)
+    def clone_proton_prefixes(self, instance_nums: list[int], app_ids: list[str]) -> dict[str, int]:
+        """
+        Give the homes of the given instances a clone of the golden Proton prefix of some games.
 
-        # Copy .acf (app manifest) files from the host to the instance.
-        # This makes Steam recognize games as "installed" so it can find them
-        # in the shared steamapps/common directory.
-        host_steamapps = Path.home() / ".local/share/Steam/steamapps"
-        dest_steamapps = sdbx_steam_local / "steamapps"
+        Only games that have no prefix in a home yet are cloned; see
+        `PrefixTemplater.clone_missing`.
 
-        if host_steamapps.exists():
-            for acf_file in host_steamapps.glob("*.acf"):
-                dest_file = dest_steamapps / acf_file.name
-                if not dest_file.exists():
-                    shutil.copy(acf_file, dest_file)
-        else:
-            self.logger.warning(f"Host Steam directory '{host_steamapps}' not found. Cannot copy game manifests.")
+        Args:
+            instance_nums (list[int]): The instances whose homes are filled.
+            app_ids (list[str]): The Steam app IDs of the games.
 
-        self.logger.info("Isolated Steam directories are ready.")
+        Returns:
+            dict[str, int]: The statistics returned by `PrefixTemplater.clone_missing`.
+        """
+        home_paths = self._prepare_homes([Config.get_steam_home_path(num) for num in instance_nums])
+        with self._prepare_lock:
+            return self.prefix_templater.clone_missing(home_paths, app_ids)
 
     def _prepare_environment(self, profile: Profile, device_info: dict, instance_num: int) -> dict:
         """Prepare a dictionary of environment variables for the Steam instance."""
@@ -321,6 +946,7 @@ class InstanceService:
         self.logger.info(f"Instance {instance_num}: Environment variables prepared.")
         return env
 
+    @traced("instance")
     def _validate_input_devices(self, profile: Profile, instance_num: int, instance_num_display: int) -> dict:
         """Validate input devices and return information about them."""
         # Get specific player config
@@ -333,6 +959,10 @@ class InstanceService:
         def _validate_device(path_str: Optional[str], device_type: str) -> Optional[str]:
             if not path_str or not path_str.strip():
                 return None
+            registered = DeviceRegistry.get().find(path_str)
+            if registered:
+                self.logger.info(f"Instance {instance_num_display}: {device_type} device '{path_str}' assigned.")
+                return registered["event"]
             path_obj = Path(path_str)
             if path_obj.exists() and path_obj.is_char_device():
                 self.logger.info(f"Instance {instance_num_display}: {device_type} device '{path_str}' assigned.")
@@ -371,7 +1001,6 @@ class InstanceService:
                 self.virtual_device.destroy_virtual_joystick()
                 self._virtual_joystick_path = None
                 self.logger.info("Virtual joystick destroyed.")
-            self._virtual_joystick_checked = False
 
             # Cleanup KDE-specific settings
             if self.kde_manager:
@@ -379,12 +1008,21 @@ class InstanceService:
                 self.kde_manager.restore_panel_states()
                 self.logger.info("KDE-specific cleanup complete.")
 
-            for instance_num in list(self.processes.keys()):
-                self.terminate_instance(instance_num)
+            # Resume paused helpers first; a stopped process would only exit on SIGKILL.
+            self.pressure_throttle.stop()
+            instance_nums = list(self.processes.keys())
+            self.terminate_instances(instance_nums)
+            self.report_shader_cache(instance_nums)
+            self._shader_stats_instances.clear()
 
             self.logger.info("Instance termination complete.")
+            self.resource_sampler.stop()
             self.pids.clear()
             self.processes.clear()
 
+            trace_path = Tracer.get().end_session()
+            if trace_path:
+                self.logger.info(f"Session trace written to {trace_path}")
+
         finally:
             self.termination_in_progress = False
@@ -5,15 +5,20 @@ This module provides functionality to manage KDE-specific features such as
 KWin scripts for window management and panel visibility control.
 """
 
+import json
 import os
 import subprocess
 from pathlib import Path
 
-import pydbus
-
-from src.core import Logger, Utils
+from src.core import Config, HostCapabilities, Logger, Utils, traced
 from src.models import Profile
 
+from .layout import get_kwin_layouts
+
+KWIN_SCRIPT_PATH = Path(__file__).parent.parent.parent / "res" / "kwin" / "kwin_gamescope_layout.js"
+# The line of the script that receives the layouts computed by `get_kwin_layouts`.
+KWIN_LAYOUTS_PLACEHOLDER = "const LAYOUTS = [];"
+
 
 class KdeManager:
     """Manages KDE-specific features such as KWin scripts and panel visibility."""
@@ -25,32 +30,24 @@ class KdeManager:
         self.qdbus_command = self._find_qdbus_command()
         self.kwin_script_id = None
 
+    @traced("kde")
     def start_kwin_script(self, profile: Profile):
         """Start the appropriate KWin script using D-Bus."""
         if not self.is_kde_desktop():
             self.logger.warning("Not a KDE desktop, skipping KWin script.")
             return
 
-        # Se não for splitscreen, ativa o script per-monitor para fullscreen
-        if not profile.is_splitscreen_mode or not profile.splitscreen:
-            self.logger.info("Fullscreen mode, loading KWin script.")
-            script_name = "kwin_gamescope.js"
-        else:
-            orientation = profile.splitscreen.orientation
-            script_name = "kwin_gamescope_vertical.js" if orientation == "vertical" else "kwin_gamescope_horizontal.js"
-
-        script_path = Path(__file__).parent.parent.parent / "res" / "kwin" / script_name
-
-        self.logger.info(f"Attempting to load KWin script: {script_path}")
-
-        if not script_path.exists():
-            self.logger.error(f"KWin script not found at {script_path}")
+        if not KWIN_SCRIPT_PATH.exists():
+            self.logger.error(f"KWin script not found at {KWIN_SCRIPT_PATH}")
             return
 
+        mode = profile.splitscreen.orientation if profile.is_splitscreen_mode and profile.splitscreen else "fullscreen"
+        self.logger.info(f"Attempting to load KWin script: {KWIN_SCRIPT_PATH} ({mode} layout)")
+        script_content = self._build_kwin_script(profile)
+
         try:
             if Utils.is_flatpak():
                 self.logger.info("Loading KWin script via flatpak-spawn...")
-                script_content = script_path.read_text()
 
                 # Create a temporary file on the host
                 tmp_creator = Utils.flatpak_spawn_host(["mktemp"], capture_output=True, text=True, check=True)
@@ -82,6 +79,13 @@ class KdeManager:
                 # Clean up the temporary file
                 Utils.flatpak_spawn_host(["rm", tmp_path], check=True)
             else:
+                # pydbus loads GLib and Gio; it is only needed on KDE, outside of a Flatpak.
+                import pydbus
+
+                script_path = Config.LOCAL_DIR / KWIN_SCRIPT_PATH.name
+                script_path.parent.mkdir(parents=True, exist_ok=True)
+                script_path.write_text(script_content, encoding="utf-8")
+
                 bus = pydbus.SessionBus()
                 kwin_proxy = bus.get("org.kde.KWin", "/Scripting")
                 self.logger.info("Loading KWin script via D-Bus...")
@@ -94,6 +98,16 @@ class KdeManager:
         except Exception as e:
             self.logger.error(f"Failed to load KWin script: {e}")
 
+    def _build_kwin_script(self, profile: Profile) -> str:
+        """Return the KWin script with the window layouts of the profile filled in."""
+        # Layouts for every window count the script may see, so that it can lay out instances as they appear.
+        max_slots = max(profile.num_players, profile.effective_num_players(), 1)
+        layouts = json.dumps(get_kwin_layouts(profile, max_slots))
+        return KWIN_SCRIPT_PATH.read_text(encoding="utf-8").replace(
+            KWIN_LAYOUTS_PLACEHOLDER, f"const LAYOUTS = {layouts};", 1
+        )
+
+    @traced("kde")
     def stop_kwin_script(self):
         """Stop and unload the KWin splitscreen script using its ID."""
         if not self.kwin_script_id:
@@ -112,6 +126,8 @@ class KdeManager:
                 ]
                 Utils.flatpak_spawn_host(command, check=True)
             else:
+                import pydbus
+
                 bus = pydbus.SessionBus()
                 kwin_proxy = bus.get("org.kde.KWin", "/Scripting")
                 self.logger.info(f"Unloading KWin script with ID: {self.kwin_script_id}...")
@@ -129,17 +145,10 @@ class KdeManager:
 
     def _find_qdbus_command(self):
         """Find the correct qdbus command (qdbus or qdbus6)."""
-        for cmd in ["qdbus6", "qdbus"]:
-            try:
-                command = [cmd, "--version"]
-                if Utils.is_flatpak():
-                    Utils.flatpak_spawn_host(command, capture_output=True, check=True)
-                else:
-                    subprocess.run(command, capture_output=True, check=True)
-                self.logger.info(f"Using '{cmd}' for dbus communication.")
-                return cmd
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
+        cmd = HostCapabilities.get().qdbus_command
+        if cmd:
+            self.logger.info(f"Using '{cmd}' for dbus communication.")
+            return cmd
         self.logger.warning("Neither 'qdbus' nor 'qdbus6' command found.")
         return None
 
@@ -174,6 +183,7 @@ class KdeManager:
         count_str = self._run_qdbus_script(script)
         return int(count_str) if count_str and count_str.isdigit() else 0
 
+    @traced("kde")
     def save_panel_states(self):
         """Save the current visibility state of all panels."""
         if not self.is_kde_desktop() or not self.qdbus_command:
@@ -192,6 +202,7 @@ class KdeManager:
                 self.original_panel_states[i] = state
                 self.logger.info(f"Saved panel {i} state: {state}")
 
+    @traced("kde")
     def set_panels_dodge_windows(self):
         """Set all panels to 'Dodge Windows' visibility."""
         if not self.is_kde_desktop() or not self.qdbus_command:
@@ -203,6 +214,7 @@ class KdeManager:
             self._run_qdbus_script(script)
             self.logger.info(f"Set panel {i} to 'Dodge Windows'")
 
+    @traced("kde")
     def restore_panel_states(self):
         """Restore the visibility state of all panels to their original state."""
         if not self.is_kde_desktop() or not self.qdbus_command or not self.original_panel_states:
@@ -0,0 +1,213 @@
+"""
+Layout module for the Twinverse application.
+
+This module computes where every instance goes on screen: which monitor it
+uses and the rectangle it takes on that monitor. It is the single source of
+the layout, used both for the Gamescope `-W/-H` arguments and for the window
+placement done by the KWin script.
+
+Layouts are computed for all instances at once and cached. The cells, as
+fractions of a monitor, depend only on the profile; the pixel rectangles also
+depend on the monitor topology.
+"""
+
+import functools
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.models import Profile, SplitscreenConfig
+
+# Instances per monitor in splitscreen mode when the profile does not set a grid.
+DEFAULT_PLAYERS_PER_MONITOR = 4
+
+
+class Cell(NamedTuple):
+    """The rectangle of an instance, as fractions of the monitor at `monitor` (an index into the sorted monitors)."""
+
+    monitor: int
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class Rect(NamedTuple):
+    """The rectangle of an instance, in pixels, on the monitor with the id `monitor`."""
+
+    monitor: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def parse_grid(grid: str) -> Tuple[int, int]:
+    """Parse a "COLUMNSxROWS" grid, such as "3x2", into (columns, rows)."""
+    columns, rows = grid.lower().split("x")
+    return int(columns), int(rows)
+
+
+def get_monitor_capacity(splitscreen: Optional[SplitscreenConfig]) -> int:
+    """Return how many instances share a monitor in splitscreen mode."""
+    if splitscreen is None:
+        return DEFAULT_PLAYERS_PER_MONITOR
+    if splitscreen.grid:
+        columns, rows = parse_grid(splitscreen.grid)
+        return columns * rows
+    return splitscreen.players_per_monitor
+
+
+def get_slot(profile: Profile, instance_num: int) -> int:
+    """
+    Return the position of an instance in the layout.
+
+    Instances take the cells in the order they are launched, which is the
+    order of the selected players; without a selection, the instance number.
+    """
+    if profile.selected_players and instance_num in profile.selected_players:
+        return sorted(profile.selected_players).index(instance_num)
+    return instance_num
+
+
+def _split(count: int, weights: Sequence[float]) -> List[Tuple[float, float]]:
+    """Split the unit interval into `count` (start, size) parts, in proportion to `weights`."""
+    weights = list(weights[:count]) + [1.0] * (count - len(weights))
+    total = sum(weights)
+    parts, start = [], 0.0
+    for weight in weights:
+        parts.append((start, weight / total))
+        start += weight / total
+    return parts
+
+
+def _split_monitor(
+    num_players: int, orientation: str, grid: Optional[Tuple[int, int]], weights: Sequence[float]
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Lay out the players that share one monitor.
+
+    Horizontal layouts stack rows of players and vertical layouts place
+    columns of them side by side. Earlier lines hold fewer players, so with
+    an odd count the first player gets the larger cell (for three players:
+    one on top and two below, or one on the left and two on the right).
+
+    Returns:
+        List[Tuple[float, float, float, float]]: The (x, y, width, height)
+        fractions of every player, in reading order.
+    """
+    if grid:
+        columns, rows = grid
+        lines, per_line = (rows, columns) if orientation == "horizontal" else (columns, rows)
+        num_lines = min(lines, math.ceil(num_players / per_line))
+    else:
+        num_lines = math.ceil(math.sqrt(num_players))
+    base, extra = divmod(num_players, num_lines)
+    counts = [base] * (num_lines - extra) + [base + 1] * extra
+
+    cells = []
+    for (line_start, line_size), count in zip(_split(num_lines, weights), counts):
+        for index in range(count):
+            cell_start, cell_size = index / count, 1 / count
+            if orientation == "horizontal":
+                cells.append((cell_start, line_start, cell_size, line_size))
+            else:
+                cells.append((line_start, cell_start, line_size, cell_size))
+    return sorted(cells, key=lambda cell: (cell[1], cell[0]))
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_cells(
+    splitscreen: bool,
+    orientation: str,
+    grid: Optional[Tuple[int, int]],
+    capacity: int,
+    weights: Tuple[float, ...],
+    num_slots: int,
+) -> Tuple[Cell, ...]:
+    """Compute the cells of `num_slots` instances; see `compute_cells`."""
+    if not splitscreen:
+        return tuple(Cell(slot, 0.0, 0.0, 1.0, 1.0) for slot in range(num_slots))
+    cells: List[Cell] = []
+    for group, first in enumerate(range(0, num_slots, capacity)):
+        num_players = min(capacity, num_slots - first)
+        cells += [Cell(group, *cell) for cell in _split_monitor(num_players, orientation, grid, weights)]
+    return tuple(cells)
+
+
+def compute_cells(profile: Profile, num_slots: Optional[int] = None) -> Tuple[Cell, ...]:
+    """
+    Compute the cell of every instance, as fractions of its monitor.
+
+    In fullscreen mode each instance gets a monitor of its own. In
+    splitscreen mode the instances fill the monitors in groups of
+    `get_monitor_capacity()`, and each group is split following the
+    profile's orientation, grid and split weights.
+
+    Args:
+        profile (Profile): The profile to lay out.
+        num_slots (Optional[int]): The number of instances; defaults to the
+            profile's effective number of players.
+
+    Returns:
+        Tuple[Cell, ...]: One cell per slot (see `get_slot`).
+    """
+    if num_slots is None:
+        num_slots = profile.effective_num_players()
+    splitscreen = profile.splitscreen if profile.is_splitscreen_mode else None
+    if splitscreen is None:
+        return _compute_cells(False, "horizontal", None, DEFAULT_PLAYERS_PER_MONITOR, (), num_slots)
+    return _compute_cells(
+        True,
+        splitscreen.orientation,
+        parse_grid(splitscreen.grid) if splitscreen.grid else None,
+        get_monitor_capacity(splitscreen),
+        tuple(splitscreen.split_weights or ()),
+        num_slots,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _place_cells(
+    cells: Tuple[Cell, ...], topology: Tuple[Tuple[int, int, int, int, int], ...]
+) -> Tuple[Optional[Rect], ...]:
+    """Convert cells to pixel rectangles on the given (id, x, y, width, height) monitors."""
+    rects: List[Optional[Rect]] = []
+    for cell in cells:
+        if cell.monitor >= len(topology):
+            rects.append(None)
+            continue
+        monitor_id, x, y, width, height = topology[cell.monitor]
+        # Rounding the edges, rather than the sizes, makes the cells tile the monitor exactly.
+        left, right = round(cell.x * width), round((cell.x + cell.width) * width)
+        top, bottom = round(cell.y * height), round((cell.y + cell.height) * height)
+        rects.append(Rect(monitor_id, x + left, y + top, right - left, bottom - top))
+    return tuple(rects)
+
+
+def compute_rects(profile: Profile, monitors: List[Dict]) -> Tuple[Optional[Rect], ...]:
+    """
+    Compute the pixel rectangle of every instance.
+
+    Args:
+        profile (Profile): The profile to lay out.
+        monitors (List[Dict]): The monitors, as returned by
+            `DeviceManager.get_screen_info()`.
+
+    Returns:
+        Tuple[Optional[Rect], ...]: One rectangle per slot (see `get_slot`),
+        or None for instances beyond the connected monitors.
+    """
+    topology = tuple(
+        (m["id"], m["x"], m["y"], m["width"], m["height"]) for m in sorted(monitors, key=lambda m: m["id"])
+    )
+    return _place_cells(compute_cells(profile), topology)
+
+
+def get_kwin_layouts(profile: Profile, max_slots: int) -> List[List[Dict[str, float]]]:
+    """
+    Return the cells the KWin script places windows in, for every number of windows.
+
+    The script lays out the Gamescope windows it finds in order, so entry
+    `n` holds the cells of `n` windows (entry 0 is empty).
+    """
+    return [[cell._asdict() for cell in compute_cells(profile, count)] for count in range(max_slots + 1)]
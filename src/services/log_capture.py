@@ -0,0 +1,240 @@
+"""
+Instance log capture module for the Twinverse application.
+
+This module collects the output of every launched Steam instance into
+size-capped rotating log files under `Config.LOG_DIR`, and keeps the last
+lines of each instance in memory so they can be shown in the interface.
+"""
+
+import codecs
+import collections
+import os
+import select
+import threading
+from pathlib import Path
+from typing import IO, Deque, Dict, List, Optional
+
+from src.core import Config, Logger
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 2
+LOG_TAIL_LINES = 500
+# Output waiting for the disk beyond this is dropped rather than blocking the reader.
+MAX_PENDING_BYTES = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class _CapturedStream:
+    """Reader-side state of one instance's output pipe."""
+
+    def __init__(self, instance_num: int, stream: IO[bytes], tail_lines: int):
+        self.instance_num = instance_num
+        self.stream = stream
+        self.tail: Deque[str] = collections.deque(maxlen=tail_lines)
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.partial = ""
+
+
+class InstanceLogCapture:
+    """
+    Captures the merged stdout and stderr of launched instances.
+
+    A single epoll thread drains every instance pipe as soon as data arrives,
+    so a chatty instance never blocks on a full pipe. Writing to disk happens
+    on a separate writer thread; when the disk cannot keep up, the pending
+    output is capped at `MAX_PENDING_BYTES` and the excess is dropped with a
+    note in the log file instead of stalling the reader.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        log_dir: Optional[Path] = None,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        tail_lines: int = LOG_TAIL_LINES,
+    ):
+        """
+        Initialize the log capture.
+
+        Args:
+            logger (Logger): The application logger.
+            log_dir (Optional[Path]): Where the instance logs are written,
+                `Config.LOG_DIR` by default.
+            max_bytes (int): The size at which a log file is rotated.
+            backup_count (int): How many rotated files are kept per instance.
+            tail_lines (int): How many recent lines are kept in memory per instance.
+        """
+        self.logger = logger
+        self.log_dir = log_dir or Config.LOG_DIR
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.tail_lines = tail_lines
+
+        self._lock = threading.Lock()
+        self._streams: Dict[int, _CapturedStream] = {}
+        self._tails: Dict[int, Deque[str]] = {}
+        self._epoll: Optional[select.epoll] = None
+        self._reader: Optional[threading.Thread] = None
+
+        self._pending: Deque[tuple] = collections.deque()
+        self._pending_bytes = 0
+        self._dropped: Dict[int, int] = {}
+        self._pending_ready = threading.Condition(self._lock)
+        self._writer: Optional[threading.Thread] = None
+        self._files: Dict[int, IO[bytes]] = {}
+
+    def get_log_path(self, instance_num: int) -> Path:
+        """Return the path of an instance's current log file."""
+        return self.log_dir / f"steam_instance_{instance_num}.log"
+
+    def attach(self, instance_num: int, stream: IO[bytes]) -> None:
+        """
+        Start capturing an instance's output.
+
+        Args:
+            instance_num (int): The instance the output belongs to.
+            stream (IO[bytes]): The read end of the instance's output pipe. It
+                is switched to non-blocking mode and closed once the instance
+                and all its children have closed their end.
+
+        Raises:
+            OSError: If the pipe cannot be watched, or RuntimeError if the
+                capture threads cannot be started. The stream is then left
+                to the caller.
+        """
+        os.set_blocking(stream.fileno(), False)
+        captured = _CapturedStream(instance_num, stream, self.tail_lines)
+        with self._lock:
+            self._ensure_threads()
+            assert self._epoll is not None
+            self._epoll.register(stream.fileno(), select.EPOLLIN)
+            self._tails[instance_num] = captured.tail
+            self._streams[stream.fileno()] = captured
+            self._pending.append((instance_num, f"--- Instance {instance_num} started ---\n".encode()))
+            self._pending_ready.notify()
+
+    def get_tail(self, instance_num: int, lines: Optional[int] = None) -> List[str]:
+        """Return the most recent output lines of an instance, oldest first."""
+        with self._lock:
+            tail = list(self._tails.get(instance_num, ()))
+        return tail[-lines:] if lines else tail
+
+    def _ensure_threads(self) -> None:
+        """Start the reader and writer threads on first use."""
+        if self._reader is None or not self._reader.is_alive():
+            self._epoll = select.epoll()
+            self._reader = threading.Thread(target=self._read_loop, name="InstanceLogReader", daemon=True)
+            self._reader.start()
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="InstanceLogWriter", daemon=True)
+            self._writer.start()
+
+    def _read_loop(self) -> None:
+        """Drain the instance pipes as data arrives."""
+        assert self._epoll is not None
+        epoll = self._epoll
+        while True:
+            try:
+                events = epoll.poll()
+            except InterruptedError:
+                continue
+            for fd, _ in events:
+                with self._lock:
+                    captured = self._streams.get(fd)
+                if captured:
+                    self._drain(fd, captured)
+
+    def _drain(self, fd: int, captured: _CapturedStream) -> None:
+        """Read everything currently available on a pipe."""
+        while True:
+            try:
+                data = os.read(fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+
+            if not data:
+                self._close_stream(fd, captured)
+                return
+            self._queue(captured, data)
+
+    def _queue(self, captured: _CapturedStream, data: bytes) -> None:
+        """Update the in-memory tail and hand a chunk to the writer."""
+        text = captured.partial + captured.decoder.decode(data)
+        lines = text.split("\n")
+        captured.partial = lines.pop()
+
+        with self._lock:
+            captured.tail.extend(lines)
+            if self._pending_bytes + len(data) > MAX_PENDING_BYTES:
+                self._dropped[captured.instance_num] = self._dropped.get(captured.instance_num, 0) + len(data)
+                return
+            self._pending.append((captured.instance_num, data))
+            self._pending_bytes += len(data)
+            self._pending_ready.notify()
+
+    def _close_stream(self, fd: int, captured: _CapturedStream) -> None:
+        """Stop watching a pipe whose writers have all exited."""
+        with self._lock:
+            self._streams.pop(fd, None)
+            if self._epoll is not None:
+                self._epoll.unregister(fd)
+            if captured.partial:
+                captured.tail.append(captured.partial)
+            self._pending.append((captured.instance_num, None))
+            self._pending_ready.notify()
+        captured.stream.close()
+
+    def _write_loop(self) -> None:
+        """Write queued output to the instance log files."""
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._pending_ready.wait()
+                instance_num, data = self._pending.popleft()
+                if data is not None:
+                    self._pending_bytes -= len(data)
+                dropped = self._dropped.pop(instance_num, 0)
+
+            try:
+                if dropped:
+                    self._write(instance_num, f"\n--- {dropped} bytes of output dropped (disk too slow) ---\n".encode())
+                if data is None:
+                    log_file = self._files.pop(instance_num, None)
+                    if log_file:
+                        log_file.close()
+                else:
+                    self._write(instance_num, data)
+            except OSError as e:
+                self.logger.error(f"Failed to write log of instance {instance_num}: {e}")
+
+    def _write(self, instance_num: int, data: bytes) -> None:
+        """Append to an instance's log file, rotating it when it grows too large."""
+        log_file = self._files.get(instance_num)
+        if log_file is None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            log_file = open(self.get_log_path(instance_num), "ab")
+            self._files[instance_num] = log_file
+
+        if log_file.tell() + len(data) > self.max_bytes and log_file.tell() > 0:
+            log_file.close()
+            self._rotate(instance_num)
+            log_file = open(self.get_log_path(instance_num), "ab")
+            self._files[instance_num] = log_file
+
+        log_file.write(data)
+        log_file.flush()
+
+    def _rotate(self, instance_num: int) -> None:
+        """Shift `steam_instance_N.log` to `.log.1`, `.log.1` to `.log.2`, and so on."""
+        path = self.get_log_path(instance_num)
+        for index in range(self.backup_count - 1, 0, -1):
+            src = path.with_name(f"{path.name}.{index}")
+            if src.exists():
+                os.replace(src, path.with_name(f"{path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
@@ -0,0 +1,147 @@
+"""
+Manifest sync module for the Twinverse application.
+
+This module keeps the Steam app manifests (`appmanifest_*.acf`) of every
+isolated instance home in sync with the host library, copying only the
+manifests that changed since the last sync.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core import Config, Logger, Utils
+
+# Serializes syncs from different InstanceService objects sharing the same index.
+_SYNC_LOCK = threading.Lock()
+
+
+class ManifestSync:
+    """
+    Synchronizes host app manifests into isolated Steam homes.
+
+    A small JSON index under `Config.LOCAL_DIR` records the mtime, size and
+    hash of every host manifest, and which manifest version each home last
+    received. Unchanged host manifests are not re-hashed, unchanged homes are
+    not touched, and manifests of games uninstalled from the host are removed
+    from the homes they were synced to.
+    """
+
+    def __init__(self, logger: Logger, index_path: Optional[Path] = None, host_steamapps: Optional[Path] = None):
+        """Initialize the sync engine with its index file and the host steamapps directory."""
+        self.logger = logger
+        self.index_path = index_path or Config.LOCAL_DIR / "manifest_index.json"
+        self.host_steamapps = host_steamapps or Path.home() / ".local/share/Steam/steamapps"
+
+    def sync(self, home_paths: List[Path]) -> Dict[str, int]:
+        """
+        Bring the manifests of several instance homes up to date in one pass.
+
+        Args:
+            home_paths (List[Path]): The isolated home directories to update.
+
+        Returns:
+            Dict[str, int]: Counts of "copied", "reflinked", "removed" and
+            "unchanged" manifests across all homes.
+        """
+        stats = {"copied": 0, "reflinked": 0, "removed": 0, "unchanged": 0}
+        if not self.host_steamapps.exists():
+            self.logger.warning(f"Host Steam directory '{self.host_steamapps}' not found. Cannot copy game manifests.")
+            return stats
+
+        with _SYNC_LOCK:
+            return self._sync(home_paths, stats)
+
+    def _sync(self, home_paths: List[Path], stats: Dict[str, int]) -> Dict[str, int]:
+        """Run a sync while holding the index lock."""
+        index = self._load_index()
+        host_manifests = self._scan_host(index.get("host", {}))
+        homes_index: Dict[str, Dict[str, str]] = index.get("homes", {})
+
+        for home_path in home_paths:
+            dest_steamapps = home_path / ".local/share/Steam/steamapps"
+            dest_steamapps.mkdir(parents=True, exist_ok=True)
+            synced = homes_index.setdefault(str(home_path), {})
+            present = {entry.name for entry in os.scandir(dest_steamapps) if entry.name.endswith(".acf")}
+
+            for name, info in host_manifests.items():
+                if synced.get(name) == info["hash"] and name in present:
+                    stats["unchanged"] += 1
+                    continue
+                reflinked = self._replace_manifest(self.host_steamapps / name, dest_steamapps / name)
+                stats["reflinked" if reflinked else "copied"] += 1
+                synced[name] = info["hash"]
+
+            # Drop manifests we synced earlier for games no longer installed on the host.
+            for name in [name for name in synced if name not in host_manifests]:
+                if name in present:
+                    (dest_steamapps / name).unlink()
+                    stats["removed"] += 1
+                del synced[name]
+
+        index["host"] = host_manifests
+        index["homes"] = homes_index
+        self._save_index(index)
+        self.logger.info(
+            f"Manifest sync for {len(home_paths)} home(s): {stats['copied'] + stats['reflinked']} updated, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged."
+        )
+        return stats
+
+    @staticmethod
+    def _replace_manifest(src: Path, dst: Path) -> bool:
+        """
+        Replace a home's manifest with the host's without writing into the old file.
+
+        The new manifest is cloned next to it and renamed over it, so a
+        destination hardlinked to other files (or to the host manifest itself)
+        is swapped out instead of rewritten in every linked copy.
+
+        Returns:
+            bool: True if the manifest was reflinked, False if it was copied.
+        """
+        tmp_path = dst.with_name(f"{dst.name}.tmp")
+        try:
+            reflinked = Utils.clone_file(src, tmp_path)
+            os.replace(tmp_path, dst)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return reflinked
+
+    def _scan_host(self, previous: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Stat the host manifests, hashing only the ones whose mtime or size changed."""
+        manifests: Dict[str, Dict] = {}
+        for entry in os.scandir(self.host_steamapps):
+            if not entry.name.endswith(".acf") or not entry.is_file():
+                continue
+            st = entry.stat()
+            known = previous.get(entry.name)
+            if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+                manifests[entry.name] = known
+                continue
+            with open(entry.path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            manifests[entry.name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": digest}
+        return manifests
+
+    def _load_index(self) -> Dict:
+        """Load the sync index, starting over if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Could not read manifest index {self.index_path}: {e}. Rebuilding it.")
+            return {}
+
+    def _save_index(self, index: Dict) -> None:
+        """Atomically write the sync index."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,128 @@
+"""
+Proton prefix templating module for the Twinverse application.
+
+This module gives instance homes a ready Proton prefix for the games asked
+for by cloning an existing "golden" prefix, instead of letting Proton build
+each one from scratch with wineboot.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.core import Config, Logger, Utils
+
+PREFIX_VERSION_PATTERN = re.compile(r'CURRENT_PREFIX_VERSION\s*=\s*"([^"]+)"')
+# The Windows user profiles hold the golden prefix's saves and settings; clones start without them.
+SKIPPED_PREFIX_PATHS = (Path("pfx/drive_c/users"),)
+
+
+class PrefixTemplater:
+    """
+    Clones Proton prefixes from a golden prefix into instance homes.
+
+    The golden prefix of a game is the host's, or else the first instance's.
+    It is only used when its version file matches the prefix version of a
+    Proton build the instances can run, so Proton does not have to upgrade
+    it on first launch. Files are reflinked where the filesystem supports it
+    and copied otherwise; prefixes are never hardlinked, since Wine rewrites
+    their files in place. The user profiles under `pfx/drive_c/users` are
+    not cloned.
+    """
+
+    def __init__(self, logger: Logger, host_steam_path: Optional[Path] = None):
+        """Initialize the templater with the host Steam directory."""
+        self.logger = logger
+        self.host_steam_path = host_steam_path or Path.home() / ".local/share/Steam"
+
+    def clone_missing(self, home_paths: List[Path], app_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Clone a golden prefix for each of the given games that lacks one in the given homes.
+
+        Args:
+            home_paths (List[Path]): The isolated home directories to fill.
+            app_ids (Iterable[str]): The Steam app IDs of the games. Games
+                that are not installed on the host are ignored.
+
+        Returns:
+            Dict[str, int]: Counts of "cloned" and "version_mismatch" prefixes
+            and the "reflinked_bytes" (saved) and "copied_bytes" written.
+        """
+        stats = {"cloned": 0, "version_mismatch": 0, "reflinked_bytes": 0, "copied_bytes": 0}
+        app_ids = set(app_ids) & self._installed_app_ids()
+        if not app_ids:
+            return stats
+
+        golden_roots = [self.host_steam_path / "steamapps/compatdata"]
+        golden_roots.append(Config.get_steam_home_path(0) / ".local/share/Steam/steamapps/compatdata")
+        proton_versions: Optional[Set[str]] = None
+
+        for home_path in home_paths:
+            compatdata = home_path / ".local/share/Steam/steamapps/compatdata"
+            for app_id in sorted(app_ids):
+                if (compatdata / app_id).exists():
+                    continue
+                golden = self._find_golden(golden_roots, app_id, compatdata)
+                if golden is None:
+                    continue
+
+                if proton_versions is None:
+                    proton_versions = self._available_prefix_versions()
+                version = (golden / "version").read_text(encoding="utf-8", errors="replace").strip()
+                if version not in proton_versions:
+                    stats["version_mismatch"] += 1
+                    continue
+
+                compatdata.mkdir(parents=True, exist_ok=True)
+                try:
+                    reflinked, copied = Utils.clone_tree(golden, compatdata / app_id, SKIPPED_PREFIX_PATHS)
+                except OSError as e:
+                    self.logger.warning(f"Could not clone Proton prefix {golden} into {compatdata}: {e}")
+                    continue
+                stats["cloned"] += 1
+                stats["reflinked_bytes"] += reflinked
+                stats["copied_bytes"] += copied
+
+        if stats["cloned"] or stats["version_mismatch"]:
+            self.logger.info(
+                f"Proton prefixes: {stats['cloned']} cloned, {stats['version_mismatch']} skipped (Proton version "
+                f"mismatch); {stats['reflinked_bytes'] / 1024**2:.1f} MiB saved by reflinks, "
+                f"{stats['copied_bytes'] / 1024**2:.1f} MiB copied."
+            )
+        return stats
+
+    def _installed_app_ids(self) -> Set[str]:
+        """Return the app IDs of the games installed on the host."""
+        steamapps = self.host_steam_path / "steamapps"
+        try:
+            return {
+                entry.name[len("appmanifest_") : -len(".acf")]
+                for entry in os.scandir(steamapps)
+                if entry.name.startswith("appmanifest_") and entry.name.endswith(".acf")
+            }
+        except OSError:
+            return set()
+
+    @staticmethod
+    def _find_golden(golden_roots: List[Path], app_id: str, target: Path) -> Optional[Path]:
+        """Return the first initialized prefix for a game, other than the target itself."""
+        for root in golden_roots:
+            prefix = root / app_id
+            if root != target and (prefix / "version").is_file() and (prefix / "pfx").is_dir():
+                return prefix
+        return None
+
+    def _available_prefix_versions(self) -> Set[str]:
+        """Return the prefix versions of the Proton builds shared with the instances."""
+        versions: Set[str] = set()
+        candidates = list((self.host_steam_path / "steamapps/common").glob("Proton*/proton"))
+        candidates += list((self.host_steam_path / "compatibilitytools.d").glob("*/proton"))
+        for script in candidates:
+            try:
+                match = PREFIX_VERSION_PATTERN.search(script.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+            if match:
+                versions.add(match.group(1))
+        return versions
@@ -0,0 +1,229 @@
+"""
+Pressure throttling module for the Twinverse application.
+
+This module watches the kernel's pressure stall information (PSI) for CPU,
+I/O and memory and, while the system is under pressure, deprioritizes or
+pauses the background helpers of the running instances (shader pre-caching,
+the Steam web helper) so they do not stall the games of the other instances.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core import HostCapabilities, Logger, Utils
+
+PRESSURE_PATH = Path("/proc/pressure")
+PRESSURE_RESOURCES = ("cpu", "io", "memory")
+
+# Process names as reported by the kernel, which truncates them to 15 characters.
+BACKGROUND_HELPERS = ("fossilize_replay", "steamwebhelper")
+# Helpers that can be stopped without breaking the client; the others are only deprioritized.
+PAUSABLE_HELPERS = ("fossilize_replay",)
+
+BACKGROUND_NICE = 19
+# Throttling is lifted once every resource falls below this fraction of the threshold.
+RELEASE_RATIO = 0.5
+
+
+def read_pressure(pressure_path: Path = PRESSURE_PATH) -> Dict[str, float]:
+    """
+    Read the share of time some tasks stalled on each resource over the last 10 seconds.
+
+    Returns:
+        Dict[str, float]: The "some avg10" percentage of every resource the
+        kernel reports. Empty if PSI is not available.
+    """
+    pressure: Dict[str, float] = {}
+    for resource in PRESSURE_RESOURCES:
+        try:
+            with open(pressure_path / resource, "r", encoding="utf-8") as f:
+                line = f.readline()
+        except OSError:
+            continue
+        # some avg10=1.23 avg60=0.45 avg300=0.12 total=123456
+        fields = dict(field.split("=", 1) for field in line.split()[1:] if "=" in field)
+        if "avg10" in fields:
+            pressure[resource] = float(fields["avg10"])
+    return pressure
+
+
+def _matches(name: str, helpers: Tuple[str, ...]) -> bool:
+    """Check whether a (possibly truncated) process name is one of the helpers."""
+    return any(helper[:15] == name[:15] for helper in helpers)
+
+
+class PressureThrottle:
+    """
+    Throttles the background helpers of instances while the system is under pressure.
+
+    With the "renice" policy, helpers get the lowest CPU priority and, if
+    `ionice` is available, the idle I/O class. With the "pause" policy,
+    helpers that can safely be stopped are sent SIGSTOP and the others are
+    reniced. Everything is restored once the pressure falls well below the
+    threshold, or when the throttle is stopped. Every decision is logged.
+
+    Unprivileged processes cannot lower a nice value again unless
+    RLIMIT_NICE allows it, so a reniced helper may keep its low CPU priority
+    after release; its I/O class is always restored.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        get_pgids: Callable[[], Dict[int, int]],
+        policy: str = "off",
+        threshold: float = 20.0,
+        interval: float = 1.0,
+        pressure_path: Path = PRESSURE_PATH,
+    ):
+        """
+        Initialize the throttle.
+
+        Args:
+            logger (Logger): The application logger.
+            get_pgids (Callable[[], Dict[int, int]]): Returns the current
+                mapping of instance numbers to process group IDs.
+            policy (str): "off", "renice" or "pause".
+            threshold (float): The PSI "some avg10" percentage above which
+                helpers are throttled.
+            interval (float): Seconds between pressure checks.
+            pressure_path (Path): The PSI directory.
+        """
+        self.logger = logger
+        self.get_pgids = get_pgids
+        self.policy = policy
+        self.threshold = threshold
+        self.interval = interval
+        self.pressure_path = pressure_path
+        self.throttling = False
+        # pid -> (instance number, process name, action, original nice value)
+        self.throttled: Dict[int, Tuple[int, str, str, Optional[int]]] = {}
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start watching the pressure in the background, unless the policy is off or PSI is unavailable."""
+        if self.policy == "off" or (self._thread and self._thread.is_alive()):
+            return
+        if not read_pressure(self.pressure_path):
+            self.logger.warning("Pressure stall information is not available; background helpers are not throttled.")
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PressureThrottle", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Throttling background helpers above {self.threshold}% pressure (policy: {self.policy})")
+
+    def stop(self) -> None:
+        """Stop watching and restore every throttled helper."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        self.release("throttle stopped")
+
+    def _run(self) -> None:
+        """Check the pressure until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.warning(f"Pressure check failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def check(self) -> Dict[str, float]:
+        """
+        Read the pressure once and throttle or release the helpers accordingly.
+
+        Returns:
+            Dict[str, float]: The pressure that was read.
+        """
+        pressure = read_pressure(self.pressure_path)
+        high = {resource: value for resource, value in pressure.items() if value >= self.threshold}
+        if high:
+            reason = ", ".join(f"{resource} {value:.1f}%" for resource, value in high.items())
+            if not self.throttling:
+                self.logger.info(f"Pressure above {self.threshold}% ({reason}); throttling background helpers.")
+                self.throttling = True
+            # Helpers started since the last check are throttled as well.
+            self._throttle_helpers(reason)
+        elif self.throttling and all(value < self.threshold * RELEASE_RATIO for value in pressure.values()):
+            summary = ", ".join(f"{resource} {value:.1f}%" for resource, value in pressure.items())
+            self.release(f"pressure back to {summary}")
+        return pressure
+
+    def _throttle_helpers(self, reason: str) -> None:
+        """Throttle every helper of the running instances that is not throttled yet."""
+        for instance_num, pgid in self.get_pgids().items():
+            for pid, name in Utils.list_process_group(pgid):
+                if pid in self.throttled or not _matches(name, BACKGROUND_HELPERS):
+                    continue
+                action = "pause" if self.policy == "pause" and _matches(name, PAUSABLE_HELPERS) else "renice"
+                original_nice = None
+                try:
+                    if action == "pause":
+                        self._pause(pid)
+                    else:
+                        original_nice = self._renice(pid)
+                except (OSError, subprocess.SubprocessError) as e:
+                    self.logger.warning(f"Could not {action} {name} (PID {pid}) of instance {instance_num}: {e}")
+                    continue
+                self.throttled[pid] = (instance_num, name, action, original_nice)
+                self.logger.info(f"Instance {instance_num}: {action}d {name} (PID {pid}) under pressure ({reason}).")
+
+    def release(self, reason: str) -> None:
+        """Restore every throttled helper."""
+        self.throttling = False
+        for pid, (instance_num, name, action, original_nice) in list(self.throttled.items()):
+            try:
+                if action == "pause":
+                    self._signal(pid, signal.SIGCONT)
+                else:
+                    self._restore_priority(pid, original_nice)
+                self.logger.info(f"Instance {instance_num}: restored {name} (PID {pid}), {reason}.")
+            except ProcessLookupError:
+                pass
+            except (OSError, subprocess.SubprocessError) as e:
+                self.logger.warning(f"Could not restore {name} (PID {pid}) of instance {instance_num}: {e}")
+        self.throttled.clear()
+
+    def _pause(self, pid: int) -> None:
+        """Stop a helper; a stopped process has no priority to restore."""
+        self._signal(pid, signal.SIGSTOP)
+
+    @staticmethod
+    def _signal(pid: int, sig: signal.Signals) -> None:
+        """Send a signal to a process, on the host when running in a Flatpak."""
+        if Utils.is_flatpak():
+            Utils.flatpak_spawn_host(["kill", f"-{sig.name[3:]}", str(pid)], capture_output=True, check=True)
+        else:
+            os.kill(pid, sig)
+
+    def _renice(self, pid: int) -> Optional[int]:
+        """Give a helper the lowest CPU and I/O priority and return its previous nice value, if known."""
+        original_nice = None
+        if Utils.is_flatpak():
+            Utils.flatpak_spawn_host(["renice", "-n", str(BACKGROUND_NICE), "-p", str(pid)], capture_output=True)
+        else:
+            original_nice = os.getpriority(os.PRIO_PROCESS, pid)
+            os.setpriority(os.PRIO_PROCESS, pid, BACKGROUND_NICE)
+        if HostCapabilities.get().has_tool("ionice"):
+            Utils.flatpak_spawn_host(["ionice", "-c", "3", "-p", str(pid)], capture_output=True)
+        return original_nice
+
+    def _restore_priority(self, pid: int, original_nice: Optional[int]) -> None:
+        """Return a helper to the default I/O class and try to restore its CPU priority."""
+        if HostCapabilities.get().has_tool("ionice"):
+            Utils.flatpak_spawn_host(["ionice", "-c", "0", "-p", str(pid)], capture_output=True)
+        nice = original_nice or 0
+        if Utils.is_flatpak():
+            Utils.flatpak_spawn_host(["renice", "-n", str(nice), "-p", str(pid)], capture_output=True)
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, nice)
+        except PermissionError:
+            self.logger.info(f"PID {pid} keeps nice {BACKGROUND_NICE}; raising priority needs RLIMIT_NICE.")
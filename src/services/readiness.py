@@ -0,0 +1,59 @@
+"""
+Readiness probe module for the Twinverse application.
+
+This module provides the probes used by the launch scheduler to decide when a
+freshly spawned Steam instance has started far enough for the next one to be
+launched.
+"""
+
+from typing import FrozenSet, Iterable
+
+from src.core import Utils
+
+
+class ReadinessProbe:
+    """
+    Base probe that never reports readiness on its own.
+
+    Using it directly means the scheduler simply waits for the configured
+    timeout before moving on to the next instance.
+    """
+
+    description = "timeout"
+
+    def is_ready(self, pgid: int) -> bool:
+        """Return True once the instance in the given process group is ready."""
+        return False
+
+
+class ProcessStageProbe(ReadinessProbe):
+    """Reports readiness once a known process appears in the instance's process group."""
+
+    def __init__(self, description: str, process_names: Iterable[str]):
+        """Initialize the probe with the process names that mark the stage as reached."""
+        self.description = description
+        self.process_names: FrozenSet[str] = frozenset(process_names)
+
+    def is_ready(self, pgid: int) -> bool:
+        """Return True if any of the stage's processes is running in the group."""
+        return any(name in self.process_names for _, name in Utils.list_process_group(pgid))
+
+
+def get_readiness_probe(stage: str, use_gamescope: bool = True) -> ReadinessProbe:
+    """
+    Return the probe for a configured readiness stage.
+
+    Args:
+        stage (str): One of `READY_STAGES`.
+        use_gamescope (bool): Whether the instance runs inside Gamescope. Without
+            it there is no Gamescope window to wait for, so the Steam UI is used.
+
+    Returns:
+        ReadinessProbe: The probe to poll for the instance.
+    """
+    if stage == "gamescope_window" and use_gamescope:
+        # Gamescope starts its nested Xwayland once its window is up.
+        return ProcessStageProbe("gamescope window", ["Xwayland"])
+    if stage in ("gamescope_window", "steam_ui"):
+        return ProcessStageProbe("Steam UI", ["steamwebhelper"])
+    return ReadinessProbe()
@@ -0,0 +1,275 @@
+"""
+Resource sampler module for the Twinverse application.
+
+This module periodically measures the CPU, memory, I/O and thread usage of
+every launched instance by walking `/proc` and aggregating the processes of
+each instance's process group. Samples are available through a Python API and
+are exported as a Prometheus text file and a per-session CSV time series.
+"""
+
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core import Config, Logger, Utils
+from src.models import InstanceResourceSample
+
+# A sample of all instances should cost less than this, in seconds.
+SAMPLE_OVERHEAD_BUDGET = 0.05
+
+# How many per-session CSV files are kept in the output directory.
+CSV_KEEP_COUNT = 5
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+CSV_FIELDS = list(InstanceResourceSample.model_fields)
+
+PROMETHEUS_METRICS = [
+    ("processes", "gauge", "Processes in the instance's process group."),
+    ("threads", "gauge", "Threads in the instance's process group."),
+    ("cpu_percent", "gauge", "CPU usage since the previous sample (100 = one core)."),
+    ("rss_bytes", "gauge", "Resident set size of the instance's processes."),
+    ("pss_bytes", "gauge", "Proportional set size of the instance's processes."),
+    ("read_bytes", "counter", "Bytes read from storage by the instance's live processes."),
+    ("write_bytes", "counter", "Bytes written to storage by the instance's live processes."),
+]
+
+
+class _ProcStat:
+    """The fields of `/proc/<pid>/stat` used by the sampler."""
+
+    __slots__ = ("pid", "pgrp", "ticks", "threads", "start_time", "rss_pages")
+
+    def __init__(self, pid: int, line: str):
+        # The command name may contain spaces and parentheses, so split after the last ')'.
+        fields = line[line.rindex(")") + 2 :].split()
+        self.pid = pid
+        self.pgrp = int(fields[2])
+        self.ticks = int(fields[11]) + int(fields[12])
+        self.threads = int(fields[17])
+        self.start_time = int(fields[19])
+        self.rss_pages = int(fields[21])
+
+
+class ResourceSampler:
+    """
+    Samples the resource usage of instances keyed by their process group.
+
+    Natively, each sample is one pass over `/proc`. Inside a Flatpak, the host
+    processes are not visible in the sandbox's `/proc`, so their stat lines
+    are read with a single host command per sample; I/O and PSS are not
+    available there.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        get_pgids: Callable[[], Dict[int, int]],
+        interval: float = 2.0,
+        output_dir: Optional[Path] = None,
+        include_pss: bool = False,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            logger (Logger): The application logger.
+            get_pgids (Callable[[], Dict[int, int]]): Returns the current
+                mapping of instance numbers to process group IDs.
+            interval (float): Seconds between samples of the background thread.
+            output_dir (Optional[Path]): Where the Prometheus and CSV files are
+                written, `Config.LOG_DIR` by default.
+            include_pss (bool): Also read `smaps_rollup` for the PSS, which is
+                noticeably more expensive than the other fields.
+        """
+        self.logger = logger
+        self.get_pgids = get_pgids
+        self.interval = interval
+        self.output_dir = output_dir or Config.LOG_DIR
+        self.include_pss = include_pss
+        self.prometheus_path = self.output_dir / "instance_metrics.prom"
+        self.csv_path: Optional[Path] = None
+        self.last_sample_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._latest: Dict[int, InstanceResourceSample] = {}
+        self._previous_ticks: Dict[Tuple[int, int], int] = {}
+        self._previous_time: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in the background, with a new CSV file for the session."""
+        if self._thread and self._thread.is_alive():
+            return
+        self.csv_path = self.output_dir / f"instance_resources_{time.strftime('%Y%m%d-%H%M%S')}.csv"
+        self._remove_old_csvs()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Sampling instance resources every {self.interval}s (CSV: {self.csv_path})")
+
+    def stop(self) -> None:
+        """Stop the background sampling."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def latest(self) -> Dict[int, InstanceResourceSample]:
+        """Return the most recent sample of every instance."""
+        with self._lock:
+            return dict(self._latest)
+
+    def sample(self) -> Dict[int, InstanceResourceSample]:
+        """
+        Take one sample of every instance.
+
+        Returns:
+            Dict[int, InstanceResourceSample]: The sample of each instance with
+            at least one live process, keyed by instance number.
+        """
+        started = time.perf_counter()
+        now, monotonic_now = time.time(), time.monotonic()
+        pgids = self.get_pgids()
+        instance_by_pgid = {pgid: instance_num for instance_num, pgid in pgids.items()}
+
+        members: Dict[int, List[_ProcStat]] = {pgid: [] for pgid in instance_by_pgid}
+        for stat in self._read_stats():
+            if stat.pgrp in members:
+                members[stat.pgrp].append(stat)
+
+        elapsed = monotonic_now - self._previous_time if self._previous_time is not None else None
+        ticks: Dict[Tuple[int, int], int] = {}
+        samples: Dict[int, InstanceResourceSample] = {}
+        for pgid, stats in members.items():
+            if not stats:
+                continue
+            instance_num = instance_by_pgid[pgid]
+            sample = InstanceResourceSample(instance_num=instance_num, pgid=pgid, timestamp=now)
+            delta_ticks = 0
+            for stat in stats:
+                key = (stat.pid, stat.start_time)
+                ticks[key] = stat.ticks
+                delta_ticks += stat.ticks - self._previous_ticks.get(key, 0)
+                sample.processes += 1
+                sample.threads += stat.threads
+                sample.rss_bytes += stat.rss_pages * PAGE_SIZE
+            if elapsed:
+                sample.cpu_percent = round(delta_ticks / CLOCK_TICKS / elapsed * 100, 1)
+            if not Utils.is_flatpak():
+                self._add_native_details(sample, stats)
+            samples[instance_num] = sample
+
+        self._previous_ticks = ticks
+        self._previous_time = monotonic_now
+        with self._lock:
+            self._latest = samples
+        self.last_sample_seconds = time.perf_counter() - started
+        return samples
+
+    def _read_stats(self) -> List[_ProcStat]:
+        """Read the stat line of every process on the host."""
+        stats: List[_ProcStat] = []
+        if Utils.is_flatpak():
+            result = Utils.flatpak_spawn_host(
+                ["sh", "-c", "cat /proc/[0-9]*/stat 2>/dev/null"], capture_output=True, text=True, check=False
+            )
+            for line in (result.stdout or "").splitlines():
+                try:
+                    stats.append(_ProcStat(int(line.split(" ", 1)[0]), line))
+                except (ValueError, IndexError):
+                    continue
+            return stats
+
+        for entry in os.scandir("/proc"):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry.name}/stat", "r") as f:
+                    stats.append(_ProcStat(int(entry.name), f.read()))
+            except (OSError, ValueError, IndexError):
+                continue
+        return stats
+
+    def _add_native_details(self, sample: InstanceResourceSample, stats: List[_ProcStat]) -> None:
+        """Add the I/O counters and, if enabled, the PSS of a group's processes."""
+        for stat in stats:
+            try:
+                with open(f"/proc/{stat.pid}/io", "r") as f:
+                    for line in f:
+                        key, _, value = line.partition(":")
+                        if key in ("read_bytes", "write_bytes"):
+                            setattr(sample, key, (getattr(sample, key) or 0) + int(value))
+            except (OSError, ValueError):
+                pass
+
+            if not self.include_pss:
+                continue
+            try:
+                with open(f"/proc/{stat.pid}/smaps_rollup", "r") as f:
+                    for line in f:
+                        if line.startswith("Pss:"):
+                            sample.pss_bytes = (sample.pss_bytes or 0) + int(line.split()[1]) * 1024
+                            break
+            except (OSError, ValueError):
+                pass
+
+    def _run(self) -> None:
+        """Sample and export until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                samples = self.sample()
+                if self.last_sample_seconds > SAMPLE_OVERHEAD_BUDGET:
+                    self.logger.warning(
+                        f"Resource sample took {self.last_sample_seconds * 1000:.1f}ms "
+                        f"(budget {SAMPLE_OVERHEAD_BUDGET * 1000:.0f}ms)."
+                    )
+                self.write_prometheus(samples)
+                self.append_csv(samples)
+            except Exception as e:
+                self.logger.error(f"Resource sampling failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def write_prometheus(self, samples: Dict[int, InstanceResourceSample]) -> None:
+        """Atomically replace the Prometheus text file with the given samples."""
+        lines: List[str] = []
+        for field, metric_type, help_text in PROMETHEUS_METRICS:
+            name = f"twinverse_instance_{field}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for instance_num, sample in sorted(samples.items()):
+                value = getattr(sample, field)
+                if value is not None:
+                    lines.append(f'{name}{{instance="{instance_num}",pgid="{sample.pgid}"}} {value}')
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.prometheus_path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.prometheus_path)
+
+    def _remove_old_csvs(self) -> None:
+        """Delete the oldest session CSV files, so the new one brings them to `CSV_KEEP_COUNT`."""
+        old_csvs = sorted(p for p in self.output_dir.glob("instance_resources_*.csv") if p != self.csv_path)
+        for path in old_csvs[: max(len(old_csvs) - (CSV_KEEP_COUNT - 1), 0)]:
+            try:
+                path.unlink()
+            except OSError as e:
+                self.logger.warning(f"Could not remove old resource CSV {path}: {e}")
+
+    def append_csv(self, samples: Dict[int, InstanceResourceSample]) -> None:
+        """Append the given samples to the session's CSV time series."""
+        if self.csv_path is None or not samples:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_header = not self.csv_path.exists()
+        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            if write_header:
+                writer.writeheader()
+            for _, sample in sorted(samples.items()):
+                writer.writerow(sample.model_dump())
@@ -0,0 +1,167 @@
+"""
+Session preparation module for the Twinverse application.
+
+This module fingerprints the inputs of a launch session (the profile, input
+devices, monitors and host Steam library) so that a session prepared ahead
+of time can be checked cheaply for staleness when the user presses Play.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from src.models import LaunchPlan, Profile
+
+HOST_STEAM_PATH = Path.home() / ".local/share/Steam"
+DRM_PATH = Path("/sys/class/drm")
+INPUT_PATH = "/dev/input"
+SYS_INPUT_PATH = "/sys/class/input"
+
+
+def _digest(*parts: object) -> str:
+    """Hash the string form of several values into a short key."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _profile_key(profile: Profile, instance_nums: List[int]) -> str:
+    """Key the profile settings, the selected instances and whether a player uses the virtual joystick."""
+    # The selection is keyed through `instance_nums`; saving it must not invalidate the plan.
+    return _digest(
+        profile.model_dump_json(by_alias=True, exclude={"selected_players"}),
+        instance_nums,
+        profile.needs_virtual_joystick(),
+    )
+
+
+def _virtual_joystick_nodes(
+    virtual_joystick_path: Optional[str], input_path: str = INPUT_PATH, sys_input_path: str = SYS_INPUT_PATH
+) -> Set[str]:
+    """Return the event node of the virtual joystick and the other nodes (such as jsN) of the same device."""
+    if not virtual_joystick_path:
+        return set()
+    nodes = {virtual_joystick_path}
+    try:
+        with os.scandir(os.path.join(sys_input_path, os.path.basename(virtual_joystick_path), "device")) as it:
+            nodes.update(os.path.join(input_path, e.name) for e in it if e.name.startswith(("event", "js")))
+    except OSError:
+        pass
+    return nodes
+
+
+def _devices_key(ignored: Set[str] = frozenset(), input_path: str = INPUT_PATH) -> str:
+    """Key the input devices by their names and stable by-id links, leaving out the `ignored` nodes."""
+    entries = []
+    for directory in (input_path, os.path.join(input_path, "by-id")):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    target = os.readlink(entry.path) if entry.is_symlink() else None
+                    node = os.path.normpath(os.path.join(directory, target)) if target else entry.path
+                    if node in ignored:
+                        continue
+                    entries.append((entry.path, target))
+        except OSError:
+            continue
+    entries.append(("/dev/uinput", os.path.exists("/dev/uinput")))
+    return _digest(sorted(entries, key=str))
+
+
+def _monitors_key() -> Optional[str]:
+    """Key the connected outputs and their modes, or None if DRM is not visible."""
+    entries = []
+    try:
+        with os.scandir(DRM_PATH) as it:
+            connectors = sorted(entry.path for entry in it if "-" in entry.name)
+    except OSError:
+        return None
+    for connector in connectors:
+        for attribute in ("status", "modes"):
+            try:
+                with open(os.path.join(connector, attribute), "r", encoding="utf-8") as f:
+                    entries.append((connector, attribute, f.read()))
+            except OSError:
+                continue
+    return _digest(entries) if entries else None
+
+
+def _host_steam_key(host_steam_path: Path = HOST_STEAM_PATH) -> str:
+    """Key the host library directories and app manifests by their mtimes and sizes."""
+    entries = []
+    for rel in ("steamapps", "steamapps/common", "steamapps/compatdata", "steamapps/shadercache"):
+        entries.append((rel, _mtime(host_steam_path / rel)))
+    entries.append(("compatibilitytools.d", _mtime(host_steam_path / "compatibilitytools.d")))
+    try:
+        with os.scandir(host_steam_path / "steamapps") as it:
+            for entry in it:
+                if entry.name.startswith("appmanifest_"):
+                    st = entry.stat()
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
+    return _digest(sorted(entries, key=str))
+
+
+def _mtime(path: Path) -> Optional[int]:
+    """Return the mtime of a path in nanoseconds, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_session_keys(
+    profile: Profile, instance_nums: List[int], virtual_joystick_path: Optional[str]
+) -> Dict[str, Optional[str]]:
+    """
+    Fingerprint the inputs a launch session is built from.
+
+    Only directory listings, symlinks, small sysfs files and mtimes are read,
+    so computing the keys is cheap enough to do on every launch. The
+    virtual joystick is only created at launch, and the plan only depends on
+    whether a player uses it, so its nodes at `virtual_joystick_path` are
+    not part of the devices key.
+
+    Returns:
+        Dict[str, Optional[str]]: The "profile", "devices", "monitors" and
+        "host_steam" keys. A None key cannot be checked and is always stale.
+    """
+    return {
+        "profile": _profile_key(profile, instance_nums),
+        "devices": _devices_key(_virtual_joystick_nodes(virtual_joystick_path)),
+        # Without Gamescope the plan does not depend on the monitors.
+        "monitors": _monitors_key() if profile.use_gamescope else "",
+        "host_steam": _host_steam_key(),
+    }
+
+
+class PreparedSession:
+    """
+    A launch session prepared ahead of time.
+
+    Attributes:
+        profile (Profile): The profile the plan was built from.
+        plan (LaunchPlan): The resolved launch plan.
+        keys (Dict[str, Optional[str]]): The input keys the plan was built from.
+        homes (Set[str]): The homes prepared ahead of time.
+        homes_key (Optional[str]): The host library key the homes were
+            prepared against, or None if they were not prepared.
+    """
+
+    def __init__(self, profile: Profile, plan: LaunchPlan, keys: Dict[str, Optional[str]]):
+        """Initialize the prepared session from its plan and input keys."""
+        self.profile = profile
+        self.plan = plan
+        self.keys = keys
+        self.homes: Set[str] = set()
+        self.homes_key: Optional[str] = None
+
+    def stale_parts(self, keys: Dict[str, Optional[str]]) -> List[str]:
+        """Return the names of the inputs that changed since the session was prepared."""
+        return [name for name, key in keys.items() if key is None or self.keys.get(name) != key]
+
+    def homes_ready(self, home_paths: List[str]) -> bool:
+        """Check whether the given homes were prepared against the host library the keys describe."""
+        return (
+            self.homes_key is not None and self.homes_key == self.keys["host_steam"] and set(home_paths) <= self.homes
+        )
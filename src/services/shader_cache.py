@@ -0,0 +1,54 @@
+"""
+Shader cache report module for the Twinverse application.
+
+This module reports how well the shader cache served each instance, from the
+statistics Mesa prints on exit when `MESA_SHADER_CACHE_SHOW_STATS` is set, and
+how much shader cache each instance keeps in its own home.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+MESA_STATS_PATTERN = re.compile(r"shader cache.*?hits\s*=\s*(\d+).*?misses\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def parse_shader_cache_stats(lines: Iterable[str]) -> Dict[str, Optional[float]]:
+    """
+    Sum the Mesa shader cache statistics found in an instance's output.
+
+    Every Vulkan or OpenGL process prints its own line, so the hits and
+    misses of all the instance's processes are added up.
+
+    Returns:
+        Dict[str, Optional[float]]: "hits", "misses", "processes" and
+        "hit_rate" (None when no process reported any lookup).
+    """
+    hits = misses = processes = 0
+    for line in lines:
+        match = MESA_STATS_PATTERN.search(line)
+        if match:
+            hits += int(match.group(1))
+            misses += int(match.group(2))
+            processes += 1
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "processes": processes,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+    }
+
+
+def get_cache_size(home_path: Path) -> int:
+    """Return the size in bytes of the shader cache stored in an instance home."""
+    total = 0
+    cache_path = home_path / ".local/share/Steam/steamapps/shadercache"
+    for dirpath, _, filenames in os.walk(cache_path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                continue
+    return total
@@ -0,0 +1,127 @@
+"""
+Instance supervisor module for the Twinverse application.
+
+This module provides an event-driven watcher that notices when a launched
+Steam instance exits on its own, without polling the processes.
+"""
+
+import os
+import select
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core import Logger
+
+ExitCallback = Callable[[int, subprocess.Popen, float], None]
+
+
+class InstanceSupervisor:
+    """
+    Watches launched instance processes and reports their exit.
+
+    Each process is tracked through a pidfd registered with a single epoll
+    loop running in a background thread. On kernels or Python builds without
+    `os.pidfd_open`, a blocking `wait()` thread per process is used instead.
+    """
+
+    def __init__(self, logger: Logger, on_exit: ExitCallback):
+        """
+        Initialize the supervisor.
+
+        Args:
+            logger (Logger): The application logger.
+            on_exit (ExitCallback): Called from the supervisor thread with the
+                instance number, its process and its runtime in seconds once a
+                watched process has exited and been reaped.
+        """
+        self.logger = logger
+        self.on_exit = on_exit
+        self._lock = threading.Lock()
+        self._watched: Dict[int, Tuple[int, subprocess.Popen, float]] = {}
+        self._epoll: Optional[select.epoll] = None
+        self._wake_fds: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, instance_num: int, process: subprocess.Popen) -> None:
+        """Start watching the process of a freshly launched instance."""
+        started_at = time.monotonic()
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError) as e:
+            self.logger.warning(f"pidfd unavailable for instance {instance_num} ({e}), using a wait thread.")
+            threading.Thread(target=self._wait_for_exit, args=(instance_num, process, started_at), daemon=True).start()
+            return
+
+        with self._lock:
+            self._ensure_loop()
+            self._watched[pidfd] = (instance_num, process, started_at)
+            assert self._epoll is not None
+            self._epoll.register(pidfd, select.EPOLLIN)
+
+    def stop(self) -> None:
+        """Stop the epoll loop and release all watched pidfds."""
+        with self._lock:
+            if not self._thread or not self._wake_fds:
+                return
+            os.write(self._wake_fds[1], b"\0")
+            thread = self._thread
+        thread.join(timeout=2)
+
+    def _ensure_loop(self) -> None:
+        """Create the epoll instance and its thread on first use."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._epoll = select.epoll()
+        self._wake_fds = os.pipe()
+        self._epoll.register(self._wake_fds[0], select.EPOLLIN)
+        self._thread = threading.Thread(target=self._run, name="InstanceSupervisor", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Dispatch exit events until the supervisor is stopped."""
+        assert self._epoll is not None and self._wake_fds is not None
+        epoll, wake_fd = self._epoll, self._wake_fds[0]
+        running = True
+        while running:
+            try:
+                events = epoll.poll()
+            except InterruptedError:
+                continue
+            for fd, _ in events:
+                if fd == wake_fd:
+                    running = False
+                    continue
+                with self._lock:
+                    entry = self._watched.pop(fd, None)
+                    epoll.unregister(fd)
+                os.close(fd)
+                if entry:
+                    self._report_exit(*entry)
+
+        with self._lock:
+            for fd in self._watched:
+                os.close(fd)
+            self._watched.clear()
+            epoll.close()
+            os.close(self._wake_fds[0])
+            os.close(self._wake_fds[1])
+            self._epoll = None
+            self._wake_fds = None
+            self._thread = None
+
+    def _wait_for_exit(self, instance_num: int, process: subprocess.Popen, started_at: float) -> None:
+        """Fallback watcher that blocks on a single process."""
+        process.wait()
+        self._report_exit(instance_num, process, started_at)
+
+    def _report_exit(self, instance_num: int, process: subprocess.Popen, started_at: float) -> None:
+        """Reap an exited process and hand it to the exit callback."""
+        # The pidfd only signals the exit; wait() reaps it and sets the return code.
+        process.wait()
+        runtime = time.monotonic() - started_at
+        try:
+            self.on_exit(instance_num, process, runtime)
+        except Exception as e:
+            self.logger.error(f"Error while handling exit of instance {instance_num}: {e}")
@@ -7,10 +7,6 @@ particularly virtual joysticks for use with Steam instances.
 
 import time
 
-from evdev import AbsInfo, InputDevice, UInput
-from evdev import ecodes as e
-from evdev import list_devices
-
 from src.core import VirtualDeviceError
 
 
@@ -24,6 +20,11 @@ class VirtualDeviceService:
 
     def create_virtual_joystick(self):
         """Create a minimal virtual joystick and find its event node."""
+        # evdev is only needed when a virtual joystick is; it is not loaded at startup.
+        from evdev import AbsInfo, InputDevice, UInput
+        from evdev import ecodes as e
+        from evdev import list_devices
+
         if self._ui:
             self._logger.warning("Virtual joystick already exists.")
             # If it exists, we assume the devnode is also known and correct
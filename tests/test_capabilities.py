@@ -0,0 +1,78 @@
+"""Testes do cache da sondagem de capacidades do host."""
+
+import os
+
+from src.core import Config, HostCapabilities
+
+
+def _fake_gamescope(directory, version):
+    """Cria um gamescope falso que conta suas execuções e informa a versão dada."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "gamescope"
+    path.write_text(
+        "#!/bin/sh\n"
+        f'echo run >> "{directory}/runs"\n'
+        f'[ "$1" = --version ] && echo "gamescope version {version}" || echo "  --fsr-upscaling  --backend"\n'
+    )
+    path.chmod(0o755)
+    return path
+
+
+def _runs(directory):
+    """Retorna quantas vezes o gamescope falso de um diretório foi executado."""
+    runs = directory / "runs"
+    return len(runs.read_text().splitlines()) if runs.exists() else 0
+
+
+def _probe(monkeypatch, path_dirs):
+    """Sonda o host com apenas o gamescope nos diretórios dados no PATH."""
+    monkeypatch.setenv("PATH", os.pathsep.join(str(d) for d in path_dirs))
+    monkeypatch.setattr(HostCapabilities, "_shared", None)
+    return HostCapabilities.get()
+
+
+def test_gamescope_probe_is_cached_by_path_and_mtime(tmp_path, monkeypatch):
+    """Testa se a versão do Gamescope vem do cache até o binário mudar de mtime ou de caminho."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path / "local")
+    monkeypatch.setattr(HostCapabilities, "TOOLS", ["gamescope"])
+    first_dir, second_dir = tmp_path / "bin1", tmp_path / "bin2"
+    gamescope = _fake_gamescope(first_dir, "3.14.1")
+
+    capabilities = _probe(monkeypatch, [first_dir])
+    assert capabilities.gamescope_version == "3.14.1"
+    assert capabilities.gamescope_supports("--fsr-upscaling")
+    assert not capabilities.gamescope_supports("--hdr-enabled")
+    assert capabilities.tool_path("gamescope") == str(gamescope)
+    assert HostCapabilities.get_cache_path().exists()
+    assert _runs(first_dir) == 2
+
+    # Mesmo binário: a versão e as opções vêm do cache.
+    assert _probe(monkeypatch, [first_dir]).gamescope_version == "3.14.1"
+    assert _runs(first_dir) == 2
+
+    # Binário atualizado no mesmo caminho.
+    _fake_gamescope(first_dir, "3.15.0")
+    os.utime(gamescope, (gamescope.stat().st_atime, gamescope.stat().st_mtime + 10))
+    assert _probe(monkeypatch, [first_dir]).gamescope_version == "3.15.0"
+    assert _runs(first_dir) == 4
+
+    # Outro gamescope na frente do PATH.
+    _fake_gamescope(second_dir, "3.16.0")
+    assert _probe(monkeypatch, [second_dir, first_dir]).gamescope_version == "3.16.0"
+    assert _runs(second_dir) == 2
+
+
+def test_shared_probe_and_invalidate(tmp_path, monkeypatch):
+    """Testa se a sondagem é compartilhada até ser invalidada, e se some ferramentas ausentes."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path / "local")
+    monkeypatch.setattr(HostCapabilities, "TOOLS", ["gamescope"])
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    monkeypatch.setattr(HostCapabilities, "_shared", None)
+
+    capabilities = HostCapabilities.get()
+    assert HostCapabilities.get() is capabilities
+    assert not capabilities.has_tool("gamescope")
+    assert capabilities.gamescope_version is None
+
+    HostCapabilities.invalidate()
+    assert HostCapabilities.get() is not capabilities
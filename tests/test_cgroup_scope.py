@@ -0,0 +1,40 @@
+"""Testes das propriedades e do comando dos escopos cgroup das instâncias."""
+
+from src.core import Logger
+from src.models import PlayerInstanceConfig, Profile
+from src.services.cgroup_scope import UNIT_PREFIX, CgroupScopes
+from src.services.instance import InstanceService
+
+
+def test_get_properties():
+    """Testa se apenas os limites definidos pelo jogador viram propriedades do systemd."""
+    assert CgroupScopes.get_properties(PlayerInstanceConfig()) == {}
+    config = PlayerInstanceConfig(CPU_WEIGHT=200, MEMORY_HIGH="4G", IO_WEIGHT=50)
+    assert CgroupScopes.get_properties(config) == {"CPUWeight": "200", "MemoryHigh": "4G", "IOWeight": "50"}
+
+
+def test_wrap_command(tmp_path):
+    """Testa se o comando é executado dentro de um escopo com nome único e as propriedades dadas."""
+    command, unit = CgroupScopes(Logger("test", tmp_path)).wrap_command(2, ["gamescope", "--"], {"CPUWeight": "200"})
+    assert unit.startswith(f"{UNIT_PREFIX}-2-") and unit.endswith(".scope")
+    assert command == [
+        "systemd-run",
+        "--user",
+        "--scope",
+        "--quiet",
+        "--collect",
+        f"--unit={unit}",
+        "--property=CPUWeight=200",
+        "gamescope",
+        "--",
+    ]
+
+
+def test_scope_only_with_limits(tmp_path):
+    """Testa se a instância só é colocada em um escopo quando o jogador define algum limite."""
+    service = InstanceService(Logger("test", tmp_path))
+    profile = Profile(PLAYERS=[{}, {"CPU_WEIGHT": 300}])
+    assert service._resolve_cgroup_properties(profile, 0) is None
+    assert service._resolve_cgroup_properties(profile, 1) == {"CPUWeight": "300"}
+    profile.use_cgroup_scopes = False
+    assert service._resolve_cgroup_properties(profile, 1) is None
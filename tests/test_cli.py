@@ -0,0 +1,56 @@
+"""Testes da interface de linha de comando sem GUI."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_cli_does_not_import_gtk():
+    """Testa se importar a CLI não carrega GTK nem Adwaita."""
+    code = (
+        "import sys, src.cli; print(sorted(m for m in ('gi.repository.Gtk', 'gi.repository.Adw') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_status_without_session(tmp_path, monkeypatch, capsys):
+    """Testa se o status informa que não há sessão quando nenhuma foi iniciada."""
+    from src.cli import main
+    from src.core import Config
+
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    monkeypatch.setattr(Config, "LOG_DIR", tmp_path / "logs")
+    assert main(["status", "--json"]) == 0
+    assert '"running": false' in capsys.readouterr().out
+
+
+def test_launch_records_session_while_launching(tmp_path, monkeypatch):
+    """Testa se a sessão é registrada antes do lançamento e atualizada com os PGIDs depois dele."""
+    import signal
+
+    from src import cli
+    from src.core import Config
+    from src.services.instance import InstanceService
+
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    monkeypatch.setattr(Config, "LOG_DIR", tmp_path / "logs")
+    monkeypatch.setattr(signal, "signal", lambda signum, handler: None)
+    sessions = []
+
+    def launch_instances(self, profile, instance_nums, cancel_event=None):
+        sessions.append(cli.read_session())
+        self.pgids[0] = 4242
+        return {}
+
+    monkeypatch.setattr(InstanceService, "launch_instances", launch_instances)
+    monkeypatch.setattr(InstanceService, "terminate_all", lambda self: sessions.append(cli.read_session()))
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text("{}", encoding="utf-8")
+
+    assert cli.main(["--profile", str(profile_path), "launch", "--players", "1", "--no-kde"]) == 0
+    assert [session["instances"] for session in sessions] == [{}, {"0": 4242}]
+    assert sessions[0]["started"] == sessions[1]["started"]
+    assert not cli.get_session_path().exists()
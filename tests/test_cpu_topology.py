@@ -0,0 +1,37 @@
+"""Testes da leitura de topologia e divisão de CPUs por instância."""
+
+from src.services.cpu_topology import CpuTopology, format_cpu_list, parse_cpu_list
+
+
+def _write_sysfs(root, ccds=2, cores_per_ccd=4):
+    """Cria uma árvore sysfs falsa com CCDs, núcleos e irmãos SMT."""
+    num_cores = ccds * cores_per_ccd
+    (root / "online").write_text(f"0-{num_cores * 2 - 1}\n")
+    for cpu in range(num_cores * 2):
+        core = cpu % num_cores
+        ccd = core // cores_per_ccd
+        first, last = ccd * cores_per_ccd, (ccd + 1) * cores_per_ccd - 1
+        cpu_path = root / f"cpu{cpu}"
+        (cpu_path / "topology").mkdir(parents=True)
+        (cpu_path / "topology/thread_siblings_list").write_text(f"{core},{core + num_cores}\n")
+        l3 = cpu_path / "cache/index3"
+        l3.mkdir(parents=True)
+        (l3 / "level").write_text("3\n")
+        (l3 / "shared_cpu_list").write_text(f"{first}-{last},{first + num_cores}-{last + num_cores}\n")
+
+
+def test_cpu_list_round_trip():
+    """Testa a conversão entre listas de CPUs do kernel e listas de inteiros."""
+    assert parse_cpu_list("0-3,8,10-11") == [0, 1, 2, 3, 8, 10, 11]
+    assert format_cpu_list([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+
+
+def test_split_respects_ccd_and_smt(tmp_path):
+    """Testa se a divisão automática respeita os CCDs e mantém os irmãos SMT juntos."""
+    _write_sysfs(tmp_path)
+    topology = CpuTopology.read(tmp_path)
+
+    assert len(topology.domains) == 2
+    assert [format_cpu_list(g) for g in topology.split(2)] == ["0-3,8-11", "4-7,12-15"]
+    assert [format_cpu_list(g) for g in topology.split(4)] == ["0-1,8-9", "2-3,10-11", "4-5,12-13", "6-7,14-15"]
+    assert all(len(group) == 2 for group in topology.split(8))
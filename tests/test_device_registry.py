@@ -0,0 +1,63 @@
+"""Testes do registro de dispositivos de entrada e dos eventos de hotplug."""
+
+import os
+import threading
+
+from src.services.device_registry import DeviceRegistry, scan_input_devices
+
+
+def _plug(by_id, name, event):
+    """Cria um link falso de /dev/input/by-id apontando para um nó de evento."""
+    os.symlink(f"../{event}", by_id / name)
+
+
+def test_scan_input_devices(tmp_path):
+    """Testa a classificação dos links por tipo, ignorando os que não são de evento."""
+    by_id = tmp_path / "by-id"
+    by_id.mkdir()
+    _plug(by_id, "usb-Sony_Wireless_Controller-event-joystick", "event5")
+    _plug(by_id, "usb-Logitech_USB_Receiver-if01-event-mouse", "event3")
+    _plug(by_id, "usb-Sony_Wireless_Controller-joystick", "js0")
+
+    devices = scan_input_devices(str(by_id))
+
+    assert {d["type"] for d in devices.values()} == {"joystick", "mouse"}
+    joystick = devices[str(by_id / "usb-Sony_Wireless_Controller-event-joystick")]
+    assert joystick["name"] == "Sony Wireless Controller"
+    assert joystick["event"] == str(tmp_path / "event5")
+    assert scan_input_devices(str(tmp_path / "missing")) == {}
+
+
+def test_registry_pushes_hotplug_events(tmp_path):
+    """Testa se os assinantes recebem a adição e a remoção de um controle."""
+    by_id = tmp_path / "by-id"
+    registry = DeviceRegistry(str(by_id), poll_interval=0.1)
+    events = []
+    received = threading.Event()
+
+    def listener(action, device_type, device):
+        events.append((action, device_type, device["id"]))
+        received.set()
+
+    registry.subscribe(listener)
+    registry.start()
+    try:
+        # O diretório by-id só existe enquanto houver algum dispositivo.
+        by_id.mkdir()
+        _plug(by_id, "usb-Pad-event-joystick", "event7")
+        assert received.wait(5)
+        assert registry.get_input_devices()["joystick"] == [
+            {"id": str(by_id / "usb-Pad-event-joystick"), "name": "Pad"}
+        ]
+
+        received.clear()
+        os.unlink(by_id / "usb-Pad-event-joystick")
+        assert received.wait(5)
+    finally:
+        registry.stop()
+
+    assert events == [
+        ("added", "joystick", str(by_id / "usb-Pad-event-joystick")),
+        ("removed", "joystick", str(by_id / "usb-Pad-event-joystick")),
+    ]
+    assert registry.find(str(by_id / "usb-Pad-event-joystick")) is None
@@ -0,0 +1,58 @@
+"""Testes da deduplicação de arquivos idênticos entre as homes das instâncias."""
+
+import fcntl
+import json
+import shutil
+
+from src.core import Config, Logger, Utils
+from src.services.home_dedup import MIN_FILE_SIZE, HomeDeduplicator
+from src.services.home_provisioner import STEAM_DIR
+
+CONTENT = "x" * MIN_FILE_SIZE
+
+
+def _home(instance_num):
+    """Cria a home de uma instância com um arquivo do cliente Steam grande o bastante para deduplicar."""
+    home = Config.get_steam_home_path(instance_num)
+    (home / STEAM_DIR / "ubuntu12_32").mkdir(parents=True)
+    (home / STEAM_DIR / "ubuntu12_32/steamclient.so").write_text(CONTENT, encoding="utf-8")
+    return home
+
+
+def _no_reflink(*args):
+    raise OSError("reflinks are not supported")
+
+
+def _fake_reflink(src, dst):
+    """Simula um reflink: uma cópia independente que conta como dados compartilhados."""
+    shutil.copy2(src, dst)
+    return True
+
+
+def test_dedup_only_reflinks(tmp_path, monkeypatch):
+    """Testa se, sem reflink, nenhum arquivo é ligado a outro e nada é contado como recuperado."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    monkeypatch.setattr(fcntl, "ioctl", _no_reflink)
+    homes = [_home(0), _home(1)]
+
+    report = HomeDeduplicator(Logger("test", tmp_path)).run(homes)
+
+    assert (report["files"], report["deduplicated"], report["reclaimed_bytes"]) == (2, 0, 0)
+    inodes = {(home / STEAM_DIR / "ubuntu12_32/steamclient.so").stat().st_ino for home in homes}
+    assert len(inodes) == 2
+    assert not list((homes[1] / STEAM_DIR / "ubuntu12_32").glob(".*.dedup"))
+
+
+def test_dedup_index_keeps_other_homes(tmp_path, monkeypatch):
+    """Testa se uma execução sobre parte das homes mantém no índice as entradas das demais."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    monkeypatch.setattr(Utils, "clone_file", _fake_reflink)
+    homes = [_home(0), _home(1)]
+    deduplicator = HomeDeduplicator(Logger("test", tmp_path))
+
+    report = deduplicator.run(homes)
+    assert (report["deduplicated"], report["reclaimed_bytes"]) == (1, MIN_FILE_SIZE)
+    assert deduplicator.run(homes[:1])["hashed"] == 0
+
+    index = json.loads(deduplicator.index_path.read_text(encoding="utf-8"))
+    assert sorted(index) == [str(home / STEAM_DIR / "ubuntu12_32/steamclient.so") for home in homes]
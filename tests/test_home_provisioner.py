@@ -0,0 +1,58 @@
+"""Testes do provisionamento das homes das instâncias a partir de uma home modelo."""
+
+import fcntl
+import os
+
+from src.core import Config, Logger
+from src.services.home_provisioner import STEAM_DIR, HomeProvisioner
+
+
+def _bootstrapped_home(instance_num):
+    """Cria a home de uma instância com o cliente Steam instalado e dados de login."""
+    steam = Config.get_steam_home_path(instance_num) / STEAM_DIR
+    (steam / "ubuntu12_32/steam-runtime").mkdir(parents=True)
+    (steam / "ubuntu12_32/steamclient.so").write_text("client", encoding="utf-8")
+    (steam / "steam.sh").write_text("#!/bin/sh", encoding="utf-8")
+    (steam / "config").mkdir()
+    (steam / "config/loginusers.vdf").write_text("users", encoding="utf-8")
+    return steam
+
+
+def _no_reflink(*args):
+    raise OSError("reflinks are not supported")
+
+
+def test_provision_copies_without_reflinks(tmp_path, monkeypatch):
+    """Testa se, sem reflink, os arquivos são copiados e não compartilhados entre o modelo e as homes."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    monkeypatch.setattr(fcntl, "ioctl", _no_reflink)
+    _bootstrapped_home(0)
+    provisioner = HomeProvisioner(Logger("test", tmp_path))
+    provisioner.create_template(0)
+
+    stats = provisioner.provision(1)
+
+    assert stats == {"reflinked": 0, "copied": len("client#!/bin/sh")}
+    client = Config.get_steam_home_path(1) / STEAM_DIR / "ubuntu12_32/steamclient.so"
+    template_client = provisioner.template_path / STEAM_DIR / "ubuntu12_32/steamclient.so"
+    assert client.stat().st_ino != template_client.stat().st_ino
+    with open(client, "w", encoding="utf-8") as f:
+        f.write("updated")
+    assert template_client.read_text(encoding="utf-8") == "client"
+    assert not (Config.get_steam_home_path(1) / STEAM_DIR / "config/loginusers.vdf").exists()
+
+
+def test_provision_replaces_directory_with_symlink(tmp_path, monkeypatch):
+    """Testa se um link simbólico do modelo substitui um diretório existente na home."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    steam = _bootstrapped_home(0)
+    (steam / "ubuntu12_32/steam-runtime").rmdir()
+    os.symlink("/usr/lib/steam-runtime", steam / "ubuntu12_32/steam-runtime")
+    provisioner = HomeProvisioner(Logger("test", tmp_path))
+    provisioner.create_template(0)
+    target = _bootstrapped_home(1)
+    (target / "ubuntu12_32/steam-runtime/run.sh").write_text("old", encoding="utf-8")
+
+    provisioner.provision(1, force=True)
+
+    assert os.readlink(target / "ubuntu12_32/steam-runtime") == "/usr/lib/steam-runtime"
@@ -0,0 +1,72 @@
+"""Testes do canal persistente de comandos do host."""
+
+import subprocess
+import time
+
+import pytest
+
+from src.core import Utils, host_channel
+from src.core.host_channel import HostChannel, HostChannelError
+
+
+@pytest.fixture
+def channel():
+    """Inicia o auxiliar localmente, sem flatpak-spawn."""
+    channel = HostChannel(launcher=[])
+    yield channel
+    channel.close()
+
+
+def test_run(channel):
+    """Testa a execução de comandos com entrada, diretório de trabalho e código de saída."""
+    assert channel.run(["cat"], input=b"hello") == (0, b"hello", b"")
+    assert channel.run(["pwd"], cwd="/")[1] == b"/\n"
+    result = channel.run_completed(["sh", "-c", "echo out; exit 3"], capture_output=True, text=True)
+    assert (result.returncode, result.stdout) == (3, "out\n")
+
+
+def test_command_timeout_keeps_channel(channel):
+    """Testa se um comando que estoura o tempo é encerrado pelo auxiliar, que continua utilizável."""
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        channel.run(["sleep", "10"], timeout=0.2)
+    assert time.monotonic() - start < 5
+    assert channel.run(["true"])[0] == 0
+
+
+def test_hung_helper_is_restarted(monkeypatch):
+    """Testa se um auxiliar que não responde é morto e iniciado de novo após o prazo."""
+    monkeypatch.setattr(host_channel, "RESPONSE_GRACE", 0.1)
+    # O "auxiliar" falso ignora os argumentos do auxiliar real e nunca responde.
+    channel = HostChannel(launcher=["sh", "-c", "exec sleep 30", "fake-helper"])
+    hung = channel.process
+    try:
+        with pytest.raises(subprocess.TimeoutExpired):
+            channel.run(["true"], timeout=0.1)
+        assert hung.poll() is not None
+        assert channel.process is not hung and channel.process.poll() is None
+    finally:
+        channel.close()
+
+
+def test_fallback_only_before_sending(monkeypatch):
+    """Testa se o comando só é executado diretamente quando o pedido não chegou ao auxiliar."""
+    monkeypatch.setattr(Utils, "_is_flatpak", True)
+    spawned = []
+    monkeypatch.setattr(subprocess, "run", lambda command, **kwargs: spawned.append(command))
+
+    # O auxiliar falso lê o pedido e sai sem responder: o comando pode ter sido executado.
+    channel = HostChannel(launcher=["sh", "-c", "head -c 1 >/dev/null", "fake-helper"])
+    monkeypatch.setattr(HostChannel, "_shared", channel)
+    try:
+        with pytest.raises(HostChannelError) as error:
+            Utils.flatpak_spawn_host(["touch", "/tmp/once"], capture_output=True)
+        assert error.value.sent
+        assert spawned == []
+
+        # Ocupado: nada foi enviado, então o comando é executado diretamente.
+        with channel._lock:
+            Utils.flatpak_spawn_host(["true"], capture_output=True)
+        assert spawned == [["flatpak-spawn", "--host", "true"]]
+    finally:
+        channel.close()
@@ -0,0 +1,44 @@
+"""Testes de regressão do tempo de importação dos pacotes."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependências pesadas que só devem ser carregadas quando usadas.
+HEAVY_MODULES = {"gi", "pydbus", "evdev", "screeninfo"}
+
+
+def _import_times(statement):
+    """Executa uma importação com `-X importtime` e retorna o tempo cumulativo de cada módulo."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["src", "src.core", "src.services", "src.cli"])
+def test_packages_do_not_import_heavy_dependencies(module):
+    """Testa se importar os pacotes não carrega GTK, D-Bus, evdev nem screeninfo."""
+    times = _import_times(f"import {module}")
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_src_import_stays_light():
+    """Testa se `import src` continua barato, sem carregar serviços nem modelos."""
+    times = _import_times("import src")
+    assert "src.services" not in times
+    assert "src.models" not in times
@@ -0,0 +1,68 @@
+"""Testes do construtor do plano de lançamento compartilhado pelas instâncias."""
+
+from src.core import Logger
+from src.models import VIRTUAL_JOYSTICK_PLACEHOLDER, HostSteamScan, Profile
+from src.services.cmd_builder import CommandBuilder
+from src.services.instance import InstanceService
+
+
+def _service(tmp_path, monkeypatch):
+    """Cria um serviço que conta as verificações de dependências e as varreduras do Steam do host."""
+    service = InstanceService(Logger("test", tmp_path))
+    calls = {"dependencies": 0, "host_scan": 0}
+
+    def validate_dependencies(use_gamescope=True):
+        calls["dependencies"] += 1
+
+    def scan_host_steam(list_folders=True):
+        calls["host_scan"] += 1
+        return HostSteamScan(has_common=True, common_dirs=["Game"])
+
+    monkeypatch.setattr(service, "validate_dependencies", validate_dependencies)
+    monkeypatch.setattr(CommandBuilder, "scan_host_steam", staticmethod(scan_host_steam))
+    return service, calls
+
+
+def test_plan_is_resolved_once_for_all_instances(tmp_path, monkeypatch):
+    """Testa se dependências e varredura do host são resolvidas uma vez e compartilhadas pelas instâncias."""
+    service, calls = _service(tmp_path, monkeypatch)
+    plan = service.build_launch_plan(Profile(use_gamescope=False), [2, 0, 1])
+
+    assert calls == {"dependencies": 1, "host_scan": 1}
+    assert [instance.instance_num for instance in plan.instances] == [2, 0, 1]
+    assert set(plan.timings) == {"dependencies", "monitors", "host_scan", "cpu_topology", "instances"}
+    assert plan.monitors == []
+    for instance in plan.instances:
+        assert instance.command[0] == "bwrap"
+        assert instance.home_path in instance.command
+        assert any(arg.endswith("steamapps/common/Game") for arg in instance.command)
+
+    # Sem joysticks físicos, o caminho do joystick virtual só é preenchido ao iniciar cada instância.
+    assert plan.virtual_joystick_path == VIRTUAL_JOYSTICK_PLACEHOLDER
+    assert all(VIRTUAL_JOYSTICK_PLACEHOLDER in instance.command for instance in plan.instances)
+
+
+def test_known_inputs_are_reused(tmp_path, monkeypatch):
+    """Testa se monitores e varredura do host já conhecidos são reaproveitados sem nova consulta."""
+    service, calls = _service(tmp_path, monkeypatch)
+    host_scan = HostSteamScan(has_common=True, common_dirs=["Other"])
+    plan = service.build_launch_plan(Profile(use_gamescope=False), [0], monitors=[], host_scan=host_scan)
+
+    assert calls["host_scan"] == 0
+    assert plan.host_scan == host_scan
+    assert any(arg.endswith("steamapps/common/Other") for arg in plan.instances[0].command)
+
+
+def test_per_player_settings(tmp_path, monkeypatch):
+    """Testa se joysticks físicos e conjuntos de CPUs de cada jogador vão para o plano da sua instância."""
+    service, _ = _service(tmp_path, monkeypatch)
+    profile = Profile(
+        use_gamescope=False,
+        PLAYERS=[{"PHYSICAL_DEVICE_ID": "/dev/null", "CPU_SET": "0-1"}, {"PHYSICAL_DEVICE_ID": "/dev/null"}],
+    )
+    plan = service.build_launch_plan(profile, [0, 1])
+
+    assert plan.virtual_joystick_path is None
+    assert all(VIRTUAL_JOYSTICK_PLACEHOLDER not in instance.command for instance in plan.instances)
+    assert plan.get_instance(0).cpu_set == "0-1"
+    assert plan.get_instance(1).cpu_set is None
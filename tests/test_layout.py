@@ -0,0 +1,53 @@
+"""Testes do cálculo de layout das instâncias em tela cheia e em tela dividida."""
+
+from src.models import Profile
+from src.services.kde_manager import KdeManager
+from src.services.layout import Rect, compute_cells, compute_rects, get_slot
+
+MONITORS = [
+    {"id": 1, "x": 2560, "y": 0, "width": 1920, "height": 1080},
+    {"id": 0, "x": 0, "y": 0, "width": 2560, "height": 1440},
+]
+
+
+def _splitscreen(num_players, orientation="horizontal", **splitscreen):
+    """Cria um perfil de tela dividida com o número de jogadores dado."""
+    return Profile(
+        MODE="splitscreen", SPLITSCREEN=dict(ORIENTATION=orientation, **splitscreen), PLAYERS=[{}] * num_players
+    )
+
+
+def test_default_layouts():
+    """Testa os layouts padrão de 3 jogadores e o preenchimento dos monitores em grupos de 4."""
+    horizontal = [tuple(cell)[1:] for cell in compute_cells(_splitscreen(3))]
+    assert horizontal == [(0, 0, 1, 0.5), (0, 0.5, 0.5, 0.5), (0.5, 0.5, 0.5, 0.5)]
+    vertical = [tuple(cell)[1:] for cell in compute_cells(_splitscreen(3, "vertical"))]
+    assert vertical == [(0, 0, 0.5, 1), (0.5, 0, 0.5, 0.5), (0.5, 0.5, 0.5, 0.5)]
+
+    rects = compute_rects(_splitscreen(5), MONITORS)
+    assert rects[0] == Rect(0, 0, 0, 1280, 720)
+    assert rects[4] == Rect(1, 2560, 0, 1920, 1080)
+    assert compute_rects(_splitscreen(9), MONITORS)[8] is None
+
+
+def test_grid_and_weights():
+    """Testa uma grade 3x2 com a primeira linha duas vezes maior, em monitores de tamanhos diferentes."""
+    rects = compute_rects(_splitscreen(8, GRID="3x2", SPLIT_WEIGHTS=[2, 1]), MONITORS)
+    assert [r.height for r in rects[:6]] == [960, 960, 960, 480, 480, 480]
+    assert sum(r.width for r in rects[:3]) == 2560
+    # Os dois jogadores restantes ocupam uma só linha do segundo monitor.
+    assert rects[6:] == (Rect(1, 2560, 0, 960, 1080), Rect(1, 3520, 0, 960, 1080))
+
+
+def test_slots_follow_selected_players():
+    """Testa se as instâncias selecionadas ocupam as células na ordem de lançamento."""
+    profile = _splitscreen(4).model_copy(update={"selected_players": [1, 3]})
+    assert [get_slot(profile, num) for num in (1, 3)] == [0, 1]
+    assert len(compute_cells(profile)) == 2
+
+
+def test_kwin_script_receives_layouts():
+    """Testa se o script do KWin recebe as células calculadas para cada número de janelas."""
+    script = KdeManager.__new__(KdeManager)._build_kwin_script(_splitscreen(2))
+    assert "const LAYOUTS = [[], [{" in script
+    assert '"width": 1.0, "height": 0.5}]]' in script
@@ -0,0 +1,81 @@
+"""Testes da captura da saída das instâncias em logs rotativos."""
+
+import os
+import time
+
+from src.core import Logger
+from src.models import InstanceLaunchPlan
+from src.services import log_capture
+from src.services.instance import InstanceService
+from src.services.log_capture import InstanceLogCapture, _CapturedStream
+
+
+def _wait_for(condition, timeout=5.0):
+    """Espera até que a condição seja verdadeira ou o tempo acabe."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_tail_and_log_file(tmp_path):
+    """Testa se as últimas linhas ficam em memória, incluindo a linha final sem quebra, e vão para o arquivo."""
+    capture = InstanceLogCapture(Logger("test", tmp_path), log_dir=tmp_path, tail_lines=2)
+    read_fd, write_fd = os.pipe()
+    capture.attach(0, os.fdopen(read_fd, "rb", buffering=0))
+    os.write(write_fd, "um\ndois\ntrês\nquatro".encode())
+    os.close(write_fd)
+
+    assert _wait_for(lambda: capture.get_tail(0) == ["três", "quatro"])
+    assert capture.get_tail(0, lines=1) == ["quatro"]
+    assert _wait_for(lambda: "quatro" in capture.get_log_path(0).read_text(encoding="utf-8"))
+
+
+def test_rotation(tmp_path):
+    """Testa se o log é rotacionado ao passar do tamanho máximo, mantendo só os backups configurados."""
+    capture = InstanceLogCapture(Logger("test", tmp_path), log_dir=tmp_path, max_bytes=8, backup_count=2)
+    for chunk in (b"aaaaaaaa", b"bbbbbbbb", b"cccccccc", b"dddddddd"):
+        capture._write(0, chunk)
+
+    path = capture.get_log_path(0)
+    assert path.read_bytes() == b"dddddddd"
+    assert path.with_name(f"{path.name}.1").read_bytes() == b"cccccccc"
+    assert path.with_name(f"{path.name}.2").read_bytes() == b"bbbbbbbb"
+    assert not path.with_name(f"{path.name}.3").exists()
+
+
+def test_drop_note_when_disk_is_slow(tmp_path, monkeypatch):
+    """Testa se a saída além do limite pendente é descartada e anotada no log, sem perder a cauda."""
+    monkeypatch.setattr(log_capture, "MAX_PENDING_BYTES", 10)
+    capture = InstanceLogCapture(Logger("test", tmp_path), log_dir=tmp_path)
+    captured = _CapturedStream(0, None, 10)
+    # Sem a thread de escrita, nada sai da fila.
+    capture._queue(captured, b"first\n")
+    capture._queue(captured, b"second\n")
+    assert list(captured.tail) == ["first", "second"]
+
+    capture._ensure_threads()
+    path = capture.get_log_path(0)
+
+    def content():
+        return path.read_text(encoding="utf-8") if path.exists() else ""
+
+    assert _wait_for(lambda: "7 bytes of output dropped" in content())
+    assert "first" in content() and "second" not in content()
+
+
+def test_instance_stopped_when_output_cannot_be_captured(tmp_path, monkeypatch):
+    """Testa se uma instância cuja saída não pode ser capturada é encerrada em vez de ficar bloqueada."""
+    service = InstanceService(Logger("test", tmp_path))
+
+    def fail_attach(instance_num, stream):
+        raise OSError("epoll register failed")
+
+    monkeypatch.setattr(service.log_capture, "attach", fail_attach)
+    plan = InstanceLaunchPlan(instance_num=0, home_path=str(tmp_path / "home_1"), command=["sleep", "30"])
+
+    assert not service._launch_single_instance(plan)
+    assert service.processes == {} and service.pgids == {}
+    assert not service.is_home_running(tmp_path / "home_1")
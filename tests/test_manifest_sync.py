@@ -0,0 +1,56 @@
+"""Testes da sincronização dos manifestos de apps entre o Steam do host e as homes isoladas."""
+
+import os
+
+from src.core import Logger
+from src.services.manifest_sync import ManifestSync
+
+
+def _setup(tmp_path):
+    """Cria a biblioteca do host, uma home isolada e o sincronizador."""
+    host = tmp_path / "host/steamapps"
+    host.mkdir(parents=True)
+    home = tmp_path / "home_1"
+    sync = ManifestSync(Logger("test", tmp_path), index_path=tmp_path / "index.json", host_steamapps=host)
+    return host, home, home / ".local/share/Steam/steamapps", sync
+
+
+def _changed(stats):
+    """Soma os manifestos copiados e os compartilhados por reflink."""
+    return stats["copied"] + stats["reflinked"]
+
+
+def test_add_update_and_remove(tmp_path):
+    """Testa se manifestos novos são copiados, os alterados atualizados e os desinstalados removidos."""
+    host, home, dest, sync = _setup(tmp_path)
+    (host / "appmanifest_10.acf").write_text("v1")
+    (host / "appmanifest_20.acf").write_text("game 20")
+
+    assert _changed(sync.sync([home])) == 2
+    assert (dest / "appmanifest_10.acf").read_text() == "v1"
+
+    stats = sync.sync([home])
+    assert _changed(stats) == 0 and stats["unchanged"] == 2
+
+    (host / "appmanifest_10.acf").write_text("version 2")
+    (host / "appmanifest_20.acf").unlink()
+    stats = sync.sync([home])
+    assert _changed(stats) == 1 and stats["removed"] == 1
+    assert (dest / "appmanifest_10.acf").read_text() == "version 2"
+    assert not (dest / "appmanifest_20.acf").exists()
+    assert sorted(os.listdir(dest)) == ["appmanifest_10.acf"]
+
+
+def test_update_does_not_write_through_hardlinks(tmp_path):
+    """Testa se atualizar um manifesto com hardlink troca o arquivo em vez de reescrever as cópias ligadas."""
+    host, home, dest, sync = _setup(tmp_path)
+    (host / "appmanifest_10.acf").write_text("v1")
+    sync.sync([home])
+
+    linked = tmp_path / "linked.acf"
+    os.link(dest / "appmanifest_10.acf", linked)
+    (host / "appmanifest_10.acf").write_text("version 2")
+    sync.sync([home])
+
+    assert (dest / "appmanifest_10.acf").read_text() == "version 2"
+    assert linked.read_text() == "v1"
@@ -0,0 +1,40 @@
+"""Testes da clonagem de prefixos do Proton para as homes das instâncias."""
+
+import fcntl
+
+from src.core import Config, Logger
+from src.services.prefix_template import PrefixTemplater
+
+
+def _golden_prefix(steam, app_id, version):
+    """Cria um jogo instalado no host com um prefixo inicializado na versão dada."""
+    (steam / "steamapps" / f"appmanifest_{app_id}.acf").write_text("", encoding="utf-8")
+    prefix = steam / "steamapps/compatdata" / app_id
+    (prefix / "pfx/drive_c/users/steamuser").mkdir(parents=True)
+    (prefix / "pfx/drive_c/users/steamuser/save.dat").write_text("save", encoding="utf-8")
+    (prefix / "pfx/system.reg").write_text("registry", encoding="utf-8")
+    (prefix / "version").write_text(version, encoding="utf-8")
+
+
+def test_clone_missing(tmp_path, monkeypatch):
+    """Testa se só os prefixos pedidos e compatíveis são copiados, sem os dados de usuário, quando não há reflink."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path / "local")
+    steam = tmp_path / "Steam"
+    (steam / "steamapps/common/Proton 9.0").mkdir(parents=True)
+    (steam / "steamapps/common/Proton 9.0/proton").write_text('CURRENT_PREFIX_VERSION="9.0-1"', encoding="utf-8")
+    _golden_prefix(steam, "10", "9.0-1")
+    _golden_prefix(steam, "20", "8.0-5")
+    _golden_prefix(steam, "30", "9.0-1")
+
+    def no_reflink(*args):
+        raise OSError("reflinks are not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", no_reflink)
+    home = tmp_path / "home_1"
+    stats = PrefixTemplater(Logger("test", tmp_path), steam).clone_missing([home], ["10", "20", "40"])
+
+    assert stats == {"cloned": 1, "version_mismatch": 1, "reflinked_bytes": 0, "copied_bytes": len("registry9.0-1")}
+    compatdata = home / ".local/share/Steam/steamapps/compatdata"
+    assert sorted(p.name for p in compatdata.iterdir()) == ["10"]
+    assert (compatdata / "10/pfx/system.reg").read_text(encoding="utf-8") == "registry"
+    assert list((compatdata / "10/pfx/drive_c/users").iterdir()) == []
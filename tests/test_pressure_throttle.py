@@ -0,0 +1,36 @@
+"""Testes da leitura de PSI e da histerese do throttling de processos auxiliares."""
+
+from src.core import Logger
+from src.services.pressure_throttle import PressureThrottle, read_pressure
+
+
+def _write_pressure(root, cpu=1.0, io=1.0, memory=1.0):
+    """Cria arquivos falsos de /proc/pressure com os valores avg10 dados."""
+    for resource, value in (("cpu", cpu), ("io", io), ("memory", memory)):
+        (root / resource).write_text(
+            f"some avg10={value:.2f} avg60=0.00 avg300=0.00 total=100\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+        )
+
+
+def test_read_pressure(tmp_path):
+    """Testa a leitura do avg10 de cada recurso."""
+    _write_pressure(tmp_path, cpu=2.5, io=40.0, memory=0.0)
+    assert read_pressure(tmp_path) == {"cpu": 2.5, "io": 40.0, "memory": 0.0}
+    assert read_pressure(tmp_path / "missing") == {}
+
+
+def test_throttle_hysteresis(tmp_path):
+    """Testa se o throttling só é liberado quando a pressão cai bem abaixo do limite."""
+    throttle = PressureThrottle(Logger("test", tmp_path), dict, policy="pause", threshold=20.0, pressure_path=tmp_path)
+
+    _write_pressure(tmp_path, io=35.0)
+    throttle.check()
+    assert throttle.throttling
+
+    _write_pressure(tmp_path, io=15.0)
+    throttle.check()
+    assert throttle.throttling
+
+    _write_pressure(tmp_path, io=5.0)
+    throttle.check()
+    assert not throttle.throttling
@@ -0,0 +1,104 @@
+"""Testes das sondas de prontidão e do agendamento sequencial das instâncias."""
+
+import os
+import subprocess
+import time
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from src.core import Config, Logger
+from src.models import READY_STAGES, InstanceLaunchPlan, LaunchPlan, Profile
+from src.services import instance as instance_module
+from src.services.instance import InstanceService
+from src.services.readiness import (
+    ProcessStageProbe,
+    ReadinessProbe,
+    get_readiness_probe,
+)
+
+
+class FakeProbe(ReadinessProbe):
+    """Sonda que só reporta prontas as instâncias marcadas como prontas."""
+
+    description = "fake stage"
+
+    def __init__(self, ready_pgids):
+        """Inicializa a sonda com os grupos de processos que estão prontos."""
+        self.ready_pgids = ready_pgids
+        self.polled = []
+
+    def is_ready(self, pgid):
+        """Registra a verificação e responde se o grupo está pronto."""
+        self.polled.append(pgid)
+        return pgid in self.ready_pgids
+
+
+def test_probe_for_each_stage():
+    """Testa se cada estágio configurado usa a sonda certa, com e sem Gamescope."""
+    assert get_readiness_probe("gamescope_window").process_names == {"Xwayland"}
+    assert get_readiness_probe("gamescope_window", use_gamescope=False).process_names == {"steamwebhelper"}
+    assert get_readiness_probe("steam_ui").process_names == {"steamwebhelper"}
+    assert type(get_readiness_probe("timeout")) is ReadinessProbe
+
+    assert Profile(launch_ready_stage=READY_STAGES[-1]).launch_ready_stage == "timeout"
+    with pytest.raises(ValidationError):
+        Profile(launch_ready_stage="desktop")
+
+
+def test_process_stage_probe_watches_the_process_group():
+    """Testa se a sonda reconhece um processo do estágio no grupo da instância."""
+    process = subprocess.Popen(["sleep", "30"], preexec_fn=os.setpgrp)
+    try:
+        assert ProcessStageProbe("sleep", ["sleep"]).is_ready(process.pid)
+        assert not ProcessStageProbe("gamescope window", ["Xwayland"]).is_ready(process.pid)
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_launch_order_and_timeout_fallback(tmp_path, monkeypatch):
+    """Testa se cada instância só é lançada depois da anterior ficar pronta ou do tempo limite expirar."""
+    monkeypatch.setattr(Config, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(instance_module, "READINESS_POLL_INTERVAL", 0.01)
+    service = InstanceService(Logger("test", tmp_path))
+    plan = LaunchPlan(
+        instances=[
+            InstanceLaunchPlan(instance_num=num, home_path=str(tmp_path / f"home_{num}"), command=["true"])
+            for num in (0, 1, 2)
+        ]
+    )
+    session = SimpleNamespace(plan=plan, homes_key="ready", homes_ready=lambda home_paths: True)
+    monkeypatch.setattr(service, "_take_prepared_session", lambda profile, instance_nums: session)
+
+    # A instância 1 nunca fica pronta; as outras ficam prontas na primeira verificação.
+    probe = FakeProbe({100, 102})
+    monkeypatch.setattr(instance_module, "get_readiness_probe", lambda stage, use_gamescope: probe)
+    events = []
+
+    def launch(instance_plan):
+        events.append(("launch", instance_plan.instance_num, list(probe.polled)))
+        service.pgids[instance_plan.instance_num] = 100 + instance_plan.instance_num
+        return True
+
+    monkeypatch.setattr(service, "_launch_single_instance", launch)
+    ready_times = service.launch_instances(Profile(launch_ready_timeout=0.3), [0, 1, 2])
+
+    assert [event[1] for event in events] == [0, 1, 2]
+    assert events[1][2] == [100]
+    assert set(events[2][2]) == {100, 101}
+    assert ready_times[0] < 0.3 and ready_times[2] < 0.3
+    assert ready_times[1] >= 0.3
+
+
+def test_exited_instance_does_not_wait_for_timeout(tmp_path):
+    """Testa se uma instância que terminou não segura o lançamento da próxima até o tempo limite."""
+    service = InstanceService(Logger("test", tmp_path))
+    service.processes[0] = subprocess.Popen(["true"])
+    service.processes[0].wait()
+    service.pgids[0] = service.processes[0].pid
+
+    start = time.monotonic()
+    service._wait_until_ready(0, FakeProbe(set()), 5.0)
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,73 @@
+"""Testes do amostrador de recursos por instância."""
+
+import os
+import subprocess
+import time
+
+from src.core import Logger
+from src.services.resource_sampler import (
+    CSV_KEEP_COUNT,
+    SAMPLE_OVERHEAD_BUDGET,
+    ResourceSampler,
+)
+
+
+def _spawn_group():
+    """Inicia um grupo de processos com alguns filhos ociosos."""
+    return subprocess.Popen(
+        ["sh", "-c", "sleep 30 & sleep 30 & wait"],
+        preexec_fn=os.setpgrp,
+    )
+
+
+def test_sample_aggregates_process_group(tmp_path):
+    """Testa se a amostra agrega todos os processos do grupo da instância."""
+    process = _spawn_group()
+    try:
+        time.sleep(0.2)
+        sampler = ResourceSampler(Logger("Twinverse-Test", tmp_path), lambda: {1: process.pid}, output_dir=tmp_path)
+        samples = sampler.sample()
+
+        assert samples[1].pgid == process.pid
+        assert samples[1].processes == 3
+        assert samples[1].threads >= 3
+        assert samples[1].rss_bytes > 0
+
+        sampler.write_prometheus(samples)
+        assert 'twinverse_instance_processes{instance="1"' in sampler.prometheus_path.read_text()
+    finally:
+        os.killpg(process.pid, 9)
+        process.wait()
+
+
+def test_sample_overhead_budget(tmp_path):
+    """Testa se uma amostra de oito instâncias fica dentro do orçamento de custo."""
+    processes = [_spawn_group() for _ in range(8)]
+    try:
+        time.sleep(0.2)
+        pgids = {num: process.pid for num, process in enumerate(processes, start=1)}
+        sampler = ResourceSampler(Logger("Twinverse-Test", tmp_path), lambda: pgids, output_dir=tmp_path)
+        durations = []
+        for _ in range(10):
+            sampler.sample()
+            durations.append(sampler.last_sample_seconds)
+
+        assert len(sampler.latest()) == 8
+        assert sorted(durations)[len(durations) // 2] < SAMPLE_OVERHEAD_BUDGET
+    finally:
+        for process in processes:
+            os.killpg(process.pid, 9)
+            process.wait()
+
+
+def test_old_csv_files_are_removed(tmp_path):
+    """Testa se iniciar uma sessão mantém apenas os CSVs mais recentes."""
+    for day in range(1, 9):
+        (tmp_path / f"instance_resources_202601{day:02d}-120000.csv").write_text("")
+    sampler = ResourceSampler(Logger("Twinverse-Test", tmp_path), lambda: {}, interval=60, output_dir=tmp_path)
+    sampler.start()
+    sampler.stop()
+
+    kept = sorted(p.name for p in tmp_path.glob("instance_resources_*.csv"))
+    assert len(kept) == CSV_KEEP_COUNT - 1
+    assert kept[0] == "instance_resources_20260105-120000.csv"
@@ -0,0 +1,114 @@
+"""Testes das chaves de staleness da sessão preparada antecipadamente."""
+
+import os
+
+from src.core import Config, Logger
+from src.models import VIRTUAL_JOYSTICK_PLACEHOLDER, LaunchPlan, Profile
+from src.services.instance import InstanceService
+from src.services.session_prep import (
+    PreparedSession,
+    _devices_key,
+    _virtual_joystick_nodes,
+    get_session_keys,
+)
+
+
+def test_stale_parts_follow_profile_changes():
+    """Testa se só a parte do perfil fica obsoleta quando o perfil muda, e não quando a seleção é salva."""
+    profile = Profile(use_gamescope=False)
+    session = PreparedSession(profile, LaunchPlan(), get_session_keys(profile, [0, 1], None))
+
+    profile.selected_players = [0, 1]
+    assert session.stale_parts(get_session_keys(profile, [0, 1], None)) == []
+
+    # O joystick virtual só é criado no lançamento; criá-lo não torna a sessão obsoleta.
+    assert session.stale_parts(get_session_keys(profile, [0, 1], "/dev/input/event30")) == []
+    assert session.stale_parts(get_session_keys(profile, [0], None)) == ["profile"]
+
+
+def test_virtual_joystick_follows_current_profile(tmp_path, monkeypatch):
+    """Testa se o joystick virtual é decidido pelo perfil atual no lançamento, e não pelo perfil preparado."""
+    profile = Profile(
+        use_gamescope=False,
+        PLAYERS=[{"PHYSICAL_DEVICE_ID": "/dev/input/by-id/pad-1"}, {"PHYSICAL_DEVICE_ID": "/dev/input/by-id/pad-2"}],
+    )
+    service = InstanceService(Logger("test", tmp_path))
+    monkeypatch.setattr(service.virtual_device, "create_virtual_joystick", lambda: "/dev/input/event30")
+    session = PreparedSession(profile, LaunchPlan(), get_session_keys(profile, [0, 1], None))
+    service._ensure_virtual_joystick(profile)
+    assert service._virtual_joystick_path is None
+
+    profile.player_configs[1].physical_device_id = None
+    assert session.stale_parts(get_session_keys(profile, [0, 1], None)) == ["profile"]
+    service._ensure_virtual_joystick(profile)
+    assert service._virtual_joystick_path == "/dev/input/event30"
+    command = ["bwrap", "--dev-bind", VIRTUAL_JOYSTICK_PLACEHOLDER, VIRTUAL_JOYSTICK_PLACEHOLDER, "steam"]
+    assert service._resolve_virtual_joystick(command) == [
+        "bwrap",
+        "--dev-bind",
+        "/dev/input/event30",
+        "/dev/input/event30",
+        "steam",
+    ]
+    service._virtual_joystick_path = None
+    assert service._resolve_virtual_joystick(command) == ["bwrap", "steam"]
+
+
+def test_homes_ready_requires_current_host_library():
+    """Testa se as homes só são reaproveitadas quando foram preparadas com a biblioteca atual do host."""
+    profile = Profile(use_gamescope=False)
+    session = PreparedSession(profile, LaunchPlan(), get_session_keys(profile, [0], None))
+    assert not session.homes_ready(["/tmp/home_1"])
+
+    session.homes, session.homes_key = {"/tmp/home_1"}, session.keys["host_steam"]
+    assert session.homes_ready(["/tmp/home_1"])
+    assert not session.homes_ready(["/tmp/home_1", "/tmp/home_2"])
+
+    session.homes_key = "outdated"
+    assert not session.homes_ready(["/tmp/home_1"])
+
+
+def test_devices_key_ignores_virtual_joystick(tmp_path):
+    """Testa se criar o joystick virtual não torna obsoleta a chave dos dispositivos."""
+    input_path, sys_input_path = tmp_path / "input", tmp_path / "sys"
+    (input_path / "by-id").mkdir(parents=True)
+    (input_path / "event3").touch()
+    os.symlink("../event3", input_path / "by-id/usb-Pad-event-joystick")
+    virtual_joystick_path = str(input_path / "event7")
+    before = _devices_key(
+        _virtual_joystick_nodes(virtual_joystick_path, str(input_path), str(sys_input_path)), str(input_path)
+    )
+
+    (input_path / "event7").touch()
+    (input_path / "js1").touch()
+    (sys_input_path / "event7/device/js1").mkdir(parents=True)
+    (sys_input_path / "event7/device/event7").mkdir()
+    nodes = _virtual_joystick_nodes(virtual_joystick_path, str(input_path), str(sys_input_path))
+    assert nodes == {virtual_joystick_path, str(input_path / "js1")}
+    assert _devices_key(nodes, str(input_path)) == before
+
+    (input_path / "event8").touch()
+    assert _devices_key(nodes, str(input_path)) != before
+
+
+def test_no_preparation_while_launching(tmp_path):
+    """Testa se nenhuma sessão é preparada enquanto um lançamento está em andamento."""
+    service = InstanceService(Logger("test", tmp_path))
+    service.launch_in_progress = True
+    service.prepare_session(Profile(use_gamescope=False), [0])
+    assert service._session_future is None
+
+
+def test_running_homes_are_not_prepared(tmp_path, monkeypatch):
+    """Testa se uma home em uso por uma instância de outro serviço não é preparada."""
+    monkeypatch.setattr(Config, "LOCAL_DIR", tmp_path)
+    launcher, preparer = InstanceService(Logger("test", tmp_path)), InstanceService(Logger("test", tmp_path))
+    running, idle = Config.get_steam_home_path(0), Config.get_steam_home_path(1)
+    launcher._set_home_running(running, True)
+    try:
+        assert preparer._prepare_homes([running, idle]) == [idle]
+        assert not running.exists()
+        assert (idle / ".local/share/Steam/steamapps").is_dir()
+    finally:
+        launcher._set_home_running(running, False)
+    assert preparer._prepare_homes([running]) == [running]
@@ -0,0 +1,71 @@
+"""Testes do supervisor que detecta a saída dos processos das instâncias."""
+
+import os
+import queue
+import subprocess
+
+import pytest
+
+from src.core import Logger
+from src.services.supervisor import InstanceSupervisor
+
+
+def _watch_exits(tmp_path):
+    """Cria um supervisor que coloca cada saída reportada numa fila."""
+    exits = queue.Queue()
+    supervisor = InstanceSupervisor(
+        Logger("test", tmp_path), lambda num, process, runtime: exits.put((num, process.returncode, runtime))
+    )
+    return supervisor, exits
+
+
+def _check_exits(supervisor, exits):
+    """Lança dois processos e verifica se cada saída é reportada com seu código, na ordem em que ocorre."""
+    slow = subprocess.Popen(["sh", "-c", "sleep 0.3; exit 4"])
+    fast = subprocess.Popen(["sh", "-c", "exit 3"])
+    supervisor.watch(1, slow)
+    supervisor.watch(2, fast)
+
+    first, second = exits.get(timeout=5), exits.get(timeout=5)
+    assert first[:2] == (2, 3)
+    assert second[:2] == (1, 4)
+    assert first[2] < second[2] and second[2] > 0.2
+    assert slow.returncode == 4 and fast.returncode == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="pidfd_open não está disponível")
+def test_pidfd_loop_reports_exits(tmp_path):
+    """Testa se o laço de epoll com pidfds reporta cada saída e libera os descritores ao parar."""
+    supervisor, exits = _watch_exits(tmp_path)
+    _check_exits(supervisor, exits)
+    assert supervisor._watched == {}
+
+    thread = supervisor._thread
+    supervisor.stop()
+    assert not thread.is_alive()
+    assert supervisor._epoll is None and supervisor._wake_fds is None
+
+
+def test_wait_thread_fallback_reports_exits(tmp_path, monkeypatch):
+    """Testa se, sem pidfd, uma thread de espera por processo reporta as saídas."""
+    monkeypatch.delattr(os, "pidfd_open", raising=False)
+    supervisor, exits = _watch_exits(tmp_path)
+    _check_exits(supervisor, exits)
+    assert supervisor._thread is None
+
+
+def test_callback_errors_do_not_stop_the_loop(tmp_path):
+    """Testa se um erro no callback de saída não derruba o supervisor."""
+    exits = queue.Queue()
+
+    def on_exit(num, process, runtime):
+        exits.put(num)
+        if num == 1:
+            raise RuntimeError("boom")
+
+    supervisor = InstanceSupervisor(Logger("test", tmp_path), on_exit)
+    supervisor.watch(1, subprocess.Popen(["true"]))
+    assert exits.get(timeout=5) == 1
+    supervisor.watch(2, subprocess.Popen(["true"]))
+    assert exits.get(timeout=5) == 2
+    supervisor.stop()
@@ -0,0 +1,78 @@
+"""Testes do encerramento das instâncias com prazo compartilhado e escalonamento para SIGKILL."""
+
+import os
+import signal
+import subprocess
+import time
+
+from src.core import Logger
+from src.services.instance import InstanceService
+
+
+def _spawn_group(ignore_sigterm=False):
+    """Inicia um grupo de processos, que opcionalmente ignora o SIGTERM, e espera ele estar pronto."""
+    trap = 'trap "" TERM; ' if ignore_sigterm else ""
+    process = subprocess.Popen(
+        ["sh", "-c", f"{trap}echo ready; while :; do sleep 0.1; done"],
+        stdout=subprocess.PIPE,
+        preexec_fn=os.setpgrp,
+    )
+    process.stdout.readline()
+    process.stdout.close()
+    return process
+
+
+def _service(tmp_path, processes):
+    """Cria um serviço que já gerencia os processos dados como instâncias."""
+    service = InstanceService(Logger("test", tmp_path))
+    for instance_num, process in enumerate(processes):
+        service.processes[instance_num] = process
+        service.pids[instance_num] = process.pid
+        service.pgids[instance_num] = process.pid
+    return service
+
+
+def test_graceful_instances_do_not_wait_for_the_deadline(tmp_path):
+    """Testa se instâncias que respeitam o SIGTERM terminam sem esperar o prazo nem receber SIGKILL."""
+    processes = [_spawn_group(), _spawn_group()]
+    service = _service(tmp_path, processes)
+
+    start = time.monotonic()
+    service.terminate_instances([0, 1], grace_period=5.0)
+
+    assert time.monotonic() - start < 2.0
+    assert [process.returncode for process in processes] == [-signal.SIGTERM, -signal.SIGTERM]
+    assert service.processes == {} and service.pgids == {} and service.pids == {}
+
+
+def test_stuck_instances_share_one_deadline_and_are_killed(tmp_path, monkeypatch):
+    """Testa se as instâncias que ignoram o SIGTERM recebem SIGKILL após um único prazo compartilhado."""
+    # Não mata os processos do Wine de quem roda os testes.
+    pkill_calls = []
+    run = subprocess.run
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, *args, **kwargs: pkill_calls.append(cmd) if cmd[0] == "pkill" else run(cmd, *args, **kwargs),
+    )
+    processes = [_spawn_group(ignore_sigterm=True), _spawn_group(ignore_sigterm=True), _spawn_group()]
+    service = _service(tmp_path, processes)
+
+    start = time.monotonic()
+    service.terminate_instances([0, 1, 2], grace_period=0.5)
+    elapsed = time.monotonic() - start
+
+    assert 0.5 <= elapsed < 1.0
+    assert [process.returncode for process in processes] == [-signal.SIGKILL, -signal.SIGKILL, -signal.SIGTERM]
+    assert pkill_calls == [["pkill", "-9", "-f", "winedevice"]]
+    assert service.processes == {}
+
+
+def test_unknown_and_exited_instances(tmp_path):
+    """Testa se instâncias desconhecidas são ignoradas e as que já terminaram são apenas esquecidas."""
+    process = subprocess.Popen(["true"], preexec_fn=os.setpgrp)
+    process.wait()
+    service = _service(tmp_path, [process])
+
+    service.terminate_instances([0, 5], grace_period=0.5)
+    assert service.processes == {} and service.pgids == {}
@@ -0,0 +1,46 @@
+"""Testes do rastreamento de fases em formato Chrome trace-event."""
+
+import json
+
+from src.core import Config, Tracer, traced
+from src.core.tracing import MAX_TRACE_FILES
+
+
+def test_trace_session_file(tmp_path, monkeypatch):
+    """Testa se spans, eventos instantâneos e nomes de threads são gravados e a sessão recomeça."""
+    monkeypatch.setattr(Config, "LOG_DIR", tmp_path)
+    tracer = Tracer()
+    monkeypatch.setattr(Tracer, "_shared", tracer)
+
+    @traced("test")
+    def prepare():
+        with tracer.span("inner", "test", instance=1) as args:
+            args["reused"] = True
+
+    prepare()
+    tracer.instant("ready", "readiness", instance=1)
+    path = tracer.end_session()
+
+    events = json.loads(path.read_text())["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert set(spans) == {"test_trace_session_file.<locals>.prepare", "inner"}
+    assert spans["inner"]["args"] == {"instance": 1, "reused": True}
+    assert spans["inner"]["dur"] <= spans["test_trace_session_file.<locals>.prepare"]["dur"]
+    assert any(event["ph"] == "i" and event["name"] == "ready" for event in events)
+    assert any(event["ph"] == "M" for event in events)
+    assert tracer.end_session() is None
+
+
+def test_old_trace_files_are_removed(tmp_path, monkeypatch):
+    """Testa se gravar uma nova sessão mantém apenas os arquivos de rastreamento mais recentes."""
+    monkeypatch.setattr(Config, "LOG_DIR", tmp_path)
+    for day in range(1, 9):
+        (tmp_path / f"trace_202601{day:02d}-120000.json").write_text("{}")
+    tracer = Tracer()
+    tracer.instant("ready")
+    path = tracer.end_session()
+
+    kept = sorted(tmp_path.glob("trace_*.json"))
+    assert len(kept) == MAX_TRACE_FILES
+    assert path in kept
+    assert kept[0].name == "trace_20260105-120000.json"
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Headless entry point for the Twinverse application.
+
+This module launches, stops, inspects and plans sessions from the command
+line without loading the GUI.
+"""
+
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())